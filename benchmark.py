@@ -0,0 +1,596 @@
+import argparse
+import json
+import os
+import pickle
+import platform
+import resource
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+import numpy as np
+import pandas as pd
+import instrumentation
+from inference import InferenceEngine
+from model import DementiaPredictionModel, FEATURE_COLUMNS, STREAM_CHUNK_SIZE, DATASET_CACHE_DIR, BUNDLE_PATH, CASCADE_BAND, CascadeStats, load_dataset, parse_band
+
+BENCH_DATA_DIR = 'bench_data'
+DEFAULT_SCALES = '1,10,100'
+DEFAULT_OUTPUT = 'bench_results.json'
+# Relative change beyond which compare flags a regression
+DEFAULT_THRESHOLD = 0.10
+LATENCY_SAMPLES = 500
+LATENCY_WARMUP = 20
+# Batch sizes the compiled forests are timed at against the libraries
+TREE_BATCH_SIZES = (1, 16, 64, 256, 512, 1024, 4096)
+TREE_REPEATS = 20
+DEFAULT_SCORE_WORKERS = '1,2,4'
+# Cold-start scenarios, each timed in a fresh interpreter
+STARTUP_CASES = {
+    'import model': "import model",
+    'import gui': "import gui",
+    'load bundle (all models)': "import model; model.DementiaPredictionModel.load({bundle!r})",
+    'load bundle (lr only)': "import model; model.DementiaPredictionModel.load({bundle!r}, models='lr')"
+}
+STARTUP_REPEATS = 3
+# Batch sizes explain() is timed at
+EXPLAIN_BATCH_SIZES = (1, 100, 1000, 10000)
+# Sizes of the labelled batches update() is timed with
+DEFAULT_UPDATE_SIZES = '100,1000,10000'
+# Caller thread counts and rows per call of the inference engine benchmark
+DEFAULT_THREAD_COUNTS = '1,2,4,8'
+THREAD_BATCH_SIZES = (1, 64, 4096)
+THREAD_SECONDS = 2.0  # Measuring time per thread count and path
+# Heavy libraries whose presence in sys.modules is reported
+STARTUP_BACKENDS = ('sklearn', 'sklearn.ensemble', 'xgboost', 'matplotlib')
+_STARTUP_CHILD = '''
+import json, resource, sys, time
+start = time.perf_counter()
+exec({code!r})
+elapsed = time.perf_counter() - start
+peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+print(json.dumps({{
+    'seconds': elapsed,
+    'peak_rss_mb': peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024,
+    'backends': [name for name in {backends!r} if name in sys.modules]
+}}))
+'''
+
+# Metric name prefix -> True if larger values are better
+METRIC_DIRECTIONS = {
+    'train_total_s': False,
+    'fit_s.': False,
+    'predict_latency_ms.': False,
+    'batch_rows_per_s': True,
+    'peak_rss_mb': False
+}
+
+def scale_dataset(source_path, factor, seed=42):
+    """Write a factor-times larger copy of source_path by resampling its rows.
+
+    Bootstrapping whole rows keeps every column's distribution, missing-value
+    rate and category set, as well as the relationships between columns.
+    """
+    os.makedirs(BENCH_DATA_DIR, exist_ok=True)
+    path = os.path.join(BENCH_DATA_DIR, f"data_x{factor}.csv")
+    if os.path.exists(path):
+        return path
+    data = pd.read_csv(source_path, encoding='utf-8')
+    rng = np.random.default_rng(seed)
+    # Write in slices of the source size so memory stays flat for large factors
+    for i in range(factor):
+        sample = data.iloc[rng.integers(0, len(data), size=len(data))]
+        sample.to_csv(path, mode='w' if i == 0 else 'a', header=(i == 0), index=False, encoding='utf-8')
+    return path
+
+def _peak_rss_mb():
+    # ru_maxrss is kilobytes on Linux and bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+def _row_strings(data_path, limit):
+    data = pd.read_csv(data_path, encoding='utf-8', nrows=limit)[FEATURE_COLUMNS]
+    return [
+        ','.join('' if pd.isna(value) else str(value) for value in row)
+        for row in data.itertuples(index=False)
+    ]
+
+def benchmark_scale(data_path, n_jobs=None):
+    """Train and score on one dataset, returning flat metrics. Runs in a fresh process."""
+    metrics = {}
+    model = DementiaPredictionModel()
+    start = time.perf_counter()
+    # Cold caches, so every run times parsing and preprocessing like the baseline did
+    model.train(data_path, n_jobs=n_jobs, feature_cache_dir=None, dataset_cache_dir=None)
+    metrics['train_total_s'] = time.perf_counter() - start
+    for name, seconds in model.get_fit_times().items():
+        metrics[f"fit_s.{name}"] = seconds
+
+    # Single-row latency through predict()
+    rows = _row_strings(data_path, LATENCY_SAMPLES)
+    for row in rows[:LATENCY_WARMUP]:
+        model.predict(row)
+    latencies = []
+    for row in rows:
+        start = time.perf_counter()
+        model.predict(row)
+        latencies.append((time.perf_counter() - start) * 1000)
+    for q in (50, 95, 99):
+        metrics[f"predict_latency_ms.p{q}"] = float(np.percentile(latencies, q))
+
+    # Batch throughput streamed from the CSV
+    start = time.perf_counter()
+    predictions = model.predict_batch(data_path)
+    elapsed = time.perf_counter() - start
+    n_rows = len(next(iter(predictions.values())))
+    metrics['batch_rows'] = n_rows
+    metrics['batch_rows_per_s'] = n_rows / elapsed if elapsed else 0.0
+
+    metrics['peak_rss_mb'] = _peak_rss_mb()
+    return metrics
+
+def _train_once(data_path, streaming, chunksize, n_jobs):
+    """Train in-memory or streamed and return time, accuracies and peak memory. Runs in a fresh process."""
+    model = DementiaPredictionModel()
+    start = time.perf_counter()
+    if streaming:
+        model.train_streaming(data_path, chunksize=chunksize, n_jobs=n_jobs)
+    else:
+        model.train(data_path, n_jobs=n_jobs, feature_cache_dir=None, dataset_cache_dir=None)
+    metrics = {'train_total_s': time.perf_counter() - start}
+    for name, accuracy in model.get_accuracies().items():
+        metrics[f"accuracy.{name}"] = accuracy
+    metrics['peak_rss_mb'] = _peak_rss_mb()
+    return metrics
+
+def compare_streaming(data_path, chunksize=STREAM_CHUNK_SIZE, n_jobs=None, skip_in_memory=False):
+    """Train streamed and in-memory models on the same file and print their accuracy and memory side by side."""
+    modes = [('streaming', True)] if skip_in_memory else [('in_memory', False), ('streaming', True)]
+    results = {}
+    for mode, streaming in modes:
+        print(f"Training {mode} on {data_path}")
+        with ProcessPoolExecutor(max_workers=1, mp_context=get_context('spawn')) as executor:
+            results[mode] = executor.submit(_train_once, data_path, streaming, chunksize, n_jobs).result()
+
+    # Each mode is scored on its own held-out rows (random 20% vs every 5th row)
+    print(f"\n{'metric':<32}" + ''.join(f"{mode:>14}" for mode in results))
+    for metric in results['streaming']:
+        print(f"{metric:<32}" + ''.join(f"{results[mode][metric]:>14.4f}" for mode in results))
+    return results
+
+def compare_ingest(data_path, cache_dir):
+    """Print load time and in-memory size of the default read_csv path against load_dataset."""
+    results = {}
+
+    start = time.perf_counter()
+    data = pd.read_csv(data_path, encoding='utf-8')
+    elapsed = time.perf_counter() - start
+    results['default read_csv'] = (elapsed, data.memory_usage(deep=True).sum())
+
+    for label, use_cache in (('typed, cold cache', False), ('typed, warm cache', True)):
+        if use_cache:
+            load_dataset(data_path, cache_dir=cache_dir)  # Make sure the cache exists
+        start = time.perf_counter()
+        data = load_dataset(data_path, cache_dir=cache_dir, use_cache=use_cache)
+        elapsed = time.perf_counter() - start
+        results[label] = (elapsed, data.memory_usage(deep=True).sum())
+
+    base_time, base_bytes = results['default read_csv']
+    print(f"{'loader':<22}{'seconds':>12}{'speedup':>10}{'MB':>10}{'memory':>10}")
+    for label, (seconds, size) in results.items():
+        print(f"{label:<22}{seconds:>12.4f}{base_time / seconds:>9.1f}x"
+              f"{size / 1e6:>10.2f}{size / base_bytes:>9.0%}")
+    return results
+
+def _time_per_call_ms(function, X, repeats=TREE_REPEATS):
+    function(X)  # Warm up
+    start = time.perf_counter()
+    for _ in range(repeats):
+        function(X)
+    return (time.perf_counter() - start) / repeats * 1000
+
+def compare_trees(data_path, bundle_path=BUNDLE_PATH):
+    """Print latency, memory and agreement of the compiled forests against the library estimators."""
+    model = DementiaPredictionModel.load_or_train(data_path, bundle_path)
+    X, _ = model.prepare_features(data_path)
+    # Repeat the rows so the largest batch size is reached on small datasets
+    X = np.asarray(X)
+    X = np.tile(X, (-(-max(TREE_BATCH_SIZES) // len(X)), 1))
+    estimators = model.estimators()
+    results = {}
+    for name, compiled in model.compiled_trees.items():
+        estimator = estimators[name]
+        error = float(np.abs(compiled.predict_proba(X) - estimator.predict_proba(X)).max())
+        print(f"\n{name}: max |p_compiled - p_library| = {error:.2e}")
+        print(f"  memory: {len(pickle.dumps(estimator)) / 1e6:.2f} MB pickled estimator, "
+              f"{compiled.nbytes / 1e6:.2f} MB compiled node arrays")
+        print(f"  {'rows':>6}{'library ms':>14}{'compiled ms':>14}{'speedup':>10}")
+        timings = {}
+        for rows in TREE_BATCH_SIZES:
+            batch = X[:rows]
+            library_ms = _time_per_call_ms(estimator.predict_proba, batch)
+            compiled_ms = _time_per_call_ms(compiled.predict_proba, batch)
+            timings[rows] = (library_ms, compiled_ms)
+            print(f"  {rows:>6}{library_ms:>14.3f}{compiled_ms:>14.3f}{library_ms / compiled_ms:>9.1f}x")
+        results[name] = {
+            'max_abs_diff': error,
+            'estimator_pickle_bytes': len(pickle.dumps(estimator)),
+            'compiled_bytes': compiled.nbytes,
+            'latency_ms': timings
+        }
+    return results
+
+def compare_instrumentation(data_path, bundle_path=BUNDLE_PATH):
+    """Print predict and predict_batch timings with instrumentation off and on."""
+    model = DementiaPredictionModel.load_or_train(data_path, bundle_path)
+    rows = _row_strings(data_path, LATENCY_SAMPLES)
+    frame = pd.read_csv(data_path, encoding='utf-8')[FEATURE_COLUMNS]
+    results = {}
+    print(f"{'instrumentation':<18}{'predict p50 ms':>16}{'batch ms':>12}")
+    # Alternate so drift in machine load affects both settings alike
+    for label in ('off', 'on', 'off', 'on'):
+        if label == 'on':
+            instrumentation.enable()
+        else:
+            instrumentation.disable()
+        for row in rows[:LATENCY_WARMUP]:
+            model.predict(row)
+        latencies = []
+        for row in rows:
+            start = time.perf_counter()
+            model.predict(row)
+            latencies.append((time.perf_counter() - start) * 1000)
+        batch_ms = _time_per_call_ms(model.predict_batch, frame, repeats=5)
+        results[label] = (float(np.percentile(latencies, 50)), batch_ms)
+        print(f"{label:<18}{results[label][0]:>16.4f}{batch_ms:>12.2f}")
+    instrumentation.disable()
+
+    # Cost of one span around an empty block, disabled and enabled
+    for label, enabled in (('off', False), ('on', True)):
+        instrumentation.REGISTRY.enabled = enabled
+        start = time.perf_counter()
+        for _ in range(100000):
+            with instrumentation.span('benchmark.empty'):
+                pass
+        print(f"empty span ({label}): {(time.perf_counter() - start) * 10:.3f} us")
+    instrumentation.disable()
+    instrumentation.REGISTRY.reset()
+    return results
+
+def compare_sharding(source_path, factor, worker_counts, bundle_path=BUNDLE_PATH):
+    """Print score.py throughput on a scaled copy of the data for each worker count."""
+    from score import score_file
+    data_path = scale_dataset(source_path, factor)
+    model = DementiaPredictionModel.load_or_train(source_path, bundle_path)
+    output_path = os.path.join(BENCH_DATA_DIR, 'scores.csv')
+    results = {}
+    print(f"{'workers':>8}{'rows/s':>14}{'speedup':>10}{'efficiency':>12}")
+    for workers in worker_counts:
+        rows, _, _, seconds = score_file(model, data_path, output_path, workers, bundle_path)
+        results[workers] = rows / seconds
+        speedup = results[workers] / results[worker_counts[0]] * worker_counts[0]
+        print(f"{workers:>8}{results[workers]:>14,.0f}{speedup:>9.2f}x{speedup / workers:>12.0%}")
+    os.remove(output_path)
+    return results
+
+def compare_cascade(data_path, band=CASCADE_BAND, bundle_path=BUNDLE_PATH):
+    """Print escalation rate and measured latency of cascade mode against running all three models."""
+    model = DementiaPredictionModel.load_or_train(data_path, bundle_path)
+    rows = _row_strings(data_path, LATENCY_SAMPLES)
+    frame = pd.read_csv(data_path, encoding='utf-8')[FEATURE_COLUMNS]
+    results = {}
+    for label in ('all models', 'cascade'):
+        if label == 'cascade':
+            model.enable_cascade(*band)
+        else:
+            model.disable_cascade()
+        for row in rows[:LATENCY_WARMUP]:
+            model.predict(row)
+        model.cascade_stats = CascadeStats()  # Leave the warm-up out of the counts
+        latencies = []
+        for row in rows:
+            start = time.perf_counter()
+            model.predict(row)
+            latencies.append((time.perf_counter() - start) * 1000)
+        results[label] = {
+            'predict_p50_ms': float(np.percentile(latencies, 50)),
+            'predict_mean_ms': float(np.mean(latencies)),
+            'stats': model.get_cascade_stats(),
+            'batch_ms': _time_per_call_ms(model.predict_batch, frame, repeats=5)
+        }
+    model.disable_cascade()
+
+    full, cascade = results['all models'], results['cascade']
+    stats = cascade['stats']
+    print(f"\nBand {band}: {stats['escalated']} of {stats['records']} records escalated "
+          f"({stats['escalated_fraction']:.1%})")
+    print(f"{'':<22}{'all models':>12}{'cascade':>12}{'saved':>10}")
+    for metric in ('predict_p50_ms', 'predict_mean_ms', 'batch_ms'):
+        saved = 1 - cascade[metric] / full[metric]
+        print(f"{metric:<22}{full[metric]:>12.3f}{cascade[metric]:>12.3f}{saved:>10.1%}")
+    return results
+
+def compare_startup(data_path, bundle_path=BUNDLE_PATH, repeats=STARTUP_REPEATS):
+    """Print import/load time, peak RSS and imported backends of each cold-start scenario."""
+    # Make sure a current bundle exists before timing loads of it
+    subprocess.run([sys.executable, '-c',
+                    f"import model; model.DementiaPredictionModel.load_or_train({data_path!r}, {bundle_path!r})"],
+                   check=True, capture_output=True)
+    results = {}
+    print(f"{'scenario':<28}{'seconds':>10}{'peak MB':>10}  backends imported")
+    for label, code in STARTUP_CASES.items():
+        child = _STARTUP_CHILD.format(code=code.format(bundle=bundle_path), backends=STARTUP_BACKENDS)
+        runs = []
+        for _ in range(repeats):
+            output = subprocess.run([sys.executable, '-c', child], check=True, capture_output=True, text=True)
+            runs.append(json.loads(output.stdout.strip().splitlines()[-1]))
+        # The fastest run is the least disturbed by the page cache and other processes
+        results[label] = min(runs, key=lambda run: run['seconds'])
+        result = results[label]
+        print(f"{label:<28}{result['seconds']:>10.3f}{result['peak_rss_mb']:>10.1f}  {', '.join(result['backends']) or '-'}")
+    return results
+
+def compare_explain(data_path, bundle_path=BUNDLE_PATH):
+    """Print explain() cost per record and model at several batch sizes, next to predict_batch."""
+    model = DementiaPredictionModel.load_or_train(data_path, bundle_path)
+    frame = pd.read_csv(data_path, encoding='utf-8')[FEATURE_COLUMNS]
+    # Repeat the rows so the largest batch size is reached on small datasets
+    frame = pd.concat([frame] * -(-max(EXPLAIN_BATCH_SIZES) // len(frame)), ignore_index=True)
+    names = list(model.estimators())
+    print(f"{'rows':>8}" + ''.join(f"{name + ' us':>24}" for name in names) + f"{'explain us':>14}{'predict us':>14}")
+    results = {}
+    for rows in EXPLAIN_BATCH_SIZES:
+        batch = frame.head(rows)
+        model.explain(batch)  # Warm up
+        start = time.perf_counter()
+        explanation = model.explain(batch)
+        explain_us = (time.perf_counter() - start) / rows * 1e6
+        predict_us = _time_per_call_ms(model.predict_batch, batch, repeats=3) / rows * 1000
+        per_model = {name: explanation[name]['seconds_per_record'] * 1e6 for name in names}
+        results[rows] = {'per_model_us': per_model, 'explain_us': explain_us, 'predict_us': predict_us}
+        print(f"{rows:>8}" + ''.join(f"{per_model[name]:>24.2f}" for name in names) + f"{explain_us:>14.2f}{predict_us:>14.2f}")
+    return results
+
+def _threaded_rows_per_s(score, batch, rows, threads, seconds):
+    """Rows per second with threads callers scoring batch in a loop for the given time."""
+    score(batch)  # Warm up
+    calls = [0] * threads
+    deadline = time.perf_counter() + seconds
+
+    def caller(i):
+        while time.perf_counter() < deadline:
+            score(batch)
+            calls[i] += 1
+    callers = [threading.Thread(target=caller, args=(i,)) for i in range(threads)]
+    start = time.perf_counter()
+    for thread in callers:
+        thread.start()
+    for thread in callers:
+        thread.join()
+    return sum(calls) * rows / (time.perf_counter() - start)
+
+def compare_threads(data_path, thread_counts, bundle_path=BUNDLE_PATH, seconds=THREAD_SECONDS):
+    """Print throughput of the model's sequential path and InferenceEngine against caller thread count."""
+    model = DementiaPredictionModel.load_or_train(data_path, bundle_path)
+    frame = pd.read_csv(data_path, encoding='utf-8')[FEATURE_COLUMNS]
+    frame = pd.concat([frame] * -(-max(THREAD_BATCH_SIZES) // len(frame)), ignore_index=True)
+    row = _row_strings(data_path, 1)[0]
+    # The pool is forced on so its overhead shows even on one core
+    engines = {
+        'engine, parallel': InferenceEngine(model, workers=max(os.cpu_count() or 1, len(model.model_names))),
+        'engine, sequential': InferenceEngine(model, workers=0)
+    }
+    paths = {
+        'sequential': (model.predict, model.predict_batch),
+        **{label: (engine.predict, engine.predict_batch) for label, engine in engines.items()}
+    }
+    print(f"{os.cpu_count()} CPU(s); rows/s with the speedup over one thread on the sequential path")
+    print(f"{'rows':>6}{'threads':>9}" + ''.join(f"{label:>24}" for label in paths))
+    results = {}
+    for rows in THREAD_BATCH_SIZES:
+        batch = row if rows == 1 else frame.head(rows)
+        results[rows] = {}
+        for threads in thread_counts:
+            results[rows][threads] = {
+                label: _threaded_rows_per_s(single if rows == 1 else batched, batch, rows, threads, seconds)
+                for label, (single, batched) in paths.items()
+            }
+            baseline = results[rows][thread_counts[0]]['sequential'] / thread_counts[0]
+            print(f"{rows:>6}{threads:>9}" + ''.join(
+                f"{f'{value:,.0f} ({value / baseline:.1f}x)':>24}" for value in results[rows][threads].values()
+            ))
+    for engine in engines.values():
+        engine.close()
+    return results
+
+def compare_update(source_path, factor, sizes):
+    """Print the cost of update() for batches of new records against a full retrain.
+
+    The model is trained on a factor-times copy of the source data and saved,
+    and each batch of records is applied to a freshly loaded copy of it.
+    """
+    data_path = scale_dataset(source_path, factor)
+    model = DementiaPredictionModel()
+    start = time.perf_counter()
+    model.train(data_path, feature_cache_dir=None, dataset_cache_dir=None)
+    train_seconds = time.perf_counter() - start
+
+    bundle_path = os.path.join(BENCH_DATA_DIR, 'update_base.joblib')
+    model.save(bundle_path)
+
+    data = pd.read_csv(data_path, encoding='utf-8')
+    results = {'train_s': train_seconds, 'updates': {}}
+    for size in sizes:
+        records = data.sample(size, replace=size > len(data), random_state=size)
+        updated = DementiaPredictionModel.load(bundle_path)
+        start = time.perf_counter()
+        entry = updated.update(records)
+        results['updates'][size] = {'seconds': time.perf_counter() - start, 'accuracies': entry['accuracies']}
+    os.remove(bundle_path)
+
+    print(f"\nFull training on {len(data):,} rows: {train_seconds:.2f}s")
+    print(f"{'new records':>12}{'update s':>10}{'vs train':>10}")
+    for size, result in results['updates'].items():
+        print(f"{size:>12,}{result['seconds']:>10.3f}{result['seconds'] / train_seconds:>10.1%}")
+    return results
+
+def run(source_path, scales, output, n_jobs=None):
+    results = {}
+    for factor in scales:
+        data_path = scale_dataset(source_path, factor)
+        print(f"Benchmarking {factor}x ({data_path})")
+        # A fresh process per scale keeps peak memory readings independent
+        with ProcessPoolExecutor(max_workers=1, mp_context=get_context('spawn')) as executor:
+            results[f"{factor}x"] = executor.submit(benchmark_scale, data_path, n_jobs).result()
+        for metric, value in results[f"{factor}x"].items():
+            print(f"  {metric}: {value:.4f}")
+
+    report = {'meta': _environment(), 'results': results}
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+    print(f"\nResults written to {output}")
+    return report
+
+def _environment():
+    import sklearn
+    import xgboost
+    return {
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'numpy': np.__version__,
+        'pandas': pd.__version__,
+        'sklearn': sklearn.__version__,
+        'xgboost': xgboost.__version__
+    }
+
+def _higher_is_better(metric):
+    for prefix, higher_is_better in METRIC_DIRECTIONS.items():
+        if metric.startswith(prefix):
+            return higher_is_better
+    return None
+
+def compare(baseline_path, current_path, threshold=DEFAULT_THRESHOLD):
+    """Print metric changes between two result files and return the regressions."""
+    with open(baseline_path, encoding='utf-8') as f:
+        baseline = json.load(f)['results']
+    with open(current_path, encoding='utf-8') as f:
+        current = json.load(f)['results']
+
+    regressions = []
+    for scale, metrics in current.items():
+        if scale not in baseline:
+            continue
+        print(f"\n{scale}:")
+        for metric, value in metrics.items():
+            higher_is_better = _higher_is_better(metric)
+            old = baseline[scale].get(metric)
+            if higher_is_better is None or not old:
+                continue
+            change = (value - old) / old
+            worse = -change if higher_is_better else change
+            flag = "REGRESSION" if worse > threshold else ""
+            if flag:
+                regressions.append((scale, metric, old, value))
+            print(f"  {metric:<40} {old:>12.4f} -> {value:>12.4f} ({change:+.1%}) {flag}")
+
+    print(f"\n{len(regressions)} regression(s) beyond {threshold:.0%}")
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description="Training, latency, throughput and memory benchmarks")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    run_parser = subparsers.add_parser('run', help="Run the benchmarks at the given scales")
+    run_parser.add_argument('--data', default='data.csv')
+    run_parser.add_argument('--scales', default=DEFAULT_SCALES, help="Comma-separated multiples of the source data, e.g. 1,10,100,1000")
+    run_parser.add_argument('--output', default=DEFAULT_OUTPUT)
+    run_parser.add_argument('--n-jobs', type=int, default=None)
+
+    compare_parser = subparsers.add_parser('compare', help="Compare two result files")
+    compare_parser.add_argument('baseline')
+    compare_parser.add_argument('current')
+    compare_parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD)
+
+    streaming_parser = subparsers.add_parser('streaming', help="Compare streamed and in-memory training")
+    streaming_parser.add_argument('--data', default='data.csv')
+    streaming_parser.add_argument('--chunksize', type=int, default=STREAM_CHUNK_SIZE)
+    streaming_parser.add_argument('--n-jobs', type=int, default=None)
+    streaming_parser.add_argument('--skip-in-memory', action='store_true', help="For files too large to load at once")
+
+    ingest_parser = subparsers.add_parser('ingest', help="Compare default and typed dataset loading")
+    ingest_parser.add_argument('--data', default='data.csv')
+    ingest_parser.add_argument('--cache-dir', default=DATASET_CACHE_DIR)
+
+    trees_parser = subparsers.add_parser('trees', help="Compare compiled forests with the library estimators")
+    trees_parser.add_argument('--data', default='data.csv')
+    trees_parser.add_argument('--bundle', default=BUNDLE_PATH)
+
+    instrumentation_parser = subparsers.add_parser('instrumentation', help="Measure the overhead of the timing spans")
+    instrumentation_parser.add_argument('--data', default='data.csv')
+    instrumentation_parser.add_argument('--bundle', default=BUNDLE_PATH)
+
+    sharding_parser = subparsers.add_parser('sharding', help="Measure score.py scaling with worker count")
+    sharding_parser.add_argument('--data', default='data.csv')
+    sharding_parser.add_argument('--scale', type=int, default=100, help="Multiple of the source data to score")
+    sharding_parser.add_argument('--workers', default=DEFAULT_SCORE_WORKERS, help="Comma-separated worker counts")
+    sharding_parser.add_argument('--bundle', default=BUNDLE_PATH)
+
+    cascade_parser = subparsers.add_parser('cascade', help="Compare cascade mode with running every model")
+    cascade_parser.add_argument('--data', default='data.csv')
+    cascade_parser.add_argument('--band', type=parse_band, default=CASCADE_BAND, help="LOW,HIGH Logistic Regression probability band")
+    cascade_parser.add_argument('--bundle', default=BUNDLE_PATH)
+
+    startup_parser = subparsers.add_parser('startup', help="Measure cold-start import time and memory")
+    startup_parser.add_argument('--data', default='data.csv')
+    startup_parser.add_argument('--bundle', default=BUNDLE_PATH)
+
+    explain_parser = subparsers.add_parser('explain', help="Measure the per-record cost of explanations")
+    explain_parser.add_argument('--data', default='data.csv')
+    explain_parser.add_argument('--bundle', default=BUNDLE_PATH)
+
+    update_parser = subparsers.add_parser('update', help="Compare incremental updates with a full retrain")
+    update_parser.add_argument('--data', default='data.csv')
+    update_parser.add_argument('--scale', type=int, default=10, help="Multiple of the source data to train on")
+    update_parser.add_argument('--sizes', default=DEFAULT_UPDATE_SIZES, help="Comma-separated numbers of new records")
+
+    threads_parser = subparsers.add_parser('threads', help="Measure inference throughput against caller thread count")
+    threads_parser.add_argument('--data', default='data.csv')
+    threads_parser.add_argument('--bundle', default=BUNDLE_PATH)
+    threads_parser.add_argument('--threads', default=DEFAULT_THREAD_COUNTS, help="Comma-separated caller thread counts")
+    threads_parser.add_argument('--seconds', type=float, default=THREAD_SECONDS, help="Measuring time per cell")
+
+    args = parser.parse_args()
+    if args.command == 'run':
+        scales = [int(s) for s in args.scales.split(',')]
+        run(args.data, scales, args.output, args.n_jobs)
+    elif args.command == 'streaming':
+        compare_streaming(args.data, args.chunksize, args.n_jobs, args.skip_in_memory)
+    elif args.command == 'ingest':
+        compare_ingest(args.data, args.cache_dir)
+    elif args.command == 'trees':
+        compare_trees(args.data, args.bundle)
+    elif args.command == 'instrumentation':
+        compare_instrumentation(args.data, args.bundle)
+    elif args.command == 'cascade':
+        compare_cascade(args.data, args.band, args.bundle)
+    elif args.command == 'startup':
+        compare_startup(args.data, args.bundle)
+    elif args.command == 'explain':
+        compare_explain(args.data, args.bundle)
+    elif args.command == 'update':
+        compare_update(args.data, args.scale, [int(size) for size in args.sizes.split(',')])
+    elif args.command == 'threads':
+        compare_threads(args.data, [int(t) for t in args.threads.split(',')], args.bundle, args.seconds)
+    elif args.command == 'sharding':
+        workers = [int(w) for w in args.workers.split(',')]
+        compare_sharding(args.data, args.scale, workers, args.bundle)
+    else:
+        regressions = compare(args.baseline, args.current, args.threshold)
+        sys.exit(1 if regressions else 0)
+
+if __name__ == "__main__":
+    main()
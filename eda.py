@@ -0,0 +1,286 @@
+import argparse
+import html
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import pandas as pd
+from model import CATEGORICAL_COLUMNS, TARGET_COLUMN, STREAM_CHUNK_SIZE, file_sha256, load_dataset
+
+# Aggregates are cached here as JSON, keyed by the source file's hash
+EDA_CACHE_DIR = '.eda_cache'
+# Bump whenever the aggregates change shape so cached files are recomputed
+EDA_CACHE_FORMAT = 2
+DEFAULT_REPORT_DIR = 'eda_report'
+HEAD_ROWS = 5
+# (x, hue) pairs counted together for the grouped count charts
+CROSSTABS = [('Age', TARGET_COLUMN), (TARGET_COLUMN, 'Gender')]
+
+def _to_split(frame):
+    """DataFrame or Series to a JSON-ready dict that pandas can rebuild."""
+    return json.loads(frame.to_json(orient='split'))
+
+def _series(split):
+    return pd.Series(split['data'], index=split['index'], name=split.get('name'))
+
+def _frame(split):
+    return pd.DataFrame(split['data'], index=split['index'], columns=split['columns'])
+
+def _normalize_key(value):
+    # Integral floats (columns that held a NaN somewhere) count with their integer rows
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    return value
+
+def _merge_moments(total, count, mean, m2):
+    """Combine running (count, mean, M2) with a chunk's, as in Chan et al.'s parallel variance."""
+    n_a, mean_a, m2_a = total
+    n = n_a + count
+    if n == 0:
+        return total
+    delta = mean - mean_a
+    return n, mean_a + delta * count / n, m2_a + m2 + delta ** 2 * n_a * count / n
+
+def compute_aggregates(data_path, chunksize=STREAM_CHUNK_SIZE):
+    """Compute every statistic and count the report needs in one pass over data_path.
+
+    The file is read chunksize rows at a time with the dataset schema's
+    dtypes, so memory is bounded by the chunk size. Missing values are forward-filled across chunk boundaries
+    before counting, matching the original script's data.ffill().
+    """
+    rows = 0
+    head = None
+    columns = None
+    nulls_before = None
+    nulls_after = None
+    carry = None  # Last non-null value per column, for filling the next chunk
+    value_counts = {}
+    crosstabs = {f"{x}_by_{hue}": {} for x, hue in CROSSTABS}
+    moments = {}
+    extremes = {}
+
+    for chunk in load_dataset(data_path, chunksize=chunksize):
+        if head is None:
+            head = chunk.head(HEAD_ROWS)
+            columns = list(chunk.columns)
+            nulls_before = pd.Series(0, index=columns)
+            nulls_after = pd.Series(0, index=columns)
+            dtypes = {col: str(dtype) for col, dtype in chunk.dtypes.items()}
+        rows += len(chunk)
+        nulls_before += chunk.isna().sum()
+
+        chunk = chunk.ffill()
+        if carry is not None:
+            chunk = chunk.fillna(carry)
+        carry = chunk.ffill().iloc[-1]
+        nulls_after += chunk.isna().sum()
+
+        for col in CATEGORICAL_COLUMNS + [TARGET_COLUMN]:
+            if col not in chunk:
+                continue
+            for value, count in chunk[col].value_counts().items():
+                key = _normalize_key(value)
+                value_counts.setdefault(col, {})
+                value_counts[col][key] = value_counts[col].get(key, 0) + int(count)
+        for x, hue in CROSSTABS:
+            if x not in chunk or hue not in chunk:
+                continue
+            table = crosstabs[f"{x}_by_{hue}"]
+            for (x_value, hue_value), count in chunk.groupby([x, hue]).size().items():
+                key = (_normalize_key(x_value), _normalize_key(hue_value))
+                table[key] = table.get(key, 0) + int(count)
+        for col in chunk.select_dtypes(include='number').columns:
+            values = chunk[col].dropna().to_numpy(dtype=float)
+            if not len(values):
+                continue
+            mean = values.mean()
+            moments[col] = _merge_moments(
+                moments.get(col, (0, 0.0, 0.0)), len(values), mean, ((values - mean) ** 2).sum()
+            )
+            low, high = extremes.get(col, (np.inf, -np.inf))
+            extremes[col] = (min(low, values.min()), max(high, values.max()))
+
+    if head is None:
+        raise ValueError(f"{data_path} has no rows")
+    numeric = {}
+    for col, (n, mean, m2) in moments.items():
+        numeric[col] = {
+            'count': n,
+            'mean': mean,
+            'std': float(np.sqrt(m2 / (n - 1))) if n > 1 else 0.0,  # Sample std, as in describe()
+            'min': float(extremes[col][0]),
+            'max': float(extremes[col][1])
+        }
+    tables = {}
+    for name, counts in crosstabs.items():
+        if counts:
+            table = pd.Series(counts).unstack(fill_value=0).sort_index()
+            tables[name] = _to_split(table.sort_index(axis=1))
+    return {
+        'format': EDA_CACHE_FORMAT,
+        'source': os.path.basename(data_path),
+        'rows': rows,
+        'columns': columns,
+        'dtypes': dtypes,
+        'head': _to_split(head),
+        'nulls_before': nulls_before.astype(int).to_dict(),
+        'nulls_after': nulls_after.astype(int).to_dict(),
+        'value_counts': {
+            col: _to_split(pd.Series(counts, name='count').sort_values(ascending=False))
+            for col, counts in value_counts.items()
+        },
+        'numeric': numeric,
+        'crosstabs': tables
+    }
+
+def load_aggregates(data_path, chunksize=STREAM_CHUNK_SIZE, cache_dir=EDA_CACHE_DIR, use_cache=True):
+    """Return the aggregates for data_path, computing them only if no cached copy matches the file."""
+    stem = os.path.splitext(os.path.basename(data_path))[0]
+    cache_path = os.path.join(cache_dir, f"{stem}-{file_sha256(data_path)[:16]}.json")
+    if use_cache and os.path.exists(cache_path):
+        with open(cache_path, encoding='utf-8') as f:
+            aggregates = json.load(f)
+        if aggregates.get('format') == EDA_CACHE_FORMAT:
+            return aggregates
+    aggregates = compute_aggregates(data_path, chunksize)
+    if use_cache:
+        os.makedirs(cache_dir, exist_ok=True)
+        tmp_path = f"{cache_path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(aggregates, f)
+        os.replace(tmp_path, cache_path)
+    return aggregates
+
+def print_summary(aggregates):
+    """Print the console summary the original script printed."""
+    print("First 5 rows of the dataset:")
+    print(_frame(aggregates['head']))
+    print("\nShape of the dataset:")
+    print((aggregates['rows'], len(aggregates['columns'])))
+    print("\nMissing values before fill:")
+    print(pd.Series(aggregates['nulls_before']))
+    print("\nMissing values after fill:")
+    print(pd.Series(aggregates['nulls_after']))
+    if 'Smoking_Status' in aggregates['value_counts']:
+        print("\nSmoking Status counts:")
+        print(_series(aggregates['value_counts']['Smoking_Status']))
+
+def _viridis(n):
+    from matplotlib import colormaps
+    # Evenly spaced colours that skip the palette's extremes, like seaborn's 'viridis'
+    return colormaps['viridis'](np.linspace(0, 1, n + 2)[1:-1])
+
+def _new_figure(figsize):
+    # The object-oriented API renders with Agg and never needs a display
+    from matplotlib.figure import Figure
+    figure = Figure(figsize=figsize)
+    return figure, figure.add_subplot()
+
+def _render_pie(counts, title, path):
+    figure, ax = _new_figure((6, 6))
+    ax.pie(counts['data'], labels=counts['index'], autopct='%1.1f%%', colors=['skyblue', 'lightcoral'])
+    ax.set_title(title)
+    figure.savefig(path)
+    return path
+
+def _render_grouped_counts(table, x, hue, title, figsize, path):
+    """Grouped bar chart of a precomputed x-by-hue count table (the aggregate form of a countplot)."""
+    table = _frame(table)
+    figure, ax = _new_figure(figsize)
+    positions = np.arange(len(table.index))
+    width = 0.8 / len(table.columns)
+    for i, (level, color) in enumerate(zip(table.columns, _viridis(len(table.columns)))):
+        offset = (i - (len(table.columns) - 1) / 2) * width
+        ax.bar(positions + offset, table[level].to_numpy(), width, label=str(level), color=color)
+    ax.set_xticks(positions, [str(value) for value in table.index])
+    ax.set_xlabel(x)
+    ax.set_ylabel('count')
+    ax.legend(title=hue)
+    ax.set_title(title)
+    figure.savefig(path)
+    return path
+
+def _chart_tasks(aggregates, output_dir, image_format):
+    """Return (function, args) per chart that the aggregates have data for."""
+    tasks = []
+    if 'Gender' in aggregates['value_counts']:
+        tasks.append((_render_pie, (aggregates['value_counts']['Gender'], 'Gender Counts',
+                                    os.path.join(output_dir, f"gender_counts.{image_format}"))))
+    titles = {
+        f"Age_by_{TARGET_COLUMN}": ('Age Distribution by Dementia Status', (10, 6)),
+        f"{TARGET_COLUMN}_by_Gender": ('Dementia Status by Gender', (10, 5))
+    }
+    for x, hue in CROSSTABS:
+        name = f"{x}_by_{hue}"
+        if name in aggregates['crosstabs']:
+            title, figsize = titles[name]
+            path = os.path.join(output_dir, f"{name.lower()}.{image_format}")
+            tasks.append((_render_grouped_counts, (aggregates['crosstabs'][name], x, hue, title, figsize, path)))
+    return tasks
+
+def render_charts(aggregates, output_dir, image_format='png', workers=None):
+    """Render every chart from the aggregates into output_dir, in parallel processes when workers > 1."""
+    os.makedirs(output_dir, exist_ok=True)
+    tasks = _chart_tasks(aggregates, output_dir, image_format)
+    workers = min(workers or os.cpu_count() or 1, len(tasks))
+    if workers <= 1:
+        return [function(*args) for function, args in tasks]
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(function, *args) for function, args in tasks]
+        return [future.result() for future in futures]
+
+def _html_table(frame):
+    return frame.to_html(border=0, classes='table', na_rep='', float_format=lambda value: f"{value:.4g}")
+
+def write_report(aggregates, output_dir=DEFAULT_REPORT_DIR, image_format='png', workers=None):
+    """Render the charts and an index.html with the summary tables; return the HTML path."""
+    charts = render_charts(aggregates, output_dir, image_format, workers)
+    nulls = pd.DataFrame({
+        'missing before fill': pd.Series(aggregates['nulls_before']),
+        'missing after fill': pd.Series(aggregates['nulls_after'])
+    })
+    sections = [
+        f"<h1>Dataset report: {html.escape(aggregates['source'])}</h1>",
+        f"<p>{aggregates['rows']} rows, {len(aggregates['columns'])} columns</p>",
+        f"<h2>First {HEAD_ROWS} rows</h2>", _html_table(_frame(aggregates['head'])),
+        "<h2>Missing values</h2>", _html_table(nulls),
+        "<h2>Numerical columns</h2>", _html_table(pd.DataFrame(aggregates['numeric']).T),
+        "<h2>Charts</h2>"
+    ]
+    sections.extend(f'<img src="{html.escape(os.path.basename(path))}" alt="">' for path in charts)
+    sections.append("<h2>Category counts</h2>")
+    for col, counts in aggregates['value_counts'].items():
+        sections.append(f"<h3>{html.escape(col)}</h3>")
+        sections.append(_html_table(_series(counts).to_frame()))
+    page = (
+        "<!DOCTYPE html>\n<html><head><meta charset=\"utf-8\"><title>Dataset report</title>"
+        "<style>body{font-family:sans-serif;margin:2em} .table td,.table th{padding:2px 8px;text-align:right}"
+        " img{max-width:100%;display:block;margin:1em 0}</style></head><body>\n"
+        + "\n".join(sections) + "\n</body></html>\n"
+    )
+    path = os.path.join(output_dir, 'index.html')
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(page)
+    return path
+
+def main():
+    parser = argparse.ArgumentParser(description="Headless EDA report: one pass over the data, charts rendered from aggregates")
+    parser.add_argument('data', nargs='?', default='data.csv')
+    parser.add_argument('--output', default=DEFAULT_REPORT_DIR, help="Directory for the charts and index.html")
+    parser.add_argument('--chunksize', type=int, default=STREAM_CHUNK_SIZE)
+    parser.add_argument('--format', default='png', choices=('png', 'svg'))
+    parser.add_argument('--workers', type=int, default=None, help="Processes rendering charts")
+    parser.add_argument('--no-cache', action='store_true', help="Recompute the aggregates")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    aggregates = load_aggregates(args.data, args.chunksize, use_cache=not args.no_cache)
+    aggregated = time.perf_counter()
+    print_summary(aggregates)
+    path = write_report(aggregates, args.output, args.format, args.workers)
+    print(f"\nAggregates in {aggregated - start:.2f}s, charts in {time.perf_counter() - aggregated:.2f}s")
+    print(f"Report written to {path}")
+
+if __name__ == "__main__":
+    main()
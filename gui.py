@@ -1,11 +1,65 @@
+import argparse
+import time
+from concurrent.futures import ThreadPoolExecutor
 import customtkinter as ctk
 import tkinter.messagebox as messagebox
 import pandas as pd
-from model import DementiaPredictionModel
+import instrumentation
+from instrumentation import span
+from model import DementiaPredictionModel, FEATURE_COLUMNS, FEATURE_SCHEMA, BUNDLE_PATH, record_errors, resolve_model_names
+from model_manager import ModelManager
+
+# How often the UI thread checks on background work (ms)
+POLL_INTERVAL_MS = 50
+# Quiet time after the last edit before a live prediction runs (ms)
+LIVE_PREDICTION_DELAY_MS = 300
+# How often the UI thread checks whether a retrained model was swapped in (ms)
+MODEL_CHECK_INTERVAL_MS = 1000
+# Heartbeat used to measure UI frame time while metrics are recorded (ms)
+FRAME_INTERVAL_MS = 16
+# Features listed per model under "Top factors"
+TOP_FACTORS = 3
+# Whole-number fields with at most this many values get a drop-down instead of an entry
+MAX_DROPDOWN_NUMBERS = 11
+SECTION_ICONS = {
+    'Patient Demographics': '👤',
+    'Medical History': '🏥',
+    'Vital Signs': '❤️',
+    'Lifestyle Factors': '🌿',
+    'Clinical Assessment': '🧠',
+    'Medication': '💊'
+}
+
+def field_widget_values(spec):
+    """Drop-down values for a schema field, or None when it needs a free-text entry."""
+    if spec['type'] == 'category':
+        return list(spec['values'])
+    if spec.get('integer') and spec['max'] - spec['min'] < MAX_DROPDOWN_NUMBERS:
+        return [str(value) for value in range(int(spec['min']), int(spec['max']) + 1)]
+    return None
+
+def format_explanation(explanation):
+    """Summarize one model's explain_record() result as its largest contributions and their cost."""
+    contributions = sorted(explanation['contributions'].items(), key=lambda item: -abs(item[1]))
+    factors = ', '.join(f"{field.replace('_', ' ')} {value:+.2f}" for field, value in contributions[:TOP_FACTORS])
+    return f"Top factors: {factors} ({explanation['units']}) · {explanation['seconds'] * 1000:.2f} ms"
+
+def field_tooltip(field, spec):
+    """Describe a schema field's accepted input, e.g. 'Enter Age (18–120 years)'."""
+    label = spec.get('label', field.replace('_', ' '))
+    if spec['type'] == 'category':
+        detail = spec.get('hint', ', '.join(spec['values']))
+    else:
+        detail = spec.get('hint', f"{spec['min']:g}–{spec['max']:g}{spec.get('unit', '')}")
+    if not spec.get('required', True):
+        detail += ", optional"
+    verb = "Enter" if field_widget_values(spec) is None else "Select"
+    return f"{verb} {label} ({detail})"
 
 class DementiaPredictionGUI:
-    def __init__(self, root):
+    def __init__(self, root, models=None, bundle_path=BUNDLE_PATH, watch=False, streaming=False):
         self.root = root
+        self.model_names = resolve_model_names(models)
         self.root.title("Dementia Prediction System")
         self.root.geometry("1300x750")  # Slightly smaller window for compact layout
         
@@ -23,15 +77,113 @@ class DementiaPredictionGUI:
             'border': '#424242'      # Subtle dark border
         }
         
-        # Initialize model
-        self.model = DementiaPredictionModel()
-        try:
-            self.model.train('data.csv')
-            print("Model trained successfully")
-        except Exception as e:
-            messagebox.showerror("Error", f"Model training failed: {str(e)}")
+        # Fonts are created once and shared by every widget that uses them
+        self.fonts = {
+            'title': ctk.CTkFont(family="Roboto", size=24, weight="bold"),
+            'subtitle': ctk.CTkFont(family="Roboto", size=12),
+            'section': ctk.CTkFont(family="Roboto", size=16, weight="bold"),
+            'field': ctk.CTkFont(family="Roboto", size=11),
+            'button': ctk.CTkFont(family="Roboto", size=14, weight="bold"),
+            'status': ctk.CTkFont(family="Roboto", size=12),
+            'model': ctk.CTkFont(family="Roboto", size=12, weight="bold"),
+            'result': ctk.CTkFont(family="Roboto", size=11),
+            'result_bold': ctk.CTkFont(family="Roboto", size=11, weight="bold")
+        }
+        
+        # Model loading and predictions run on a single background worker so the
+        # window stays responsive; results come back to the UI thread via root.after
+        self.model = None
+        self.executor = ThreadPoolExecutor(max_workers=1)
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
+        
+        # Live prediction: edits restart a debounce timer, and every request gets a
+        # sequence number so results that arrive after a newer request are dropped
+        self.live_prediction_job = None
+        self.prediction_seq = 0
         
         self.create_widgets()
+        self.create_tooltip()
+        
+        # Frame time is the gap between heartbeats; handlers that block the UI thread widen it
+        self.last_frame = None
+        if instrumentation.is_enabled():
+            self.root.after(FRAME_INTERVAL_MS, self._watch_frames)
+        
+        # Load the persisted model, training only if the bundle is missing or stale.
+        # With watch, a manager retrains in its own process when data.csv changes
+        self.manager = ModelManager('data.csv', bundle_path, self.model_names, streaming=streaming) if watch else None
+        self.set_status("Loading model...", busy=True)
+        self.run_in_background(
+            self.manager.start if self.manager is not None else
+            lambda: DementiaPredictionModel.load_or_train('data.csv', bundle_path, models=self.model_names, streaming=streaming),
+            self.on_model_ready,
+            self.on_model_failed
+        )
+    
+    def run_in_background(self, func, on_success, on_error):
+        """Run func on the worker thread and hand its result to a callback on the UI thread."""
+        future = self.executor.submit(func)
+        self.root.after(POLL_INTERVAL_MS, self._poll_future, future, on_success, on_error)
+    
+    def _poll_future(self, future, on_success, on_error):
+        if not future.done():
+            self.root.after(POLL_INTERVAL_MS, self._poll_future, future, on_success, on_error)
+            return
+        try:
+            result = future.result()
+        except Exception as e:
+            on_error(e)
+        else:
+            on_success(result)
+    
+    def on_model_ready(self, model):
+        """Install the loaded model and enable predictions."""
+        if self.manager is not None and self.model is None:
+            self.root.after(MODEL_CHECK_INTERVAL_MS, self._check_model_swap)
+        self.model = model
+        # Repeated clicks on the same inputs are answered from the cache
+        self.model.enable_prediction_cache()
+        print("Model ready")
+        accuracies = self.model.get_accuracies()
+        for model_name, label in self.accuracy_labels.items():
+            label.configure(text=f"{model_name} (Accuracy: {accuracies.get(model_name, 0):.2%})")
+        self.predict_button.configure(state="normal")
+        self.set_status("Model ready")
+        # Score anything entered while the model was loading
+        self.schedule_prediction()
+    
+    def _check_model_swap(self):
+        # The manager swaps on its own thread; widgets are only touched from this one
+        if self.manager.model is not self.model:
+            self.on_model_ready(self.manager.model)
+        self.root.after(MODEL_CHECK_INTERVAL_MS, self._check_model_swap)
+    
+    def on_model_failed(self, error):
+        self.set_status("Model unavailable")
+        messagebox.showerror("Error", f"Model training failed: {str(error)}")
+    
+    def set_status(self, text, busy=False):
+        """Update the status line and the activity indicator."""
+        self.status_label.configure(text=text)
+        if busy:
+            self.progress_bar.start()
+        else:
+            self.progress_bar.stop()
+            self.progress_bar.set(0)
+    
+    def on_close(self):
+        self.cancel_scheduled_prediction()
+        if self.manager is not None:
+            self.manager.stop()
+        self.executor.shutdown(wait=False, cancel_futures=True)
+        self.root.destroy()
+    
+    def _watch_frames(self):
+        now = time.perf_counter()
+        if self.last_frame is not None:
+            instrumentation.REGISTRY.observe('gui.frame_time', now - self.last_frame)
+        self.last_frame = now
+        self.root.after(FRAME_INTERVAL_MS, self._watch_frames)
     
     def create_widgets(self):
         # Main container with minimal padding
@@ -76,7 +228,7 @@ class DementiaPredictionGUI:
         title_label = ctk.CTkLabel(
             header_frame,
             text="Dementia Prediction System",
-            font=ctk.CTkFont(family="Roboto", size=24, weight="bold"),
+            font=self.fonts['title'],
             text_color=self.colors['text']
         )
         title_label.pack(pady=(8, 4))
@@ -84,48 +236,18 @@ class DementiaPredictionGUI:
         subtitle_label = ctk.CTkLabel(
             header_frame,
             text="Precision Healthcare Analytics Platform",
-            font=ctk.CTkFont(family="Roboto", size=12),
+            font=self.fonts['subtitle'],
             text_color=self.colors['text']
         )
         subtitle_label.pack(pady=(0, 8))
         
-        # Input sections in two-column layout
-        sections = {
-            "👤 Patient Demographics": [
-                ('Age', None, "Enter Age (18–120 years)"),
-                ('Gender', ['Male', 'Female'], "Select Gender (Male, Female)"),
-                ('Weight', None, "Enter Weight (30–200 kg)"),
-                ('Dominant_Hand', ['Right', 'Left'], "Select Dominant Hand (Right, Left)")
-            ],
-            "🏥 Medical History": [
-                ('Diabetic', ['0', '1'], "Select Diabetic Status (0 = No, 1 = Yes)"),
-                ('Family_History', ['Yes', 'No'], "Select Family History (Yes, No)"),
-                ('Chronic_Health_Conditions', ['None', 'Heart Disease', 'Diabetes', 'Hypertension'], "Select Condition (None, Heart Disease, Diabetes, Hypertension)"),
-                ('APOE_ε4', ['Positive', 'Negative'], "Select APOE ε4 Status (Positive, Negative)")
-            ],
-            "❤️ Vital Signs": [
-                ('HeartRate', None, "Enter Heart Rate (40–200 bpm)"),
-                ('BloodOxygenLevel', None, "Enter Blood Oxygen Level (80–100%)"),
-                ('BodyTemperature', None, "Enter Body Temperature (35–40°C)")
-            ],
-            "🌿 Lifestyle Factors": [
-                ('AlcoholLevel', None, "Enter Alcohol Level (0–0.08 BAC)"),
-                ('Smoking_Status', ['Never Smoked', 'Former Smoker', 'Current Smoker'], "Select Smoking Status (Never Smoked, Former Smoker, Current Smoker)"),
-                ('Physical_Activity', ['Sedentary', 'Mild Activity', 'Moderate Activity', 'High Activity'], "Select Activity Level (Sedentary, Mild, Moderate, High)"),
-                ('Sleep_Quality', ['Good', 'Fair', 'Poor'], "Select Sleep Quality (Good, Fair, Poor)"),
-                ('Nutrition_Diet', ['Balanced Diet', 'Low-Carb Diet', 'Mediterranean Diet', 'Other'], "Select Diet (Balanced, Low-Carb, Mediterranean, Other)")
-            ],
-            "🧠 Clinical Assessment": [
-                ('Cognitive_Test_Scores', ['0', '1', '2', '3', '4', '5', '6', '7', '8', '9', '10'], "Select Cognitive Score (0–10)"),
-                ('Depression_Status', ['Yes', 'No'], "Select Depression Status (Yes, No)"),
-                ('MRI_Delay', None, "Enter MRI Delay (0–60 minutes)")
-            ],
-            "💊 Medication": [
-                ('Prescription', ['Galantamine', 'Memantine', 'Rivastigmine', 'Donepezil', 'None'], "Select Prescription (Galantamine, Memantine, Rivastigmine, Donepezil, None)"),
-                ('Dosage in mg', None, "Enter Dosage (0–100 mg)"),
-                ('Medication_History', ['Yes', 'No'], "Select Medication History (Yes, No)")
-            ]
-        }
+        # Input sections in two-column layout, built from the feature schema
+        sections = {}
+        for field, spec in FEATURE_SCHEMA.items():
+            section_name = f"{SECTION_ICONS.get(spec['section'], '')} {spec['section']}".strip()
+            sections.setdefault(section_name, []).append(
+                (field, field_widget_values(spec), field_tooltip(field, spec))
+            )
         
         self.inputs = {}
         left_frame = ctk.CTkFrame(self.scrollable_frame, fg_color=self.colors['background'])
@@ -157,7 +279,7 @@ class DementiaPredictionGUI:
             ctk.CTkLabel(
                 section_frame,
                 text=section_name,
-                font=ctk.CTkFont(family="Roboto", size=16, weight="bold"),
+                font=self.fonts['section'],
                 text_color=self.colors['text']
             ).pack(pady=(6, 4), padx=8, anchor="w")
             
@@ -170,7 +292,7 @@ class DementiaPredictionGUI:
                 label = ctk.CTkLabel(
                     grid_frame,
                     text=field.replace('_', ' '),
-                    font=ctk.CTkFont(family="Roboto", size=11),
+                    font=self.fonts['field'],
                     text_color=self.colors['text']
                 )
                 label.grid(row=i, column=0, padx=(8, 6), pady=3, sticky="e")
@@ -184,20 +306,21 @@ class DementiaPredictionGUI:
                         values=values,
                         width=200,
                         height=28,
-                        font=ctk.CTkFont(family="Roboto", size=11),
+                        font=self.fonts['field'],
                         border_width=2,
                         border_color=self.colors['border'],
                         button_color=self.colors['primary'],
                         button_hover_color=self.colors['accent'],
-                        dropdown_font=ctk.CTkFont(family="Roboto", size=11),
-                        text_color=self.colors['text']
+                        dropdown_font=self.fonts['field'],
+                        text_color=self.colors['text'],
+                        command=lambda choice: self.schedule_prediction()
                     )
                 else:
                     self.inputs[field] = ctk.CTkEntry(
                         grid_frame,
                         width=200,
                         height=28,
-                        font=ctk.CTkFont(family="Roboto", size=11),
+                        font=self.fonts['field'],
                         border_width=2,
                         border_color=self.colors['border'],
                         placeholder_text=tooltip,
@@ -206,6 +329,8 @@ class DementiaPredictionGUI:
                 self.inputs[field].grid(row=i, column=1, padx=8, pady=3, sticky="w")
                 self.inputs[field].bind("<Enter>", lambda e, t=tooltip: self.show_tooltip(e, t))
                 self.inputs[field].bind("<Leave>", lambda e: self.hide_tooltip())
+                # Typing in an entry or a combo box restarts the live prediction timer
+                self.inputs[field].bind("<KeyRelease>", lambda e: self.schedule_prediction())
             
             if section_count < 3:
                 current_row_left += 1
@@ -217,11 +342,11 @@ class DementiaPredictionGUI:
         button_frame = ctk.CTkFrame(self.scrollable_frame, fg_color=self.colors['background'])
         button_frame.grid(row=2, column=0, columnspan=2, pady=(10, 10), padx=10, sticky="ew")
         
-        # Predict button (prominently placed)
-        predict_button = ctk.CTkButton(
+        # Predict button (prominently placed), disabled until the model is ready
+        self.predict_button = ctk.CTkButton(
             button_frame,
             text="Generate Prediction",
-            font=ctk.CTkFont(family="Roboto", size=14, weight="bold"),
+            font=self.fonts['button'],
             height=40,
             width=200,
             corner_radius=15,
@@ -229,15 +354,16 @@ class DementiaPredictionGUI:
             fg_color=self.colors['primary'],
             hover_color=self.colors['accent'],
             border_width=2,
-            border_color=self.colors['border']
+            border_color=self.colors['border'],
+            state="disabled"
         )
-        predict_button.pack(side="left", padx=10)
+        self.predict_button.pack(side="left", padx=10)
         
         # Clear button
         clear_button = ctk.CTkButton(
             button_frame,
             text="Clear Inputs",
-            font=ctk.CTkFont(family="Roboto", size=14, weight="bold"),
+            font=self.fonts['button'],
             height=40,
             width=200,
             corner_radius=15,
@@ -249,6 +375,24 @@ class DementiaPredictionGUI:
         )
         clear_button.pack(side="left", padx=10)
         
+        # Status line with an activity indicator for background work
+        self.progress_bar = ctk.CTkProgressBar(
+            button_frame,
+            mode="indeterminate",
+            width=160,
+            progress_color=self.colors['secondary']
+        )
+        self.progress_bar.pack(side="right", padx=10)
+        self.progress_bar.set(0)
+        
+        self.status_label = ctk.CTkLabel(
+            button_frame,
+            text="",
+            font=self.fonts['status'],
+            text_color=self.colors['text']
+        )
+        self.status_label.pack(side="right", padx=10)
+        
         # Results section
         self.results_frame = ctk.CTkFrame(
             self.scrollable_frame,
@@ -262,7 +406,7 @@ class DementiaPredictionGUI:
         results_title = ctk.CTkLabel(
             self.results_frame,
             text="📊 Prediction Results",
-            font=ctk.CTkFont(family="Roboto", size=16, weight="bold"),
+            font=self.fonts['section'],
             text_color=self.colors['text']
         )
         results_title.pack(pady=(6, 4))
@@ -272,19 +416,21 @@ class DementiaPredictionGUI:
         models_frame = ctk.CTkFrame(self.results_frame, fg_color="#2D2D2D")
         models_frame.pack(fill="x", padx=8, pady=(0, 6))
         
-        # Get model accuracies
-        accuracies = self.model.get_accuracies()
+        # Accuracies are filled in once the model has loaded
+        self.accuracy_labels = {}
+        self.explanation_labels = {}
         
-        for i, model_name in enumerate(['Logistic Regression', 'Random Forest', 'XGBoost']):
+        for i, model_name in enumerate(self.model_names):
             model_frame = ctk.CTkFrame(models_frame, fg_color=self.colors['background'], corner_radius=6)
             model_frame.pack(fill="x", padx=8, pady=4)
             
-            ctk.CTkLabel(
+            self.accuracy_labels[model_name] = ctk.CTkLabel(
                 model_frame,
-                text=f"{model_name} (Accuracy: {accuracies.get(model_name, 0):.2%})",
-                font=ctk.CTkFont(family="Roboto", size=12, weight="bold"),
+                text=f"{model_name} (Accuracy: --)",
+                font=self.fonts['model'],
                 text_color=self.colors['text']
-            ).pack(pady=(4, 3))
+            )
+            self.accuracy_labels[model_name].pack(pady=(4, 3))
             
             results_subframe = ctk.CTkFrame(model_frame, fg_color="transparent")
             results_subframe.pack(fill="x", padx=8, pady=(0, 4))
@@ -292,7 +438,7 @@ class DementiaPredictionGUI:
             self.result_labels[f"{model_name}_no_dementia"] = ctk.CTkLabel(
                 results_subframe,
                 text="No Dementia: --",
-                font=ctk.CTkFont(family="Roboto", size=11),
+                font=self.fonts['result'],
                 text_color=self.colors['secondary']
             )
             self.result_labels[f"{model_name}_no_dementia"].pack(side="left", padx=8)
@@ -300,33 +446,48 @@ class DementiaPredictionGUI:
             self.result_labels[f"{model_name}_dementia"] = ctk.CTkLabel(
                 results_subframe,
                 text="Dementia: --",
-                font=ctk.CTkFont(family="Roboto", size=11),
+                font=self.fonts['result'],
                 text_color=self.colors['accent']
             )
             self.result_labels[f"{model_name}_dementia"].pack(side="right", padx=8)
+            
+            # Features that pushed this model's score the most, from explain_record()
+            self.explanation_labels[model_name] = ctk.CTkLabel(
+                model_frame,
+                text="Top factors: --",
+                font=self.fonts['field'],
+                text_color=self.colors['text']
+            )
+            self.explanation_labels[model_name].pack(pady=(0, 4))
     
-    def show_tooltip(self, event, text):
-        """Show tooltip near the widget."""
-        x = event.widget.winfo_rootx() + 20
-        y = event.widget.winfo_rooty() + 20
+    def create_tooltip(self):
+        """Create the single tooltip window, hidden until a label or input is hovered."""
         self.tooltip = ctk.CTkToplevel(self.root)
         self.tooltip.wm_overrideredirect(True)
-        self.tooltip.wm_geometry(f"+{x}+{y}")
-        label = ctk.CTkLabel(
+        self.tooltip.withdraw()
+        self.tooltip_label = ctk.CTkLabel(
             self.tooltip,
-            text=text,
+            text="",
+            font=self.fonts['field'],
             fg_color="#424242",
             text_color=self.colors['text'],
-            padding=(5, 5),
             corner_radius=5
         )
-        label.pack()
+        self.tooltip_label.pack(padx=5, pady=5)
+    
+    def show_tooltip(self, event, text):
+        """Show tooltip near the widget."""
+        with span('gui.show_tooltip'):
+            x = event.widget.winfo_rootx() + 20
+            y = event.widget.winfo_rooty() + 20
+            self.tooltip_label.configure(text=text)
+            self.tooltip.wm_geometry(f"+{x}+{y}")
+            self.tooltip.deiconify()
+            self.tooltip.lift()
     
     def hide_tooltip(self):
         """Hide the tooltip."""
-        if hasattr(self, 'tooltip'):
-            self.tooltip.destroy()
-            del self.tooltip
+        self.tooltip.withdraw()
     
     def clear_inputs(self):
         """Clear all input fields."""
@@ -335,60 +496,159 @@ class DementiaPredictionGUI:
                 widget.delete(0, "end")
             elif isinstance(widget, ctk.CTkComboBox):
                 widget.set("")
-        for model_name in ['Logistic Regression', 'Random Forest', 'XGBoost']:
-            self.result_labels[f"{model_name}_no_dementia"].configure(text="No Dementia: --")
-            self.result_labels[f"{model_name}_dementia"].configure(text="Dementia: --")
+        # Drop any pending or in-flight prediction for the old inputs
+        self.cancel_scheduled_prediction()
+        self.prediction_seq += 1
+        if self.model is not None:
+            self.root.config(cursor="")
+            self.predict_button.configure(state="normal")
+            self.set_status("Model ready")
+        self.clear_results()
+    
+    def clear_results(self):
+        """Blank the probabilities and top factors, so no result outlives the inputs it was for."""
+        for model_name in self.model_names:
+            self.result_labels[f"{model_name}_no_dementia"].configure(text="No Dementia: --", font=self.fonts['result'])
+            self.result_labels[f"{model_name}_dementia"].configure(text="Dementia: --", font=self.fonts['result'])
+            self.explanation_labels[model_name].configure(text="Top factors: --")
+    
+    def schedule_prediction(self):
+        """Restart the debounce timer for a live prediction."""
+        if self.model is None:
+            return
+        self.cancel_scheduled_prediction()
+        self.live_prediction_job = self.root.after(LIVE_PREDICTION_DELAY_MS, self.live_prediction)
+    
+    def cancel_scheduled_prediction(self):
+        if self.live_prediction_job is not None:
+            self.root.after_cancel(self.live_prediction_job)
+            self.live_prediction_job = None
+    
+    def live_prediction(self):
+        """Re-score the inputs once every field holds a usable value."""
+        self.live_prediction_job = None
+        with span('gui.live_prediction'):
+            input_string, errors = self.collect_inputs()
+            if errors:
+                # Incomplete inputs are normal while typing: wait quietly for the next edit
+                # Results still in flight are for the old inputs
+                self.prediction_seq += 1
+                self.root.config(cursor="")
+                self.predict_button.configure(state="normal")
+                self.clear_results()
+                self.set_status("Waiting for valid inputs")
+                return
+            self.start_prediction(input_string, live=True)
+    
+    def collect_inputs(self):
+        """Return the comma-separated inputs and their validation errors against the feature schema."""
+        input_values = [self.inputs[field].get().strip() for field in FEATURE_COLUMNS]
+        errors = record_errors(input_values, self.model.extra_categories if self.model is not None else None)
+        return ','.join(input_values), errors
     
     def make_prediction(self):
+        with span('gui.make_prediction'):
+            self._make_prediction()
+    
+    def _make_prediction(self):
         try:
-            self.root.config(cursor="wait")
-            
             # Gather inputs
-            input_values = []
-            for field in [
-                'Diabetic', 'AlcoholLevel', 'HeartRate', 'BloodOxygenLevel', 
-                'BodyTemperature', 'Weight', 'MRI_Delay', 'Prescription', 
-                'Dosage in mg', 'Age', 'Dominant_Hand', 'Gender', 
-                'Family_History', 'Smoking_Status', 'APOE_ε4', 
-                'Physical_Activity', 'Depression_Status', 'Cognitive_Test_Scores', 
-                'Medication_History', 'Nutrition_Diet', 'Sleep_Quality', 
-                'Chronic_Health_Conditions'
-            ]:
-                value = self.inputs[field].get()
-                if value == '':
-                    messagebox.showerror("Error", f"Please fill in the {field.replace('_', ' ')} field")
-                    self.root.config(cursor="")
-                    return
-                input_values.append(str(value))
-            
-            # Make prediction
-            input_string = ','.join(input_values)
-            predictions = self.model.predict(input_string)
-            
-            # Update results
-            if predictions:
-                for model_name, probs in predictions.items():
-                    self.result_labels[f"{model_name}_no_dementia"].configure(
-                        text=f"No Dementia: {probs[0]:.1%}",
-                        font=ctk.CTkFont(family="Roboto", size=11, weight="bold")
-                    )
-                    self.result_labels[f"{model_name}_dementia"].configure(
-                        text=f"Dementia: {probs[1]:.1%}",
-                        font=ctk.CTkFont(family="Roboto", size=11, weight="bold")
-                    )
-            else:
-                messagebox.showerror("Error", "Prediction failed. Please check your inputs.")
-            
-            self.root.config(cursor="")
+            input_string, errors = self.collect_inputs()
+            if errors:
+                self.clear_results()
+                messagebox.showerror("Error", "Please check the inputs:\n" + "\n".join(errors))
+                return
+            self.cancel_scheduled_prediction()
+            self.start_prediction(input_string, live=False)
                 
         except Exception as e:
             messagebox.showerror("Error", f"An error occurred: {str(e)}")
-            self.root.config(cursor="")
+    
+    def start_prediction(self, input_string, live):
+        """Score input_string on the worker thread; only the newest request is shown."""
+        self.prediction_seq += 1
+        seq = self.prediction_seq
+        if not live:
+            self.root.config(cursor="wait")
+            self.predict_button.configure(state="disabled")
+        self.set_status("Predicting...", busy=True)
+        self.prediction_started = time.perf_counter()
+        self.run_in_background(
+            lambda: self._predict_if_current(input_string, seq),
+            lambda result: self.show_predictions(result, seq, live),
+            lambda error: self.on_prediction_failed(error, seq, live)
+        )
+    
+    def _predict_if_current(self, input_string, seq):
+        # Runs on the worker: skip requests superseded while they waited in the queue
+        if seq != self.prediction_seq:
+            return None
+        # Read once so a model swapped in meanwhile cannot mix versions in one result
+        model = self.model
+        predictions = model.predict(input_string)
+        explanations = model.explain_record(input_string) if predictions else None
+        return predictions, explanations
+    
+    def show_predictions(self, result, seq, live=False):
+        """Update the results panel with a finished prediction and its explanation."""
+        if seq != self.prediction_seq:
+            # A newer request is pending; its result will replace this one
+            instrumentation.increment('gui.stale_predictions_dropped')
+            return
+        with span('gui.show_predictions'):
+            self._show_predictions(*result, live)
+    
+    def _show_predictions(self, predictions, explanations, live):
+        if instrumentation.is_enabled():
+            # Request to results on screen, including the wait for the worker and the poll
+            instrumentation.REGISTRY.observe('gui.prediction_roundtrip', time.perf_counter() - self.prediction_started)
+        self.root.config(cursor="")
+        self.predict_button.configure(state="normal")
+        self.set_status("Model ready")
+        
+        # Update results, blanking models left out of this prediction
+        self.clear_results()
+        if predictions:
+            for model_name, probs in predictions.items():
+                self.result_labels[f"{model_name}_no_dementia"].configure(
+                    text=f"No Dementia: {probs[0]:.1%}",
+                    font=self.fonts['result_bold']
+                )
+                self.result_labels[f"{model_name}_dementia"].configure(
+                    text=f"Dementia: {probs[1]:.1%}",
+                    font=self.fonts['result_bold']
+                )
+                if explanations and model_name in explanations:
+                    self.explanation_labels[model_name].configure(text=format_explanation(explanations[model_name]))
+        elif live:
+            # Values the model cannot encode yet, e.g. a half-typed category
+            self.set_status("Check inputs")
+        else:
+            messagebox.showerror("Error", "Prediction failed. Please check your inputs.")
+    
+    def on_prediction_failed(self, error, seq, live=False):
+        if seq != self.prediction_seq:
+            return
+        self.root.config(cursor="")
+        self.predict_button.configure(state="normal")
+        self.set_status("Prediction failed" if live else "Model ready")
+        self.clear_results()
+        if not live:
+            messagebox.showerror("Error", f"An error occurred: {str(error)}")
 
 def main():
-    root = ctk.CTk()
-    app = DementiaPredictionGUI(root)
-    root.mainloop()
+    parser = argparse.ArgumentParser(description="Dementia prediction GUI")
+    parser.add_argument('--models', help="Comma-separated subset of lr,rf,xgb to load, e.g. lr for a lightweight kiosk")
+    parser.add_argument('--bundle', default=BUNDLE_PATH)
+    parser.add_argument('--watch', action='store_true', help="Retrain in the background when data.csv changes and switch to the new model")
+    parser.add_argument('--stream', action='store_true', help="Use (or train) an out-of-core model, see model.py --stream")
+    instrumentation.add_arguments(parser)
+    args = parser.parse_args()
+    
+    with instrumentation.session(args):
+        root = ctk.CTk()
+        app = DementiaPredictionGUI(root, args.models, args.bundle, args.watch, args.stream)
+        root.mainloop()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,155 @@
+import copy
+import os
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+import pandas as pd
+from instrumentation import span, increment
+from tree_compiler import best_rounds
+from model import FEATURE_COLUMNS, BATCH_CHUNK_SIZE, COMPILED_TREES_MAX_ROWS, record_errors, validate_records, _iter_feature_chunks
+
+def _logistic_scorer(estimator):
+    # One matrix-vector product instead of sklearn's per-call input checks
+    coef = np.array(estimator.coef_, dtype=float).ravel()
+    intercept = float(np.ravel(estimator.intercept_)[0])
+
+    def predict_proba(X):
+        # Numerically stable sigmoid of the decision function
+        p = np.exp(-np.logaddexp(0, -(X @ coef + intercept)))
+        return np.column_stack([1 - p, p])
+    return predict_proba
+
+def _forest_scorer(estimator, compiled):
+    # sklearn walks its trees in Cython with the GIL released; small batches are
+    # cheaper on the compiled NumPy evaluator. A private copy of the forest,
+    # since update() and train() refit the model's one in place
+    estimator = copy.deepcopy(estimator)
+
+    def predict_proba(X):
+        if compiled is not None and len(X) <= COMPILED_TREES_MAX_ROWS:
+            return compiled.predict_proba(X)
+        return estimator.predict_proba(X)
+    return predict_proba
+
+def _xgboost_scorer(estimator, compiled):
+    # A private copy of the booster, so nothing the engine calls into is shared
+    booster = estimator.get_booster().copy()
+    rounds = best_rounds(estimator)
+
+    def predict_proba(X):
+        if compiled is not None and len(X) <= COMPILED_TREES_MAX_ROWS:
+            return compiled.predict_proba(X)
+        # inplace_predict skips building a DMatrix and runs with the GIL released
+        p = booster.inplace_predict(X, validate_features=False, iteration_range=(0, rounds))
+        return np.column_stack([1 - p, p])
+    return predict_proba
+
+_SCORER_BUILDERS = {
+    'Logistic Regression': lambda estimator, compiled: _logistic_scorer(estimator),
+    'Random Forest': _forest_scorer,
+    'XGBoost': _xgboost_scorer
+}
+
+class InferenceEngine:
+    """Thread-safe scoring of a fitted DementiaPredictionModel.
+
+    The engine works on copies of the model's fitted state taken when it is
+    built, so later changes to the model do not reach it and any number of
+    threads may call predict and predict_batch at once. Each call scores its rows with every model
+    concurrently: the calling thread runs the first model while a shared pool
+    runs the others. Logistic Regression is a NumPy dot product, the forests
+    use the compiled evaluators up to COMPILED_TREES_MAX_ROWS rows and the
+    library entry points that release the GIL above that, and batches are
+    preprocessed without pandas. The prediction cache and cascade mode are
+    per-model state and are not used. Build a new engine after update() or a
+    model swap.
+    """
+    def __init__(self, model, workers=None):
+        if model.version is None:
+            raise ValueError("Model has not been trained")
+        self.version = model.version
+        self.extra_categories = {col: frozenset(values) for col, values in model.extra_categories.items()}
+        self.preprocessor = model.compiled_preprocessor
+        # The pandas fallback runs on a private copy of the fitted state, which
+        # train() refits in place; preprocess_data only reads it when is_training is False
+        snapshot = copy.copy(model)
+        for attr in ('label_encoders', 'category_mappings', 'imputer', 'scaler'):
+            setattr(snapshot, attr, copy.deepcopy(getattr(model, attr)))
+        self._preprocess_data = snapshot.preprocess_data
+        self.scorers = {
+            name: _SCORER_BUILDERS[name](estimator, model.compiled_trees.get(name))
+            for name, estimator in model.estimators().items()
+        }
+        if workers is None:
+            # Fanning out only pays when another core can run the other models
+            cpu_count = os.cpu_count() or 1
+            workers = cpu_count if cpu_count > 1 else 0
+        self.executor = ThreadPoolExecutor(workers, thread_name_prefix='inference') if workers else None
+
+    def close(self):
+        if self.executor is not None:
+            self.executor.shutdown()
+
+    def predict(self, record):
+        """Return each model's [no dementia, dementia] probabilities for one record.
+
+        record is a comma-joined string or a list of the 22 raw values. Raises
+        ValueError with the validation messages when the record is invalid.
+        """
+        values = record.split(',') if isinstance(record, str) else list(record)
+        errors = record_errors(values, self.extra_categories)
+        if errors:
+            raise ValueError('; '.join(errors))
+        with span('engine.predict'):
+            if self.preprocessor is not None:
+                X = self.preprocessor.transform_row(values)
+            else:
+                X = self._preprocess_data(pd.DataFrame([values], columns=FEATURE_COLUMNS), is_training=False)
+            return {name: probs[0] for name, probs in self._score(X).items()}
+
+    def predict_batch(self, data, chunksize=BATCH_CHUNK_SIZE, errors=None):
+        """Return an (n, 2) probability array per model, like DementiaPredictionModel.predict_batch.
+
+        Rows that fail validation are NaN and, when errors is a list, reported
+        in it as (row position, messages) pairs.
+        """
+        results = {name: [] for name in self.scorers}
+        offset = 0
+        for chunk in _iter_feature_chunks(data, chunksize):
+            valid, chunk_errors = validate_records(chunk, self.extra_categories)
+            if errors is not None:
+                errors.extend((offset + row, messages) for row, messages in chunk_errors.items())
+            offset += len(chunk)
+            with span('engine.batch'):
+                if valid.all():
+                    scored = self._score(self._transform(chunk))
+                else:
+                    increment('rows_rejected', len(chunk_errors))
+                    scored = {name: np.full((len(chunk), 2), np.nan) for name in self.scorers}
+                    if valid.any():
+                        for name, probs in self._score(self._transform(chunk[valid])).items():
+                            scored[name][valid] = probs
+            for name, probs in scored.items():
+                results[name].append(probs)
+        return {
+            name: np.concatenate(probs) if probs else np.empty((0, 2))
+            for name, probs in results.items()
+        }
+
+    def _transform(self, chunk):
+        if self.preprocessor is not None:
+            return self.preprocessor.transform(chunk)
+        return self._preprocess_data(chunk, is_training=False)
+
+    def _score(self, X):
+        """Score preprocessed rows with every model, in parallel when a pool is available."""
+        items = list(self.scorers.items())
+        if self.executor is None or len(items) == 1:
+            predictions = {name: scorer(X) for name, scorer in items}
+        else:
+            futures = [(name, self.executor.submit(scorer, X)) for name, scorer in items[1:]]
+            name, scorer = items[0]
+            predictions = {name: scorer(X)}
+            for name, future in futures:
+                predictions[name] = future.result()
+        increment('rows_scored', len(X))
+        return predictions
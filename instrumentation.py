@@ -0,0 +1,286 @@
+import cProfile
+import io
+import json
+import pstats
+import sys
+import threading
+import time
+from bisect import bisect_left
+from collections import Counter
+from contextlib import contextmanager
+
+# Histogram bucket upper bounds in seconds, from single-row predictions to full fits
+BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05,
+           0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+METRIC_PREFIX = 'dementia'
+PROFILE_MODES = ('cprofile', 'sample')
+SAMPLE_INTERVAL = 0.005  # Seconds between stack samples
+PROFILE_TOP = 25  # Functions printed in a profile summary
+
+class _NullSpan:
+    """Shared do-nothing span handed out while instrumentation is disabled."""
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+_NULL_SPAN = _NullSpan()
+
+class _Span:
+    __slots__ = ('registry', 'name', 'start')
+
+    def __init__(self, registry, name):
+        self.registry = registry
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.registry.observe(self.name, time.perf_counter() - self.start)
+        return False
+
+class Histogram:
+    """Span durations counted into fixed buckets, plus their count, sum and maximum."""
+    def __init__(self, buckets=BUCKETS):
+        self.buckets = buckets
+        self.bucket_counts = [0] * (len(buckets) + 1)  # Last slot is +Inf
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, value):
+        self.bucket_counts[bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+        self.max = max(self.max, value)
+
+    def cumulative_counts(self):
+        """Return (upper bound, observations <= bound) pairs ending with +Inf."""
+        total = 0
+        pairs = []
+        for bound, count in zip(self.buckets + (float('inf'),), self.bucket_counts):
+            total += count
+            pairs.append((bound, total))
+        return pairs
+
+class Registry:
+    """Thread-safe store of span histograms and event counters.
+
+    Disabled by default: span() then returns a shared no-op context manager and
+    increment() returns straight away, so instrumented code pays one attribute
+    check per call.
+    """
+    def __init__(self):
+        self.enabled = False
+        self.lock = threading.Lock()
+        self.histograms = {}
+        self.counters = {}
+
+    def span(self, name):
+        """Time the enclosed block into the histogram called name."""
+        if not self.enabled:
+            return _NULL_SPAN
+        return _Span(self, name)
+
+    def observe(self, name, seconds):
+        with self.lock:
+            histogram = self.histograms.get(name)
+            if histogram is None:
+                histogram = self.histograms[name] = Histogram()
+            histogram.observe(seconds)
+
+    def increment(self, name, amount=1):
+        """Add amount to the counter called name."""
+        if not self.enabled:
+            return
+        with self.lock:
+            self.counters[name] = self.counters.get(name, 0) + amount
+
+    def reset(self):
+        with self.lock:
+            self.histograms = {}
+            self.counters = {}
+
+    def snapshot(self):
+        """Return the spans and counters as plain dictionaries."""
+        with self.lock:
+            spans = {
+                name: {
+                    'count': h.count,
+                    'sum_s': h.sum,
+                    'mean_s': h.sum / h.count if h.count else 0.0,
+                    'max_s': h.max,
+                    'buckets': [[_format_bound(bound), count] for bound, count in h.cumulative_counts()]
+                }
+                for name, h in sorted(self.histograms.items())
+            }
+            counters = dict(sorted(self.counters.items()))
+        return {'spans': spans, 'counters': counters}
+
+    def to_prometheus(self):
+        """Render the metrics in the Prometheus text exposition format."""
+        snapshot = self.snapshot()
+        lines = [
+            f"# HELP {METRIC_PREFIX}_span_seconds Wall time of instrumented stages.",
+            f"# TYPE {METRIC_PREFIX}_span_seconds histogram"
+        ]
+        for name, span in snapshot['spans'].items():
+            label = _escape_label(name)
+            for bound, count in span['buckets']:
+                lines.append(f'{METRIC_PREFIX}_span_seconds_bucket{{span="{label}",le="{bound}"}} {count}')
+            lines.append(f'{METRIC_PREFIX}_span_seconds_sum{{span="{label}"}} {span["sum_s"]!r}')
+            lines.append(f'{METRIC_PREFIX}_span_seconds_count{{span="{label}"}} {span["count"]}')
+        lines.append(f"# HELP {METRIC_PREFIX}_events_total Counted events such as scored rows.")
+        lines.append(f"# TYPE {METRIC_PREFIX}_events_total counter")
+        for name, value in snapshot['counters'].items():
+            lines.append(f'{METRIC_PREFIX}_events_total{{event="{_escape_label(name)}"}} {value}')
+        return '\n'.join(lines) + '\n'
+
+    def to_json_lines(self):
+        """Render the metrics as one JSON object per span or counter."""
+        snapshot = self.snapshot()
+        timestamp = time.time()
+        lines = [
+            json.dumps(dict(type='span', name=name, timestamp=timestamp, **span))
+            for name, span in snapshot['spans'].items()
+        ]
+        lines.extend(
+            json.dumps({'type': 'counter', 'name': name, 'timestamp': timestamp, 'value': value})
+            for name, value in snapshot['counters'].items()
+        )
+        return ''.join(line + '\n' for line in lines)
+
+    def dump(self, path):
+        """Write the metrics to path: JSON lines for .jsonl/.json files, Prometheus text otherwise."""
+        if path.endswith(('.jsonl', '.json')):
+            text = self.to_json_lines()
+        else:
+            text = self.to_prometheus()
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(text)
+
+REGISTRY = Registry()
+span = REGISTRY.span
+increment = REGISTRY.increment
+
+def enable():
+    REGISTRY.enabled = True
+
+def disable():
+    REGISTRY.enabled = False
+
+def is_enabled():
+    return REGISTRY.enabled
+
+def _format_bound(bound):
+    return '+Inf' if bound == float('inf') else repr(bound)
+
+def _escape_label(value):
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+class SamplingProfiler:
+    """Samples the stacks of every thread at a fixed interval.
+
+    Unlike cProfile, which only sees the thread that started it, this also
+    covers the fit and predict worker threads, and its overhead does not grow
+    with the number of Python calls.
+    """
+    def __init__(self, interval=SAMPLE_INTERVAL):
+        self.interval = interval
+        self.samples = 0
+        self.own = Counter()  # Function -> samples with it on top of the stack
+        self.total = Counter()  # Function -> samples with it anywhere on the stack
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self):
+        own_id = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_id:
+                    continue
+                self.samples += 1
+                self.own[_frame_label(frame)] += 1
+                seen = set()
+                while frame is not None:
+                    seen.add(_frame_label(frame))
+                    frame = frame.f_back
+                self.total.update(seen)
+
+    def report(self, limit=PROFILE_TOP):
+        """Return the functions seen most often, with their own and cumulative sample shares."""
+        out = io.StringIO()
+        out.write(f"{self.samples} samples every {self.interval * 1000:.1f} ms\n")
+        out.write(f"{'own %':>8}{'total %':>9}  function\n")
+        for label, count in self.total.most_common(limit):
+            out.write(f"{self.own[label] / self.samples:>8.1%}{count / self.samples:>9.1%}  {label}\n")
+        return out.getvalue()
+
+def _frame_label(frame):
+    code = frame.f_code
+    return f"{code.co_name} ({code.co_filename}:{code.co_firstlineno})"
+
+@contextmanager
+def profile(mode='cprofile', path=None, limit=PROFILE_TOP):
+    """Profile the enclosed block, print the hottest functions and optionally save the result.
+
+    'cprofile' writes pstats data to path (readable with pstats or snakeviz);
+    'sample' samples all threads and writes the text report to path.
+    """
+    if mode not in PROFILE_MODES:
+        raise ValueError(f"Unknown profile mode: {mode}")
+    if mode == 'cprofile':
+        profiler = cProfile.Profile()
+        profiler.enable()
+    else:
+        profiler = SamplingProfiler()
+        profiler.start()
+    try:
+        yield profiler
+    finally:
+        if mode == 'cprofile':
+            profiler.disable()
+            out = io.StringIO()
+            pstats.Stats(profiler, stream=out).sort_stats('cumulative').print_stats(limit)
+            report = out.getvalue()
+            if path:
+                profiler.dump_stats(path)
+        else:
+            profiler.stop()
+            report = profiler.report(limit)
+            if path:
+                with open(path, 'w', encoding='utf-8') as f:
+                    f.write(profiler.report(limit=None))
+        print(report)
+
+def add_arguments(parser):
+    """Add the --metrics-output and --profile options shared by the entry points."""
+    parser.add_argument('--metrics-output', help="Record timing spans and write them here on exit (.prom or .jsonl)")
+    parser.add_argument('--profile', choices=PROFILE_MODES, help="Profile the run with cProfile or a stack sampler")
+    parser.add_argument('--profile-output', help="File for the profile data")
+
+@contextmanager
+def session(args):
+    """Apply the options from add_arguments() around a run."""
+    if args.metrics_output:
+        enable()
+    try:
+        if args.profile:
+            with profile(args.profile, args.profile_output):
+                yield
+        else:
+            yield
+    finally:
+        if args.metrics_output:
+            REGISTRY.dump(args.metrics_output)
+            print(f"Metrics written to {args.metrics_output}")
@@ -0,0 +1,103 @@
+import argparse
+import json
+import threading
+import time
+import urllib.request
+import numpy as np
+import pandas as pd
+from model import DementiaPredictionModel, FEATURE_COLUMNS, BUNDLE_PATH
+from service import create_server, MAX_BATCH_SIZE, MAX_WAIT_MS
+
+def load_records(data_path, limit):
+    """Read up to limit rows of the CSV as JSON-ready lists of 22 values."""
+    data = pd.read_csv(data_path, encoding='utf-8', nrows=limit)[FEATURE_COLUMNS]
+    data = data.astype(object).where(data.notna(), None)
+    return data.values.tolist()
+
+def post_json(url, body):
+    request = urllib.request.Request(
+        url, data=json.dumps(body).encode('utf-8'),
+        headers={'Content-Type': 'application/json'}
+    )
+    with urllib.request.urlopen(request) as response:
+        return json.loads(response.read())
+
+def run_load_test(base_url, records, total_requests, concurrency):
+    """Send single-record requests from concurrency threads and collect latencies."""
+    latencies = []
+    errors = []
+    lock = threading.Lock()
+    counter = iter(range(total_requests))
+
+    def worker():
+        while True:
+            with lock:
+                i = next(counter, None)
+            if i is None:
+                return
+            start = time.perf_counter()
+            try:
+                post_json(f"{base_url}/predict", {'record': records[i % len(records)]})
+            except Exception as e:
+                with lock:
+                    errors.append(str(e))
+                continue
+            elapsed = time.perf_counter() - start
+            with lock:
+                latencies.append(elapsed)
+
+    start = time.perf_counter()
+    threads = [threading.Thread(target=worker) for _ in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    wall_time = time.perf_counter() - start
+
+    latencies_ms = np.array(latencies) * 1000
+    return {
+        'requests': total_requests,
+        'errors': len(errors),
+        'concurrency': concurrency,
+        'wall_time_s': wall_time,
+        'throughput_rps': len(latencies) / wall_time if wall_time else 0.0,
+        'latency_ms': {
+            'p50': float(np.percentile(latencies_ms, 50)) if len(latencies_ms) else None,
+            'p95': float(np.percentile(latencies_ms, 95)) if len(latencies_ms) else None,
+            'p99': float(np.percentile(latencies_ms, 99)) if len(latencies_ms) else None
+        }
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Localhost load test for the scoring service")
+    parser.add_argument('--url', help="Base URL of a running service; starts one in-process if omitted")
+    parser.add_argument('--data', default='data.csv')
+    parser.add_argument('--bundle', default=BUNDLE_PATH)
+    parser.add_argument('--requests', type=int, default=2000)
+    parser.add_argument('--concurrency', type=int, default=16)
+    parser.add_argument('--max-batch-size', type=int, default=MAX_BATCH_SIZE)
+    parser.add_argument('--max-wait-ms', type=float, default=MAX_WAIT_MS)
+    args = parser.parse_args()
+
+    server = None
+    base_url = args.url
+    if base_url is None:
+        # Self-hosted on an ephemeral localhost port
+        model = DementiaPredictionModel.load_or_train(args.data, args.bundle)
+        server = create_server(model, '127.0.0.1', 0, args.max_batch_size, args.max_wait_ms)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        base_url = f"http://127.0.0.1:{server.server_address[1]}"
+
+    try:
+        records = load_records(args.data, limit=1000)
+        results = run_load_test(base_url, records, args.requests, args.concurrency)
+        with urllib.request.urlopen(f"{base_url}/stats") as response:
+            results['service_stats'] = json.loads(response.read())
+        print(json.dumps(results, indent=2))
+    finally:
+        if server is not None:
+            server.shutdown()
+            server.server_close()
+
+if __name__ == "__main__":
+    main()
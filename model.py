@@ -1,165 +1,1768 @@
+import argparse
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import threading
+import time
+import warnings
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+import pickle
+import joblib
 import pandas as pd
 import numpy as np
-from sklearn.model_selection import train_test_split
-from sklearn.preprocessing import LabelEncoder, StandardScaler
-from sklearn.impute import SimpleImputer
-from sklearn.metrics import accuracy_score, classification_report
-from sklearn.linear_model import LogisticRegression
-from sklearn.ensemble import RandomForestClassifier
-from xgboost import XGBClassifier
+# scikit-learn and XGBoost are imported where they are first used, so importing
+# this module (and the GUI) stays fast and unused estimators never load them
+from tree_compiler import CompiledForest, best_rounds
+import instrumentation
+from instrumentation import span, increment
 
-class DementiaPredictionModel:
+# Default location of the persisted model bundle
+BUNDLE_PATH = 'model_bundle.joblib'
+# Bump whenever the layout of the bundle changes so old files are retrained
+BUNDLE_FORMAT = 2
+# Thread-count parameters that do not change the fitted model and are left out of the bundle key
+RUNTIME_PARAMS = ('n_jobs', 'nthread')
+# Rows scored per chunk by predict_batch
+BATCH_CHUNK_SIZE = 10000
+# Default number of records kept by the opt-in prediction cache
+PREDICTION_CACHE_SIZE = 10000
+
+# Display name -> attribute holding the estimator
+ESTIMATOR_ATTRS = {
+    'Logistic Regression': 'lr_model',
+    'Random Forest': 'rf_model',
+    'XGBoost': 'xgb_model'
+}
+MODEL_NAMES = tuple(ESTIMATOR_ATTRS)
+# Short names accepted on the command line
+MODEL_ALIASES = {'lr': 'Logistic Regression', 'rf': 'Random Forest', 'xgb': 'XGBoost'}
+
+# Input features in the order the models expect them
+FEATURE_COLUMNS = [
+    'Diabetic', 'AlcoholLevel', 'HeartRate', 'BloodOxygenLevel', 
+    'BodyTemperature', 'Weight', 'MRI_Delay', 'Prescription', 
+    'Dosage in mg', 'Age', 'Dominant_Hand', 'Gender', 
+    'Family_History', 'Smoking_Status', 'APOE_ε4', 
+    'Physical_Activity', 'Depression_Status', 'Cognitive_Test_Scores', 
+    'Medication_History', 'Nutrition_Diet', 'Sleep_Quality', 
+    'Chronic_Health_Conditions'
+]
+
+CATEGORICAL_COLUMNS = [
+    'Prescription', 'Dominant_Hand', 'Gender', 'Family_History',
+    'Smoking_Status', 'APOE_ε4', 'Physical_Activity', 'Depression_Status',
+    'Medication_History', 'Nutrition_Diet', 'Sleep_Quality',
+    'Chronic_Health_Conditions'
+]
+
+TARGET_COLUMN = 'Dementia'
+
+# Accepted raw input per feature, in the order the GUI lays the fields out.
+# Numbers have an inclusive [min, max] range and may be restricted to whole
+# values; categories list their allowed values. Fields with required=False may
+# be left blank and are imputed like missing values in the training data.
+# label, unit, hint and section only describe the field to users.
+FEATURE_SCHEMA = {
+    'Age': {'type': 'number', 'min': 18, 'max': 120, 'unit': ' years', 'section': 'Patient Demographics'},
+    'Gender': {'type': 'category', 'values': ['Male', 'Female'], 'section': 'Patient Demographics'},
+    'Weight': {'type': 'number', 'min': 30, 'max': 200, 'unit': ' kg', 'section': 'Patient Demographics'},
+    'Dominant_Hand': {'type': 'category', 'values': ['Right', 'Left'], 'label': 'Dominant Hand', 'section': 'Patient Demographics'},
+    'Diabetic': {'type': 'number', 'min': 0, 'max': 1, 'integer': True, 'label': 'Diabetic Status', 'hint': '0 = No, 1 = Yes', 'section': 'Medical History'},
+    'Family_History': {'type': 'category', 'values': ['Yes', 'No'], 'label': 'Family History', 'section': 'Medical History'},
+    'Chronic_Health_Conditions': {'type': 'category', 'values': ['None', 'Heart Disease', 'Diabetes', 'Hypertension'], 'required': False, 'label': 'Condition', 'section': 'Medical History'},
+    'APOE_ε4': {'type': 'category', 'values': ['Positive', 'Negative'], 'label': 'APOE ε4 Status', 'section': 'Medical History'},
+    'HeartRate': {'type': 'number', 'min': 40, 'max': 200, 'unit': ' bpm', 'label': 'Heart Rate', 'section': 'Vital Signs'},
+    'BloodOxygenLevel': {'type': 'number', 'min': 80, 'max': 100, 'unit': '%', 'label': 'Blood Oxygen Level', 'section': 'Vital Signs'},
+    'BodyTemperature': {'type': 'number', 'min': 35, 'max': 40, 'unit': '°C', 'label': 'Body Temperature', 'section': 'Vital Signs'},
+    'AlcoholLevel': {'type': 'number', 'min': 0, 'max': 0.5, 'unit': ' BAC', 'label': 'Alcohol Level', 'section': 'Lifestyle Factors'},
+    'Smoking_Status': {'type': 'category', 'values': ['Never Smoked', 'Former Smoker', 'Current Smoker'], 'label': 'Smoking Status', 'section': 'Lifestyle Factors'},
+    'Physical_Activity': {'type': 'category', 'values': ['Sedentary', 'Mild Activity', 'Moderate Activity', 'High Activity'], 'label': 'Activity Level', 'section': 'Lifestyle Factors'},
+    'Sleep_Quality': {'type': 'category', 'values': ['Good', 'Fair', 'Poor'], 'label': 'Sleep Quality', 'section': 'Lifestyle Factors'},
+    'Nutrition_Diet': {'type': 'category', 'values': ['Balanced Diet', 'Low-Carb Diet', 'Mediterranean Diet', 'Other'], 'label': 'Diet', 'section': 'Lifestyle Factors'},
+    'Cognitive_Test_Scores': {'type': 'number', 'min': 0, 'max': 10, 'integer': True, 'label': 'Cognitive Score', 'section': 'Clinical Assessment'},
+    'Depression_Status': {'type': 'category', 'values': ['Yes', 'No'], 'label': 'Depression Status', 'section': 'Clinical Assessment'},
+    'MRI_Delay': {'type': 'number', 'min': 0, 'max': 60, 'unit': ' minutes', 'label': 'MRI Delay', 'section': 'Clinical Assessment'},
+    'Prescription': {'type': 'category', 'values': ['Galantamine', 'Memantine', 'Rivastigmine', 'Donepezil', 'None'], 'required': False, 'section': 'Medication'},
+    'Dosage in mg': {'type': 'number', 'min': 0, 'max': 100, 'unit': ' mg', 'required': False, 'label': 'Dosage', 'section': 'Medication'},
+    'Medication_History': {'type': 'category', 'values': ['Yes', 'No'], 'label': 'Medication History', 'section': 'Medication'}
+}
+# Encoder classes that stand for cleaned-up values rather than raw input
+_PLACEHOLDER_CATEGORIES = {'Unknown', 'No_Condition'}
+
+# Continuous measurements are loaded as float32; other numerical columns are
+# downcast to the smallest integer type that holds them
+FLOAT32_COLUMNS = [
+    'AlcoholLevel', 'BloodOxygenLevel', 'BodyTemperature', 'Weight',
+    'MRI_Delay', 'Dosage in mg'
+]
+# Parsed datasets are cached here, keyed by the source file's hash
+DATASET_CACHE_DIR = '.dataset_cache'
+# Preprocessed feature matrices are cached here as memory-mappable arrays
+FEATURE_CACHE_DIR = '.feature_cache'
+# Bump whenever preprocess_data changes its output so cached matrices are rebuilt
+FEATURE_CACHE_FORMAT = 1
+
+# Hyperparameters chosen by tune(), applied by load_or_train
+TUNED_PARAMS_PATH = 'tuned_params.json'
+# Candidates sampled per estimator by tune(); successive halving drops the weak ones early
+TUNING_CANDIDATES = 24
+# XGBoost candidates boost up to this many rounds, stopping early on the validation fold
+TUNING_MAX_ROUNDS = 1000
+TUNING_EARLY_STOPPING_ROUNDS = 20
+TUNING_SPACES = {
+    'Logistic Regression': {
+        'C': [0.001, 0.01, 0.1, 1.0, 10.0, 100.0],
+        'class_weight': [None, 'balanced']
+    },
+    'Random Forest': {
+        'n_estimators': [50, 100, 200, 400],
+        'max_depth': [None, 8, 16, 32],
+        'min_samples_leaf': [1, 2, 4],
+        'max_features': ['sqrt', 'log2', None]
+    },
+    'XGBoost': {
+        'max_depth': [3, 4, 6, 8],
+        'learning_rate': [0.03, 0.1, 0.3],
+        'subsample': [0.7, 0.85, 1.0],
+        'colsample_bytree': [0.7, 0.85, 1.0],
+        'min_child_weight': [1, 3, 5]
+    }
+}
+
+# Cleanup applied to categorical columns before encoding
+CATEGORY_REPLACEMENTS = {'None': 'No_Condition', 'none': 'No_Condition', np.nan: 'Unknown'}
+
+# Streaming training: rows per chunk, passes of the linear model over the
+# data, and every Nth row held out for evaluation
+STREAM_CHUNK_SIZE = 100000
+STREAM_EPOCHS = 5
+STREAM_HOLDOUT_EVERY = 5
+
+# Incremental updates: trees and boosting rounds added per update, solver
+# iterations of the warm-started Logistic Regression, and every Nth new record
+# held out to score the new version
+UPDATE_RF_TREES = 10
+UPDATE_XGB_ROUNDS = 10
+UPDATE_LR_MAX_ITER = 20
+UPDATE_HOLDOUT_EVERY = STREAM_HOLDOUT_EVERY
+
+# Training rows used to check the compiled preprocessor against preprocess_data
+COMPILE_CHECK_ROWS = 50
+
+# Cascade mode: the cheap model scores every record, and the rest only run
+# when its dementia probability falls inside the uncertainty band
+CASCADE_FIRST_MODEL = 'Logistic Regression'
+CASCADE_BAND = (0.1, 0.9)
+
+# What each model's explanation adds up to: Logistic Regression and XGBoost
+# explain their log-odds, the Random Forest its averaged class probability
+EXPLANATION_UNITS = {
+    'Logistic Regression': 'log-odds',
+    'Random Forest': 'probability',
+    'XGBoost': 'log-odds'
+}
+
+# Held-out rows the compiled forests are checked on, and the largest absolute
+# probability difference from the library predict_proba they may show
+TREE_CHECK_ROWS = 1000
+TREE_COMPILE_TOLERANCE = 1e-5
+# The compiled forests beat the libraries' per-call overhead up to about this
+# many rows; larger batches go through the library's native evaluator
+COMPILED_TREES_MAX_ROWS = 512
+
+class CompiledPreprocessor:
+    """Raw feature values to a scaled feature vector without building a DataFrame.
+    
+    Mirrors DementiaPredictionModel.preprocess_data(is_training=False) using a
+    category-to-code lookup per categorical column and the imputer fill values,
+    scaler mean and scaler scale folded into flat NumPy vectors.
+    """
+    def __init__(self, label_encoders, imputer, scaler):
+        self.lookups = [None] * len(FEATURE_COLUMNS)
+        self.unknown_codes = [None] * len(FEATURE_COLUMNS)
+        for i, col in enumerate(FEATURE_COLUMNS):
+            if col in CATEGORICAL_COLUMNS:
+                lookup = {str(category): float(code) for code, category in enumerate(label_encoders[col].classes_)}
+                self.lookups[i] = lookup
+                self.unknown_codes[i] = lookup['Unknown']
+        self.fill_values = np.asarray(imputer.statistics_, dtype=float)
+        self.mean = np.asarray(scaler.mean_, dtype=float)
+        self.scale = np.asarray(scaler.scale_, dtype=float)
+
+    def transform_row(self, values):
+        """Return a (1, 22) scaled feature matrix for one row of raw values."""
+        if len(values) != len(FEATURE_COLUMNS):
+            raise ValueError(f"Expected {len(FEATURE_COLUMNS)} values, got {len(values)}")
+        row = np.empty(len(FEATURE_COLUMNS))
+        for i, value in enumerate(values):
+            lookup = self.lookups[i]
+            if lookup is None:
+                row[i] = _to_float(value)
+            else:
+                row[i] = lookup.get(_normalize_category(value), self.unknown_codes[i])
+        
+        # Impute, then scale exactly as StandardScaler.transform does
+        missing = np.isnan(row)
+        row[missing] = self.fill_values[missing]
+        row -= self.mean
+        row /= self.scale
+        return row.reshape(1, -1)
+
+    def transform(self, data):
+        """Return an (n, 22) scaled feature matrix for a DataFrame of raw values.
+
+        Categories are looked up once per distinct value, so the cost is a few
+        NumPy passes per column rather than preprocess_data's DataFrame copies.
+        """
+        X = np.empty((len(data), len(FEATURE_COLUMNS)))
+        for i, col in enumerate(FEATURE_COLUMNS):
+            lookup = self.lookups[i]
+            if lookup is None:
+                X[:, i] = pd.to_numeric(data[col], errors='coerce').to_numpy(dtype=float, na_value=np.nan)
+                continue
+            # Missing values factorize to -1, which picks the trailing 'Unknown' code
+            codes, uniques = pd.factorize(data[col])
+            mapped = [lookup.get(_normalize_category(value), self.unknown_codes[i]) for value in uniques]
+            X[:, i] = np.array(mapped + [self.unknown_codes[i]])[codes]
+
+        missing = np.isnan(X)
+        if missing.any():
+            X[missing] = self.fill_values[np.nonzero(missing)[1]]
+        X -= self.mean
+        X /= self.scale
+        return X
+
+class PredictionCache:
+    """Thread-safe, size-bounded LRU cache of per-record predictions with hit/miss counters."""
+    def __init__(self, maxsize=PREDICTION_CACHE_SIZE):
+        self.maxsize = maxsize
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key):
+        with self.lock:
+            value = self.entries.get(key)
+            if value is None:
+                self.misses += 1
+                return None
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key, value):
+        with self.lock:
+            self.entries[key] = value
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.maxsize:
+                self.entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+
+    def stats(self):
+        """Return hit, miss and eviction counters plus current occupancy."""
+        with self.lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'size': len(self.entries),
+                'maxsize': self.maxsize,
+                'hit_rate': self.hits / lookups if lookups else 0.0
+            }
+
+class CascadeStats:
+    """Thread-safe counters of records scored and escalated in cascade mode."""
     def __init__(self):
+        self.lock = threading.Lock()
+        self.records = 0
+        self.escalated = 0
+        self.first_seconds = 0.0  # Time spent in the first model
+        self.escalated_seconds = 0.0  # Time spent in the models run on escalated records
+
+    def record(self, records, escalated, first_seconds, escalated_seconds):
+        with self.lock:
+            self.records += records
+            self.escalated += escalated
+            self.first_seconds += first_seconds
+            self.escalated_seconds += escalated_seconds
+
+    def stats(self):
+        """Return escalation counts and an estimate of the model time the cascade saved.
+        
+        The saving extrapolates the average per-record cost of the escalated
+        models to the records that skipped them.
+        """
+        with self.lock:
+            per_record = self.escalated_seconds / self.escalated if self.escalated else None
+            return {
+                'records': self.records,
+                'escalated': self.escalated,
+                'escalated_fraction': self.escalated / self.records if self.records else 0.0,
+                'first_model_s': self.first_seconds,
+                'escalated_models_s': self.escalated_seconds,
+                'estimated_saved_s': per_record * (self.records - self.escalated) if per_record is not None else None
+            }
+
+def parse_band(text):
+    """Parse a LOW,HIGH cascade band for enable_cascade(); the argparse type of --cascade."""
+    try:
+        low, high = (float(value) for value in text.split(','))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected LOW,HIGH, got {text!r}")
+    if not 0 <= low <= high <= 1:
+        raise argparse.ArgumentTypeError(f"expected 0 <= LOW <= HIGH <= 1, got {text!r}")
+    return low, high
+
+def _normalize_record(values, known_categories):
+    """Canonical hashable form of 22 raw values, equal for inputs the models cannot tell apart.
+    
+    known_categories holds the encoded categories of each categorical column
+    and None for the numerical ones. Blank, missing and unseen categories all
+    encode as 'Unknown', so they share that key.
+    """
+    normalized = []
+    for known, value in zip(known_categories, values):
+        if known is not None:
+            category = _normalize_category(value)
+            normalized.append(category if category in known else 'Unknown')
+        else:
+            number = _to_float(value)
+            # NaN never compares equal, so missing numbers key as None
+            normalized.append(None if number != number else number)
+    return tuple(normalized)
+
+def validate_records(data, extra_categories=None, check_categories=True):
+    """Check raw feature records against FEATURE_SCHEMA a column at a time.
+    
+    data is a DataFrame holding the feature columns. extra_categories maps a
+    categorical column to further accepted values, such as categories the
+    encoders learned through update(). Each rule is evaluated as a mask over
+    the whole column, and messages are only built for the rows that fail.
+    Returns a boolean array marking the valid rows and a dict from the
+    position of each invalid row to its error messages.
+    """
+    valid = np.ones(len(data), dtype=bool)
+    failures = []  # (field, rows, values, message template)
+    for field, spec in FEATURE_SCHEMA.items():
+        column = data[field]
+        # Work on plain arrays: per-column pandas operations dominate on micro-batches
+        if pd.api.types.is_numeric_dtype(column.dtype) and not isinstance(column.dtype, pd.CategoricalDtype):
+            raw = numbers = column.to_numpy(dtype=float, na_value=np.nan)
+            missing = np.isnan(numbers)
+        else:
+            raw = column.to_numpy(dtype=object)
+            missing = pd.isna(raw) | (raw == '')
+            numbers = None
+        if spec.get('required', True):
+            failures.append((field, missing, raw, "{field} is required"))
+        present = ~missing
+        if spec['type'] == 'number':
+            if numbers is None:
+                numbers = pd.to_numeric(raw, errors='coerce').astype(float)
+            not_number = present & np.isnan(numbers)
+            failures.append((field, not_number, raw, "{field}: {value!r} is not a number"))
+            checked = present & ~not_number
+            failures.append((field, checked & ((numbers < spec['min']) | (numbers > spec['max'])), numbers,
+                             f"{{field}}: {{value:g}} is outside {spec['min']:g}–{spec['max']:g}"))
+            if spec.get('integer'):
+                failures.append((field, checked & (numbers != np.floor(numbers)), numbers,
+                                 "{field}: {value:g} is not a whole number"))
+        elif check_categories:
+            # Test each distinct value once, then map the verdicts back to the rows
+            allowed = set(spec['values']).union((extra_categories or {}).get(field, ()))
+            codes, uniques = pd.factorize(raw)
+            known = np.array([value in allowed for value in uniques] + [True])
+            failures.append((field, present & ~known[codes], raw, f"{{field}}: {{value!r}} is not one of {', '.join(spec['values'])}"))
+    
+    errors = {}
+    for field, mask, values, template in failures:
+        if not mask.any():
+            continue
+        for row in np.flatnonzero(mask):
+            errors.setdefault(int(row), []).append(template.format(field=field, value=values[row]))
+            valid[row] = False
+    return valid, dict(sorted(errors.items()))
+
+def record_errors(values, extra_categories=None):
+    """Scalar equivalent of validate_records for one record of raw values; returns its error messages."""
+    if len(values) != len(FEATURE_COLUMNS):
+        return [f"Expected {len(FEATURE_COLUMNS)} values, got {len(values)}"]
+    errors = []
+    for field, value in zip(FEATURE_COLUMNS, values):
+        spec = FEATURE_SCHEMA[field]
+        if value is None or value != value or value == '':
+            if spec.get('required', True):
+                errors.append(f"{field} is required")
+            continue
+        if spec['type'] == 'number':
+            number = _to_float(value)
+            if number != number:
+                errors.append(f"{field}: {value!r} is not a number")
+                continue
+            if not spec['min'] <= number <= spec['max']:
+                errors.append(f"{field}: {number:g} is outside {spec['min']:g}–{spec['max']:g}")
+            if spec.get('integer') and number != np.floor(number):
+                errors.append(f"{field}: {number:g} is not a whole number")
+        elif value not in spec['values'] and value not in (extra_categories or {}).get(field, ()):
+            errors.append(f"{field}: {value!r} is not one of {', '.join(spec['values'])}")
+    return errors
+
+def _to_float(value):
+    """Scalar equivalent of pd.to_numeric(errors='coerce')."""
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return np.nan
+
+def _normalize_category(value):
+    """Scalar equivalent of the categorical cleanup in preprocess_data."""
+    if value is None or value != value:
+        return 'Unknown'
+    if value in ('None', 'none'):
+        return 'No_Condition'
+    return str(value)
+
+def resolve_model_names(models=None):
+    """Turn display names or short aliases (a list or comma-separated string) into display names in canonical order."""
+    if models is None:
+        return MODEL_NAMES
+    if isinstance(models, str):
+        models = [name.strip() for name in models.split(',') if name.strip()]
+    names = set()
+    for name in models:
+        name = MODEL_ALIASES.get(name.lower(), name)
+        if name not in ESTIMATOR_ATTRS:
+            raise ValueError(f"Unknown model: {name}")
+        names.add(name)
+    if not names:
+        raise ValueError("At least one model is required")
+    return tuple(name for name in MODEL_NAMES if name in names)
+
+def _new_estimator(name):
+    """Build an unfitted estimator, importing its library on first use."""
+    if name == 'Logistic Regression':
+        from sklearn.linear_model import LogisticRegression
+        return LogisticRegression(max_iter=1000)
+    if name == 'Random Forest':
+        from sklearn.ensemble import RandomForestClassifier
+        return RandomForestClassifier(n_estimators=100, random_state=42)
+    from xgboost import XGBClassifier
+    return XGBClassifier(use_label_encoder=False, eval_metric='mlogloss')
+
+class DementiaPredictionModel:
+    def __init__(self, models=None):
+        from sklearn.impute import SimpleImputer
+        from sklearn.preprocessing import StandardScaler
+        
         self.label_encoders = {}
         self.imputer = SimpleImputer(strategy='constant', fill_value=0)
         self.scaler = StandardScaler()
-        self.lr_model = LogisticRegression(max_iter=1000)
-        self.rf_model = RandomForestClassifier(n_estimators=100, random_state=42)
-        self.xgb_model = XGBClassifier(use_label_encoder=False, eval_metric='mlogloss')
+        # Only the selected estimators are built; the others stay None and
+        # their libraries are never imported
+        self.model_names = resolve_model_names(models)
+        for name, attr in ESTIMATOR_ATTRS.items():
+            setattr(self, attr, _new_estimator(name) if name in self.model_names else None)
         self.category_mappings = {}
         self.accuracies = {}  # Store model accuracies
+        self.fit_times = {}  # Wall time of each estimator's fit in seconds
+        self.search_times = {}  # Wall time of each estimator's tune() search in seconds
+        self.version = None  # Bundle key of the fitted state
+        self.estimator_versions = {}  # Per-estimator keys, see estimator_keys()
+        self.base_versions = {}  # Keys of the full training run that update() versions descend from
+        self.update_history = []  # One entry per update(), oldest first
+        self.compiled_preprocessor = None  # Pandas-free single-row path, built at fit time
+        self.extra_categories = {}  # Learned categories outside FEATURE_SCHEMA, accepted by validation
+        self.known_categories = None  # Encoded categories per feature column, keys the prediction cache
+        self.compiled_trees = {}  # Flat NumPy versions of the forests, see compile_trees()
+        self.tree_check_rows = None  # Held-out preprocessed rows the compiled forests are checked on
+        self.prediction_cache = None  # Opt-in LRU cache, see enable_prediction_cache()
+        self.cascade_band = None  # (low, high) when cascade mode is on, see enable_cascade()
+        self.cascade_stats = CascadeStats()
+    
+    # Fitted state shared by all estimators, written to / restored from the model bundle
+    _BUNDLE_ATTRS = (
+        'label_encoders', 'category_mappings', 'imputer', 'scaler',
+        'accuracies', 'fit_times', 'search_times', 'update_history', 'tree_check_rows'
+    )
         
     def preprocess_data(self, data, is_training=True):
         # Create a copy of the data to avoid modifying the original
         data = data.copy()
         
         # Define categorical and numerical columns
-        categorical_columns = [
-            'Prescription', 'Dominant_Hand', 'Gender', 'Family_History',
-            'Smoking_Status', 'APOE_ε4', 'Physical_Activity', 'Depression_Status',
-            'Medication_History', 'Nutrition_Diet', 'Sleep_Quality',
-            'Chronic_Health_Conditions'
-        ]
-        
+        categorical_columns = CATEGORICAL_COLUMNS
         numerical_columns = [col for col in data.columns if col not in categorical_columns]
         
         # Handle missing values and 'None' values in categorical columns
-        for col in categorical_columns:
-            data[col] = data[col].replace({'None': 'No_Condition', 'none': 'No_Condition', np.nan: 'Unknown'})
-        
-        # Handle missing values in numerical columns
-        data[numerical_columns] = data[numerical_columns].apply(pd.to_numeric, errors='coerce')
-        
-        # Encode categorical variables
-        if is_training:
-            # Store unique categories for each categorical column
-            for col in categorical_columns:
-                unique_categories = set(data[col].astype(str).unique())
-                unique_categories.add('Unknown')  # Add 'Unknown' category
-                self.category_mappings[col] = list(unique_categories)
-                
-                self.label_encoders[col] = LabelEncoder()
-                self.label_encoders[col].fit(list(unique_categories))
-                data[col] = self.label_encoders[col].transform(data[col].astype(str))
-        else:
-            # Handle unseen categories in prediction data
+        with span('preprocess.cleanup'):
             for col in categorical_columns:
-                # Replace unseen categories with 'Unknown'
-                data[col] = data[col].astype(str)
-                mask = ~data[col].isin(self.category_mappings[col])
-                data.loc[mask, col] = 'Unknown'
-                data[col] = self.label_encoders[col].transform(data[col])
+                # Categorical dtypes only accept known categories, so clean up as plain objects
+                if isinstance(data[col].dtype, pd.CategoricalDtype):
+                    data[col] = data[col].astype(object)
+                data[col] = data[col].replace(CATEGORY_REPLACEMENTS)
+            
+            # Handle missing values in numerical columns
+            data[numerical_columns] = data[numerical_columns].apply(pd.to_numeric, errors='coerce')
         
-        # Convert all features to float
-        X = data.astype(float)
+        # Encode categorical variables
+        with span('preprocess.encode'):
+            if is_training:
+                from sklearn.preprocessing import LabelEncoder
+                # Store unique categories for each categorical column
+                for col in categorical_columns:
+                    unique_categories = set(data[col].astype(str).unique())
+                    unique_categories.add('Unknown')  # Add 'Unknown' category
+                    self.category_mappings[col] = list(unique_categories)
+                    
+                    self.label_encoders[col] = LabelEncoder()
+                    self.label_encoders[col].fit(list(unique_categories))
+                    data[col] = self.label_encoders[col].transform(data[col].astype(str))
+            else:
+                # Handle unseen categories in prediction data
+                for col in categorical_columns:
+                    # Replace unseen categories with 'Unknown'
+                    data[col] = data[col].astype(str)
+                    mask = ~data[col].isin(self.category_mappings[col])
+                    data.loc[mask, col] = 'Unknown'
+                    data[col] = self.label_encoders[col].transform(data[col])
+            
+            # Convert all features to float
+            X = data.astype(float)
         
         # Impute missing values
-        if is_training:
-            X = self.imputer.fit_transform(X)
-        else:
-            X = self.imputer.transform(X)
+        with span('preprocess.impute'):
+            if is_training:
+                X = self.imputer.fit_transform(X)
+            else:
+                X = self.imputer.transform(X)
             
         # Scale features
-        if is_training:
-            X = self.scaler.fit_transform(X)
-        else:
-            X = self.scaler.transform(X)
+        with span('preprocess.scale'):
+            if is_training:
+                X = self.scaler.fit_transform(X)
+            else:
+                X = self.scaler.transform(X)
             
         return X
 
-    def train(self, data_path):
+    def compile_preprocessor(self, raw_rows=None, expected=None):
+        """Build the pandas-free single-row path from the fitted preprocessing state.
+        
+        When sample rows and their pandas-path output are given, the compiled path
+        is checked against them and left disabled if the two disagree.
+        """
+        # The encoders are final here, so refresh the categories validation accepts beyond the schema
+        self.known_categories = [
+            frozenset(self.category_mappings[col]) if col in CATEGORICAL_COLUMNS else None
+            for col in FEATURE_COLUMNS
+        ]
+        self.extra_categories = {}
+        for col in CATEGORICAL_COLUMNS:
+            extra = set(self.category_mappings[col]) - set(FEATURE_SCHEMA[col]['values']) - _PLACEHOLDER_CATEGORIES
+            if extra:
+                self.extra_categories[col] = extra
+        compiled = CompiledPreprocessor(self.label_encoders, self.imputer, self.scaler)
+        if raw_rows is not None:
+            actual = np.vstack([
+                compiled.transform_row(row) for row in raw_rows[FEATURE_COLUMNS].itertuples(index=False)
+            ])
+            if not np.allclose(actual, expected, rtol=0, atol=1e-12, equal_nan=True):
+                print("Compiled preprocessor disagrees with preprocess_data, using the pandas path")
+                self.compiled_preprocessor = None
+                return
+        self.compiled_preprocessor = compiled
+
+    def compile_trees(self, X_check):
+        """Flatten the Random Forest and XGBoost models into NumPy tree evaluators.
+        
+        Each compiled forest is compared with its estimator's predict_proba on
+        the preprocessed rows X_check and dropped if they disagree. The rows are
+        kept in the bundle so a loaded model is checked the same way.
+        """
+        self.compiled_trees = {}
+        self.tree_check_rows = np.array(X_check, dtype=float)
+        compilers = {
+            'Random Forest': (self.rf_model, CompiledForest.from_sklearn),
+            'XGBoost': (self.xgb_model, CompiledForest.from_xgboost)
+        }
+        for name, (estimator, compile_forest) in compilers.items():
+            if estimator is None:
+                continue
+            try:
+                compiled = compile_forest(estimator)
+                error = np.abs(compiled.predict_proba(self.tree_check_rows) - estimator.predict_proba(self.tree_check_rows)).max()
+                if error > TREE_COMPILE_TOLERANCE:
+                    print(f"Compiled {name} differs by {error:.2e}, using the library evaluator")
+                    continue
+            except Exception as e:
+                print(f"Could not compile {name}: {str(e)}")
+                continue
+            self.compiled_trees[name] = compiled
+
+    def scorers(self, n_rows=1):
+        """Return the estimators keyed by display name, with compiled forests for small batches."""
+        scorers = self.estimators()
+        if n_rows <= COMPILED_TREES_MAX_ROWS:
+            scorers.update(self.compiled_trees)
+        return scorers
+
+    def estimators(self):
+        """Return the selected estimators keyed by display name."""
+        return {name: getattr(self, ESTIMATOR_ATTRS[name]) for name in self.model_names}
+
+    def get_params(self):
+        """Return the hyperparameters of the selected estimators."""
+        return {
+            name: {k: v for k, v in model.get_params().items() if k not in RUNTIME_PARAMS}
+            for name, model in self.estimators().items()
+        }
+
+    def estimator_keys(self, data_path, streaming=False):
+        """Per-estimator hash of the training CSV contents plus that estimator's hyperparameters.
+        
+        Keying each estimator separately lets a model built with a subset of
+        estimators reuse a bundle trained with all of them. Streamed training
+        (see train_streaming) gets its own keys.
+        """
+        data_hash = file_sha256(data_path)
+        keys = {}
+        for name, params in self.get_params().items():
+            digest = hashlib.sha256()
+            digest.update(data_hash.encode('utf-8'))
+            digest.update(name.encode('utf-8'))
+            digest.update(json.dumps(params, sort_keys=True, default=str).encode('utf-8'))
+            digest.update(str(BUNDLE_FORMAT).encode('utf-8'))
+            if streaming:
+                digest.update(b'stream')
+            keys[name] = digest.hexdigest()
+        return keys
+
+    def bundle_key(self, data_path):
+        """Hash of the training CSV contents plus the estimator hyperparameters."""
+        return _combine_keys(self.estimator_keys(data_path))
+
+    def _fit_concurrently(self, X_train, y_train, n_jobs=None):
+        """Fit the selected estimators in parallel, splitting a core budget between them."""
+        budget = _core_budget(n_jobs)
+        # Logistic Regression fits on one core; the ensembles share the rest,
+        # with the odd core going to the slower Random Forest
+        ensemble_jobs = max(budget - 1, 1)
+        ensembles = [model for model in (self.rf_model, self.xgb_model) if model is not None]
+        for i, model in enumerate(ensembles):
+            model.set_params(n_jobs=max((ensemble_jobs + len(ensembles) - 1 - i) // len(ensembles), 1))
+        
+        def timed_fit(name, model):
+            start = time.perf_counter()
+            with span(f"fit.{name}"):
+                model.fit(X_train, y_train)
+            return time.perf_counter() - start
+        
+        with ThreadPoolExecutor(max_workers=min(budget, 3)) as executor:
+            futures = {
+                name: executor.submit(timed_fit, name, model)
+                for name, model in self.estimators().items()
+            }
+            self.fit_times = {name: future.result() for name, future in futures.items()}
+
+    def _feature_cache_key(self, data_path):
+        """Hash of the dataset plus everything that shapes preprocess_data's output."""
+        config = {
+            'format': FEATURE_CACHE_FORMAT,
+            'features': FEATURE_COLUMNS,
+            'categorical': CATEGORICAL_COLUMNS,
+            'replacements': {str(k): v for k, v in CATEGORY_REPLACEMENTS.items()},
+            'imputer': self.imputer.get_params(),
+            'scaler': self.scaler.get_params()
+        }
+        digest = hashlib.sha256()
+        digest.update(file_sha256(data_path).encode('utf-8'))
+        digest.update(json.dumps(config, sort_keys=True, default=str).encode('utf-8'))
+        return digest.hexdigest()
+
+    def prepare_features(self, data_path, cache_dir=FEATURE_CACHE_DIR, dataset_cache_dir=DATASET_CACHE_DIR):
+        """Fit the preprocessing state on data_path and return (X_processed, y).
+        
+        The matrix, targets and fitted preprocessing state are persisted under
+        cache_dir keyed by the dataset hash and preprocessing config. Later calls
+        restore the state and return read-only memory maps of the same files, so
+        retraining, evaluation runs and parallel workers share one copy of the
+        pages and skip preprocessing. Pass cache_dir=None to disable the cache,
+        and dataset_cache_dir=None to also parse the CSV afresh.
+        """
+        cache_path = None
+        if cache_dir is not None:
+            cache_path = os.path.join(cache_dir, self._feature_cache_key(data_path)[:32])
+            if os.path.exists(os.path.join(cache_path, 'state.joblib')):
+                state = joblib.load(os.path.join(cache_path, 'state.joblib'))
+                for attr in ('label_encoders', 'category_mappings', 'imputer', 'scaler'):
+                    setattr(self, attr, state[attr])
+                X_processed = np.load(os.path.join(cache_path, 'X.npy'), mmap_mode='r')
+                y = np.load(os.path.join(cache_path, 'y.npy'), mmap_mode='r')
+                self.compile_preprocessor(state['check_rows'], X_processed[:COMPILE_CHECK_ROWS])
+                return X_processed, y
+        
         # Load and preprocess training data
-        data = pd.read_csv(data_path, encoding='utf-8')
+        if dataset_cache_dir is None:
+            data = load_dataset(data_path, use_cache=False)
+        else:
+            data = load_dataset(data_path, dataset_cache_dir)
         
         # Separate features and target
-        X = data.drop('Dementia', axis=1)
-        y = data['Dementia']
+        X = data.drop(TARGET_COLUMN, axis=1)
+        y = data[TARGET_COLUMN].to_numpy()
         
         # Preprocess features
         X_processed = self.preprocess_data(X, is_training=True)
+        check_rows = X.head(COMPILE_CHECK_ROWS)
+        self.compile_preprocessor(check_rows, X_processed[:COMPILE_CHECK_ROWS])
+        
+        if cache_path is not None:
+            # Build in a scratch directory and rename it into place so readers never see partial files
+            os.makedirs(cache_dir, exist_ok=True)
+            tmp_path = tempfile.mkdtemp(dir=cache_dir)
+            np.save(os.path.join(tmp_path, 'X.npy'), X_processed)
+            np.save(os.path.join(tmp_path, 'y.npy'), y)
+            joblib.dump({
+                'label_encoders': self.label_encoders,
+                'category_mappings': self.category_mappings,
+                'imputer': self.imputer,
+                'scaler': self.scaler,
+                'check_rows': check_rows
+            }, os.path.join(tmp_path, 'state.joblib'))
+            try:
+                os.rename(tmp_path, cache_path)
+            except OSError:
+                # Another process cached the same features first
+                shutil.rmtree(tmp_path, ignore_errors=True)
+        return X_processed, y
+
+    def train(self, data_path, n_jobs=None, feature_cache_dir=FEATURE_CACHE_DIR, dataset_cache_dir=DATASET_CACHE_DIR):
+        from sklearn.metrics import accuracy_score, classification_report
+        from sklearn.model_selection import train_test_split
+        
+        # Key the fitted state by the data and hyperparameters it came from
+        self.estimator_versions = self.estimator_keys(data_path)
+        self.base_versions = dict(self.estimator_versions)
+        self.update_history = []
+        self.version = _combine_keys(self.estimator_versions)
+        self._invalidate_predictions()
+        self.compiled_trees = {}  # Rebuilt from the new forests once they are fitted
+        
+        # Load and preprocess training data, or map the cached matrix
+        X_processed, y = self.prepare_features(data_path, feature_cache_dir, dataset_cache_dir)
         
         # Split the data
         X_train, X_test, y_train, y_test = train_test_split(
             X_processed, y, test_size=0.2, random_state=42
         )
         
-        # Train models
-        self.lr_model.fit(X_train, y_train)
-        self.rf_model.fit(X_train, y_train)
-        self.xgb_model.fit(X_train, y_train)
+        # Train models concurrently
+        self._fit_concurrently(X_train, y_train, n_jobs=n_jobs)
         
-        # Evaluate and store accuracies
-        models = {
-            'Logistic Regression': self.lr_model,
-            'Random Forest': self.rf_model,
-            'XGBoost': self.xgb_model
-        }
+        self.compile_trees(X_test[:TREE_CHECK_ROWS])
         
-        for name, model in models.items():
+        # Evaluate and store accuracies
+        for name, model in self.estimators().items():
             predictions = model.predict(X_test)
             accuracy = accuracy_score(y_test, predictions)
             self.accuracies[name] = accuracy  # Store accuracy
             print(f"\n{name} Results:")
             print(f"Accuracy: {accuracy:.4f}")
+            print(f"Fit time: {self.fit_times[name]:.2f}s")
+            if name in self.search_times:
+                print(f"Search time: {self.search_times[name]:.2f}s")
             print("Classification Report:")
             print(classification_report(y_test, predictions))
     
+    def train_streaming(self, data_path, chunksize=STREAM_CHUNK_SIZE, epochs=STREAM_EPOCHS, n_jobs=None):
+        """Train out of core, holding at most one chunk of the CSV in memory.
+        
+        The first pass fits the encoders, imputer and scaler statistics. Later
+        passes train the linear model with partial_fit (an SGD logistic
+        regression), grow the Random Forest a few trees per chunk, and train
+        XGBoost from an external-memory iterator. Every STREAM_HOLDOUT_EVERY-th
+        row is held out and scored in a final pass. load_or_train(...,
+        streaming=True) reuses the saved result.
+        """
+        self.estimator_versions = self.estimator_keys(data_path, streaming=True)
+        self.base_versions = dict(self.estimator_versions)
+        self.update_history = []
+        self.version = _combine_keys(self.estimator_versions)
+        self._invalidate_predictions()
+        self.compiled_trees = {}  # Rebuilt from the new forests once they are fitted
+        classes, n_chunks = self._fit_streaming_preprocessing(data_path, chunksize)
+        
+        budget = _core_budget(n_jobs)
+        self.fit_times = {name: 0.0 for name in self.estimators()}
+        
+        # Linear model over several passes, forest trees on the first pass
+        passes = 0
+        if self.lr_model is not None:
+            from sklearn.linear_model import SGDClassifier
+            self.lr_model = SGDClassifier(loss='log_loss', random_state=42)
+            passes = epochs
+        if self.rf_model is not None:
+            n_trees = self.rf_model.n_estimators
+            self.rf_model.set_params(warm_start=True, n_jobs=budget)
+            passes = max(passes, 1)
+        for epoch in range(passes):
+            chunks = self._iter_stream_chunks(data_path, chunksize, holdout=False)
+            for chunk_index, (X, y) in enumerate(chunks):
+                if self.lr_model is not None:
+                    start = time.perf_counter()
+                    with span('fit.Logistic Regression'):
+                        self.lr_model.partial_fit(X, y, classes=classes)
+                    self.fit_times['Logistic Regression'] += time.perf_counter() - start
+                
+                if self.rf_model is None or epoch > 0:
+                    continue
+                # Spread the trees evenly over the chunks; a warm-started
+                # forest needs every class present in each fit
+                target_trees = max(n_trees * (chunk_index + 1) // n_chunks, 1)
+                grown = len(getattr(self.rf_model, 'estimators_', []))
+                if target_trees > grown and len(np.unique(y)) == len(classes):
+                    start = time.perf_counter()
+                    self.rf_model.set_params(n_estimators=target_trees)
+                    with span('fit.Random Forest'):
+                        self.rf_model.fit(X, y)
+                    self.fit_times['Random Forest'] += time.perf_counter() - start
+        if self.rf_model is not None:
+            self.rf_model.set_params(warm_start=False)
+        
+        # XGBoost pages the preprocessed chunks through an on-disk cache
+        if self.xgb_model is not None:
+            start = time.perf_counter()
+            with span('fit.XGBoost'):
+                self.xgb_model = self._train_xgb_external_memory(data_path, chunksize, budget)
+            self.fit_times['XGBoost'] = time.perf_counter() - start
+        
+        # Evaluate on the held-out rows
+        correct = {name: 0 for name in self.estimators()}
+        total = 0
+        check_rows = []
+        for X, y in self._iter_stream_chunks(data_path, chunksize, holdout=True):
+            if total < TREE_CHECK_ROWS:
+                check_rows.append(X[:TREE_CHECK_ROWS - total])
+            total += len(y)
+            for name, model in self.estimators().items():
+                correct[name] += int((model.predict(X) == y).sum())
+        self.accuracies = {name: count / total if total else 0.0 for name, count in correct.items()}
+        for name, accuracy in self.accuracies.items():
+            print(f"\n{name} (streamed) Results:")
+            print(f"Accuracy: {accuracy:.4f}")
+            print(f"Fit time: {self.fit_times[name]:.2f}s")
+        self.compile_preprocessor()
+        self.compile_trees(np.vstack(check_rows) if check_rows else np.empty((0, len(FEATURE_COLUMNS))))
+
+    def _fit_streaming_preprocessing(self, data_path, chunksize):
+        """First pass: fit encoders and scaler statistics; return target classes and chunk count."""
+        from sklearn.preprocessing import LabelEncoder, StandardScaler
+        
+        numerical_columns = [col for col in FEATURE_COLUMNS if col not in CATEGORICAL_COLUMNS]
+        category_counts = {col: {} for col in CATEGORICAL_COLUMNS}
+        numeric_scaler = StandardScaler()
+        classes = set()
+        n_rows = 0
+        n_chunks = 0
+        for chunk in pd.read_csv(data_path, encoding='utf-8', chunksize=chunksize):
+            n_rows += len(chunk)
+            n_chunks += 1
+            classes.update(chunk[TARGET_COLUMN].unique())
+            for col in CATEGORICAL_COLUMNS:
+                counts = chunk[col].replace(CATEGORY_REPLACEMENTS).astype(str).value_counts()
+                for category, count in counts.items():
+                    category_counts[col][category] = category_counts[col].get(category, 0) + int(count)
+            # Numerical columns are imputed before scaling, so fold the fill value in here
+            numeric = chunk[numerical_columns].apply(pd.to_numeric, errors='coerce')
+            numeric_scaler.partial_fit(numeric.fillna(self.imputer.fill_value).to_numpy(dtype=float))
+        
+        for col, counts in category_counts.items():
+            unique_categories = set(counts)
+            unique_categories.add('Unknown')  # Add 'Unknown' category
+            self.category_mappings[col] = list(unique_categories)
+            self.label_encoders[col] = LabelEncoder()
+            self.label_encoders[col].fit(list(unique_categories))
+        
+        # The constant strategy's fill values do not depend on the data
+        self.imputer.fit(pd.DataFrame(np.zeros((1, len(FEATURE_COLUMNS))), columns=FEATURE_COLUMNS))
+        
+        # Scaler moments: numerical columns from the incremental scaler, encoded
+        # categorical columns from the category counts
+        mean = np.empty(len(FEATURE_COLUMNS))
+        var = np.empty(len(FEATURE_COLUMNS))
+        for i, col in enumerate(FEATURE_COLUMNS):
+            if col in CATEGORICAL_COLUMNS:
+                counts = category_counts[col]
+                codes = self.label_encoders[col].transform(list(counts)).astype(float)
+                weights = np.array(list(counts.values()), dtype=float)
+                mean[i] = np.average(codes, weights=weights)
+                var[i] = np.average((codes - mean[i]) ** 2, weights=weights)
+            else:
+                j = numerical_columns.index(col)
+                mean[i] = numeric_scaler.mean_[j]
+                var[i] = numeric_scaler.var_[j]
+        self.scaler = _scaler_from_moments(mean, var, n_rows)
+        return np.array(sorted(classes)), n_chunks
+
+    def _iter_stream_chunks(self, data_path, chunksize, holdout):
+        """Yield preprocessed (X, y) for either the training or the held-out rows of each chunk."""
+        for chunk in pd.read_csv(data_path, encoding='utf-8', chunksize=chunksize):
+            is_holdout = np.asarray(chunk.index % STREAM_HOLDOUT_EVERY == 0)
+            chunk = chunk[is_holdout if holdout else ~is_holdout]
+            if chunk.empty:
+                continue
+            X = self.preprocess_data(chunk[FEATURE_COLUMNS], is_training=False)
+            yield X, chunk[TARGET_COLUMN].to_numpy()
+
+    def _train_xgb_external_memory(self, data_path, chunksize, n_jobs):
+        """Train XGBoost from an iterator over the training chunks and wrap it as an XGBClassifier."""
+        import xgboost
+        from xgboost import XGBClassifier
+        
+        cache_dir = tempfile.mkdtemp(prefix='xgb_cache_')
+        try:
+            data_iter = _streaming_data_iter(self, data_path, chunksize, os.path.join(cache_dir, 'cache'))
+            if hasattr(xgboost, 'ExtMemQuantileDMatrix'):
+                dtrain = xgboost.ExtMemQuantileDMatrix(data_iter, nthread=n_jobs)
+            else:
+                dtrain = xgboost.DMatrix(data_iter, nthread=n_jobs)
+            params = self.xgb_model.get_xgb_params()
+            params.update(objective='binary:logistic', nthread=n_jobs)
+            num_rounds = self.xgb_model.n_estimators or 100
+            booster = xgboost.train(params, dtrain, num_boost_round=num_rounds)
+            # Release the cache pages before their directory is removed
+            del dtrain, data_iter
+        finally:
+            shutil.rmtree(cache_dir, ignore_errors=True)
+        
+        xgb_model = XGBClassifier(**self.xgb_model.get_params())
+        xgb_model.load_model(bytearray(booster.save_raw('ubj')))
+        return xgb_model
+
+    def update(self, new_records):
+        """Extend the fitted models with newly labelled records instead of retraining.
+        
+        new_records is a DataFrame or CSV path with the feature columns and the
+        Dementia label. Only the new records are read, so the cost grows with
+        their number rather than with the full dataset:
+        - XGBoost boosts UPDATE_XGB_ROUNDS more rounds on top of its booster
+        - the Random Forest grows UPDATE_RF_TREES more trees on the new records
+        - Logistic Regression runs UPDATE_LR_MAX_ITER solver iterations starting
+          from its current coefficients (the streamed SGD model takes a
+          partial_fit step instead)
+        Categories the encoders have not seen get codes after the existing ones,
+        so earlier codes keep their meaning; the imputer and scaler are kept.
+        Every UPDATE_HOLDOUT_EVERY-th record is held out and scored with the
+        previous and the updated models. Records that fail validation or whose
+        label is missing or not one of the models' classes are skipped. The result is appended to update_history as a new version,
+        which is also returned.
+        """
+        if self.version is None:
+            raise ValueError("Model has not been trained")
+        if isinstance(new_records, (str, os.PathLike)):
+            data = pd.read_csv(new_records, encoding='utf-8')
+        else:
+            data = new_records.reset_index(drop=True)
+        # Records with missing or out-of-range values are left out; new categories are what the update learns
+        valid, errors = validate_records(data, check_categories=False)
+        # So are records without a label the models know
+        classes = next(iter(self.estimators().values())).classes_
+        labels = pd.to_numeric(data[TARGET_COLUMN], errors='coerce').to_numpy(dtype=float)
+        for row in np.flatnonzero(~np.isin(labels, classes)):
+            value = data[TARGET_COLUMN].iloc[row]
+            if pd.isna(value) or value == '':
+                message = f"{TARGET_COLUMN} is required"
+            else:
+                message = f"{TARGET_COLUMN}: {value!r} is not one of {', '.join(str(c) for c in classes)}"
+            errors.setdefault(int(row), []).append(message)
+            valid[row] = False
+        errors = dict(sorted(errors.items()))
+        for row, messages in list(errors.items())[:5]:
+            print(f"Skipping record {row}: {'; '.join(messages)}")
+        if errors:
+            print(f"Skipped {len(errors)} invalid record(s)")
+            data = data[valid].reset_index(drop=True)
+        features = data[FEATURE_COLUMNS]
+        y = labels[valid].astype(classes.dtype)
+        holdout = np.arange(len(data)) % UPDATE_HOLDOUT_EVERY == 0
+        
+        # The classifiers are refitted on the new records alone, which must show every class
+        if not np.isin(classes, y[~holdout]).all():
+            raise ValueError(f"New records must include every {TARGET_COLUMN} class {list(classes)} outside the held-out rows")
+        
+        # Score the held-out records with the current version before anything changes
+        previous_accuracies = {}
+        if holdout.any():
+            X_holdout = self.preprocess_data(features[holdout], is_training=False)
+            previous_accuracies = {
+                name: float((model.predict(X_holdout) == y[holdout]).mean())
+                for name, model in self.estimators().items()
+            }
+        
+        with span('update.encode'):
+            new_categories = self._extend_categories(features)
+            X_processed = self.preprocess_data(features, is_training=False)
+        X_train, y_train = X_processed[~holdout], y[~holdout]
+        
+        update_times = {}
+        for name, model in self.estimators().items():
+            start = time.perf_counter()
+            with span(f"update.{name}"):
+                self._update_estimator(name, model, X_train, y_train)
+            update_times[name] = time.perf_counter() - start
+        
+        # New version: each estimator's key chained with a hash of the records it learned from
+        records_hash = hashlib.sha256(pd.util.hash_pandas_object(data, index=False).to_numpy().tobytes()).hexdigest()
+        parent = self.version
+        self.estimator_versions = {
+            name: hashlib.sha256(f"{key}:{records_hash}".encode('utf-8')).hexdigest()
+            for name, key in self.estimator_versions.items()
+        }
+        self.version = _combine_keys(self.estimator_versions)
+        self._invalidate_predictions()
+        self.compile_preprocessor(features.head(COMPILE_CHECK_ROWS), X_processed[:COMPILE_CHECK_ROWS])
+        self.compile_trees(X_processed[:TREE_CHECK_ROWS])
+        
+        accuracies = {}
+        if holdout.any():
+            X_holdout = X_processed[holdout]
+            accuracies = {
+                name: float((model.predict(X_holdout) == y[holdout]).mean())
+                for name, model in self.estimators().items()
+            }
+            self.accuracies = dict(accuracies)
+        entry = {
+            'version': self.version,
+            'parent': parent,
+            'timestamp': time.time(),
+            'records': len(data),
+            'rejected_records': len(errors),
+            'holdout_records': int(holdout.sum()),
+            'new_categories': new_categories,
+            'accuracies': accuracies,
+            'previous_accuracies': previous_accuracies,
+            'update_times': update_times
+        }
+        self.update_history = self.update_history + [entry]
+        
+        for name in self.estimators():
+            print(f"\n{name} (updated) Results:")
+            if name in accuracies:
+                print(f"Held-out accuracy: {previous_accuracies[name]:.4f} -> {accuracies[name]:.4f}")
+            print(f"Update time: {update_times[name]:.2f}s")
+        return entry
+
+    def _extend_categories(self, features):
+        """Append categories the encoders have not seen; return the new ones per column."""
+        from sklearn.preprocessing import LabelEncoder
+        
+        # Fresh containers, so copies of this model sharing the old encoders are unaffected
+        self.label_encoders = dict(self.label_encoders)
+        self.category_mappings = dict(self.category_mappings)
+        added = {}
+        for col in CATEGORICAL_COLUMNS:
+            values = features[col]
+            if isinstance(values.dtype, pd.CategoricalDtype):
+                values = values.astype(object)
+            seen = set(self.category_mappings[col])
+            new = sorted(set(values.replace(CATEGORY_REPLACEMENTS).astype(str).unique()) - seen)
+            if not new:
+                continue
+            # String classes are looked up through a dict, so appending keeps existing codes valid
+            encoder = LabelEncoder()
+            encoder.classes_ = np.concatenate([self.label_encoders[col].classes_, np.array(new)])
+            self.label_encoders[col] = encoder
+            self.category_mappings[col] = self.category_mappings[col] + new
+            added[col] = new
+        return added
+
+    def _update_estimator(self, name, model, X, y):
+        """Continue fitting one estimator on new rows only."""
+        if name == 'XGBoost':
+            booster = model.get_booster()
+            model.set_params(n_estimators=UPDATE_XGB_ROUNDS)
+            model.fit(X, y, xgb_model=booster)
+            model.set_params(n_estimators=model.get_booster().num_boosted_rounds())
+        elif name == 'Random Forest':
+            model.set_params(warm_start=True, n_estimators=len(model.estimators_) + UPDATE_RF_TREES)
+            model.fit(X, y)
+            model.set_params(warm_start=False)
+        elif hasattr(model, 'partial_fit'):
+            # The SGD model left by train_streaming
+            model.partial_fit(X, y)
+        else:
+            from sklearn.exceptions import ConvergenceWarning
+            
+            max_iter = model.max_iter
+            model.set_params(warm_start=True, max_iter=UPDATE_LR_MAX_ITER)
+            with warnings.catch_warnings():
+                # A few iterations from the current solution are the point; they are not meant to converge
+                warnings.simplefilter('ignore', ConvergenceWarning)
+                model.fit(X, y)
+            model.set_params(warm_start=False, max_iter=max_iter)
+
+    def tune(self, data_path, n_candidates=TUNING_CANDIDATES, n_jobs=None, params_path=TUNED_PARAMS_PATH):
+        """Search each estimator's hyperparameters and write the winners back into the model.
+        
+        Candidates are scored with successive halving (HalvingRandomSearchCV), so
+        poor configurations only ever see a fraction of the data, and run in
+        parallel across n_jobs cores. XGBoost candidates stop boosting early on a
+        validation fold. The features are preprocessed once and every candidate
+        reads the same (memory-mapped) folds. Only the training part of train()'s
+        split is searched. The winners are merged into params_path, which
+        load_or_train applies, so the next training run uses them. Estimators
+        that were not tuned keep their saved entries, and those whose current
+        configuration won have it saved.
+        """
+        from sklearn.base import clone
+        from sklearn.experimental import enable_halving_search_cv  # noqa: F401
+        from sklearn.model_selection import HalvingRandomSearchCV, StratifiedKFold, cross_val_score, train_test_split
+        
+        X_processed, y = self.prepare_features(data_path)
+        X_train, _, y_train, _ = train_test_split(X_processed, y, test_size=0.2, random_state=42)
+        X_search, X_val, y_search, y_val = train_test_split(X_train, y_train, test_size=0.2, random_state=42)
+        cv = StratifiedKFold(n_splits=3, shuffle=True, random_state=42)
+        
+        base_estimators = {}
+        if self.lr_model is not None:
+            base_estimators['Logistic Regression'] = clone(self.lr_model)
+        if self.rf_model is not None:
+            base_estimators['Random Forest'] = clone(self.rf_model).set_params(n_jobs=1)
+        if self.xgb_model is not None:
+            # Binary log loss drives early stopping; mlogloss rejects binary labels on an eval set
+            base_estimators['XGBoost'] = clone(self.xgb_model).set_params(
+                n_estimators=TUNING_MAX_ROUNDS,
+                early_stopping_rounds=TUNING_EARLY_STOPPING_ROUNDS,
+                eval_metric='logloss',
+                n_jobs=1
+            )
+        best_params = {}
+        kept_params = {}
+        for name, estimator in base_estimators.items():
+            search = HalvingRandomSearchCV(
+                estimator, TUNING_SPACES[name], n_candidates=n_candidates, factor=3,
+                cv=cv, scoring='accuracy', random_state=42, n_jobs=_core_budget(n_jobs)
+            )
+            start = time.perf_counter()
+            if name == 'XGBoost':
+                X_fit, y_fit = X_search, y_search
+                search.fit(X_fit, y_fit, eval_set=[(X_val, y_val)], verbose=False)
+                # Keep the number of rounds early stopping settled on
+                candidate = dict(search.best_params_, n_estimators=search.best_estimator_.best_iteration + 1)
+            else:
+                X_fit, y_fit = X_train, y_train
+                search.fit(X_fit, y_fit)
+                candidate = dict(search.best_params_)
+            
+            # Only replace the current configuration if the winner beats it on the same folds
+            current = clone(self.estimators()[name]).set_params(n_jobs=1)
+            current_score = cross_val_score(current, X_fit, y_fit, cv=cv, scoring='accuracy').mean()
+            self.search_times[name] = time.perf_counter() - start
+            print(f"\n{name} tuning:")
+            print(f"Best CV accuracy: {search.best_score_:.4f} (current: {current_score:.4f})")
+            if search.best_score_ > current_score:
+                best_params[name] = candidate
+                print(f"Best parameters: {candidate}")
+            else:
+                current_params = self.estimators()[name].get_params()
+                tuned_keys = list(TUNING_SPACES[name]) + (['n_estimators'] if name == 'XGBoost' else [])
+                kept_params[name] = {key: current_params[key] for key in tuned_keys}
+                print("Keeping the current parameters")
+            print(f"Search time: {self.search_times[name]:.2f}s")
+        
+        self.set_params(best_params)
+        if params_path is not None:
+            saved = {}
+            if os.path.exists(params_path):
+                with open(params_path, encoding='utf-8') as f:
+                    saved = json.load(f)
+            saved.update(kept_params)
+            saved.update(best_params)
+            with open(params_path, 'w', encoding='utf-8') as f:
+                json.dump(saved, f, indent=2)
+        return best_params
+
+    def set_params(self, params):
+        """Apply per-estimator hyperparameters keyed by display name."""
+        for name, model in self.estimators().items():
+            if name in params:
+                model.set_params(**params[name])
+
+    def get_search_times(self):
+        """Return the wall time of each estimator's last tune() search in seconds."""
+        return self.search_times
+
     def get_accuracies(self):
         """Return stored model accuracies."""
         return self.accuracies
 
+    def get_fit_times(self):
+        """Return the wall time of each estimator's last fit in seconds."""
+        return self.fit_times
+
+    def save(self, path=BUNDLE_PATH):
+        """Write all fitted state to a single on-disk bundle."""
+        if self.version is None:
+            raise ValueError("Model has not been trained")
+        bundle = {
+            'format': BUNDLE_FORMAT,
+            'version': self.version,
+            'state': {attr: getattr(self, attr) for attr in self._BUNDLE_ATTRS},
+            # Pickled separately so load() only unpickles, and imports, the estimators it needs
+            'estimators': {
+                name: {
+                    'key': self.estimator_versions[name],
+                    'base': self.base_versions.get(name, self.estimator_versions[name]),
+                    'pickle': pickle.dumps(model, protocol=pickle.HIGHEST_PROTOCOL)
+                }
+                for name, model in self.estimators().items()
+            }
+        }
+        # Write to a temporary file first so a crash never leaves a torn bundle
+        tmp_path = f"{path}.tmp"
+        joblib.dump(bundle, tmp_path)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path=BUNDLE_PATH, models=None):
+        """Restore a model from a bundle written by save().
+        
+        models selects a subset of the bundled estimators (all of them by default).
+        """
+        return cls._from_bundle(cls._read_bundle(path), models)
+
+    @staticmethod
+    def _read_bundle(path):
+        bundle = joblib.load(path)
+        if bundle.get('format') != BUNDLE_FORMAT:
+            raise ValueError(f"Unsupported bundle format: {bundle.get('format')}")
+        return bundle
+
+    @classmethod
+    def _from_bundle(cls, bundle, models=None):
+        entries = bundle['estimators']
+        names = resolve_model_names(models if models is not None else list(entries))
+        missing = [name for name in names if name not in entries]
+        if missing:
+            raise ValueError(f"Bundle has no {', '.join(missing)} model")
+        model = cls(names)
+        for attr, value in bundle['state'].items():
+            setattr(model, attr, value)
+        for name in names:
+            setattr(model, ESTIMATOR_ATTRS[name], pickle.loads(entries[name]['pickle']))
+        # Per-estimator results of models that were not selected are dropped
+        for attr in ('accuracies', 'fit_times', 'search_times'):
+            setattr(model, attr, {k: v for k, v in getattr(model, attr).items() if k in names})
+        model.estimator_versions = {name: entries[name]['key'] for name in names}
+        model.base_versions = {name: entries[name].get('base', entries[name]['key']) for name in names}
+        model.version = _combine_keys(model.estimator_versions)
+        model.compile_preprocessor()
+        # Bundles saved without check rows keep the library evaluators
+        if model.tree_check_rows is not None:
+            model.compile_trees(model.tree_check_rows)
+        return model
+
+    @classmethod
+    def load_or_train(cls, data_path, bundle_path=BUNDLE_PATH, n_jobs=None, params_path=TUNED_PARAMS_PATH, models=None,
+                      streaming=False):
+        """Load the bundle for data_path, retraining if it is missing or stale.
+        
+        Hyperparameters saved by tune() are applied first, so a new tuning
+        result also makes the bundle stale. With models given, only those
+        estimators are loaded or trained, and a bundle holding more of them is
+        reused as long as the selected ones are current. Retraining a subset
+        overwrites the bundle, so keep subsets in their own bundle_path. A bundle
+        extended by update() stays current until data_path or the
+        hyperparameters change. With streaming, the bundle must come from
+        train_streaming, which is also how it is retrained.
+        """
+        model = cls(models)
+        if params_path is not None and os.path.exists(params_path):
+            with open(params_path, encoding='utf-8') as f:
+                model.set_params(json.load(f))
+        keys = model.estimator_keys(data_path, streaming)
+        if os.path.exists(bundle_path):
+            try:
+                bundle = cls._read_bundle(bundle_path)
+                # Updated estimators are current as long as the run they descend from is
+                bundled_keys = {name: entry.get('base', entry['key']) for name, entry in bundle['estimators'].items()}
+                if all(bundled_keys.get(name) == key for name, key in keys.items()):
+                    cached = cls._from_bundle(bundle, model.model_names)
+                    print(f"Loaded model bundle from {bundle_path}")
+                    return cached
+                print("Model bundle is stale, retraining")
+            except Exception as e:
+                print(f"Could not load model bundle: {str(e)}")
+        if streaming:
+            model.train_streaming(data_path, n_jobs=n_jobs)
+        else:
+            model.train(data_path, n_jobs=n_jobs)
+        model.save(bundle_path)
+        return model
+
+    def enable_prediction_cache(self, maxsize=PREDICTION_CACHE_SIZE):
+        """Cache predictions per normalized record and model version, evicting least recently used."""
+        self.prediction_cache = PredictionCache(maxsize)
+
+    def disable_prediction_cache(self):
+        self.prediction_cache = None
+
+    def get_cache_stats(self):
+        """Return prediction cache counters, or None when the cache is disabled."""
+        return self.prediction_cache.stats() if self.prediction_cache is not None else None
+
+    def _invalidate_predictions(self):
+        # Keys include the version, but clearing frees the stale entries straight away
+        if self.prediction_cache is not None:
+            self.prediction_cache.clear()
+
+    def _cache_key(self, values):
+        # Cascade results leave out models, so the band is part of the key
+        return (self.version, self.cascade_band, _normalize_record(values, self.known_categories))
+
+    def enable_cascade(self, low=CASCADE_BAND[0], high=CASCADE_BAND[1]):
+        """Run Random Forest and XGBoost only on records whose Logistic Regression
+        dementia probability is within [low, high].
+        
+        predict() then returns only the models that ran; batch results hold NaN
+        for records a model skipped.
+        """
+        if not 0 <= low <= high <= 1:
+            raise ValueError(f"Invalid cascade band: ({low}, {high})")
+        if CASCADE_FIRST_MODEL not in self.model_names:
+            raise ValueError(f"Cascade mode needs the {CASCADE_FIRST_MODEL} model")
+        self.cascade_band = (low, high)
+        self.cascade_stats = CascadeStats()
+
+    def disable_cascade(self):
+        self.cascade_band = None
+
+    def get_cascade_stats(self):
+        """Return cascade escalation counters, or None when cascade mode is off."""
+        if self.cascade_band is None:
+            return None
+        return dict(self.cascade_stats.stats(), band=list(self.cascade_band))
+
     def predict(self, input_data_str):
         try:
-            # Convert input string to DataFrame
-            columns = [
-                'Diabetic', 'AlcoholLevel', 'HeartRate', 'BloodOxygenLevel', 
-                'BodyTemperature', 'Weight', 'MRI_Delay', 'Prescription', 
-                'Dosage in mg', 'Age', 'Dominant_Hand', 'Gender', 
-                'Family_History', 'Smoking_Status', 'APOE_ε4', 
-                'Physical_Activity', 'Depression_Status', 'Cognitive_Test_Scores', 
-                'Medication_History', 'Nutrition_Diet', 'Sleep_Quality', 
-                'Chronic_Health_Conditions'
-            ]
+            values = input_data_str.split(',')
             
-            input_data = pd.DataFrame([input_data_str.split(',')], columns=columns)
+            # Reject invalid records before any preprocessing or model work. This
+            # comes before the cache, where unseen categories share the 'Unknown' key
+            errors = record_errors(values, self.extra_categories)
+            if errors:
+                raise ValueError('; '.join(errors))
             
-            # Preprocess input data
-            X_processed = self.preprocess_data(input_data, is_training=False)
+            cache_key = None
+            if self.prediction_cache is not None:
+                cache_key = self._cache_key(values)
+                cached = self.prediction_cache.get(cache_key)
+                if cached is not None:
+                    return {name: probs.copy() for name, probs in cached.items() if not np.isnan(probs[0])}
             
-            # Make predictions
-            predictions = {
-                'Logistic Regression': self.lr_model.predict_proba(X_processed)[0],
-                'Random Forest': self.rf_model.predict_proba(X_processed)[0],
-                'XGBoost': self.xgb_model.predict_proba(X_processed)[0]
-            }
+            # Preprocess input data, skipping pandas when the compiled path is available
+            if self.compiled_preprocessor is not None:
+                with span('preprocess.compiled_row'):
+                    X_processed = self.compiled_preprocessor.transform_row(values)
+            else:
+                input_data = pd.DataFrame([values], columns=FEATURE_COLUMNS)
+                X_processed = self.preprocess_data(input_data, is_training=False)
+            
+            # Make predictions; models the cascade skipped are NaN
+            predictions = {name: probs[0] for name, probs in self._predict_proba(X_processed).items()}
             
-            return predictions
+            # Cached entries hold every model, as predict_batch() stores them
+            if cache_key is not None:
+                self.prediction_cache.put(cache_key, {name: probs.copy() for name, probs in predictions.items()})
+            # Leave out models the cascade skipped
+            return {name: probs for name, probs in predictions.items() if not np.isnan(probs[0])}
         except Exception as e:
             print(f"Error during prediction: {str(e)}")
             return None
 
+    def iter_predict_batch(self, data, chunksize=BATCH_CHUNK_SIZE, errors=None, validate=True):
+        """Yield per-chunk probabilities for a DataFrame, NumPy array or CSV path.
+        
+        Each chunk is validated, encoded, imputed, scaled and scored once as a
+        whole, and CSV files are streamed so only one chunk is held in memory at
+        a time. Rows that fail validation are not scored and come back as NaN
+        for every model; when errors is a list, (row position, messages) pairs
+        are appended to it. Pass validate=False for rows already validated.
+        """
+        offset = 0
+        for chunk in _iter_feature_chunks(data, chunksize):
+            if not validate:
+                yield self._predict_chunk(chunk)
+                continue
+            with span('validate.batch'):
+                valid, chunk_errors = validate_records(chunk, self.extra_categories)
+            if errors is not None:
+                errors.extend((offset + row, messages) for row, messages in chunk_errors.items())
+            offset += len(chunk)
+            if valid.all():
+                yield self._predict_chunk(chunk)
+                continue
+            increment('rows_rejected', len(chunk_errors))
+            # Rejected rows are NaN, like the rows a cascade skips
+            results = {name: np.full((len(chunk), 2), np.nan) for name in self.estimators()}
+            if valid.any():
+                for name, probs in self._predict_chunk(chunk[valid]).items():
+                    results[name][valid] = probs
+            yield results
+
+    def _predict_chunk(self, chunk):
+        if self.prediction_cache is not None:
+            return self._predict_chunk_cached(chunk)
+        X_processed = self.preprocess_data(chunk, is_training=False)
+        return self._predict_proba(X_processed)
+
+    def _predict_chunk_cached(self, chunk):
+        """Score only the rows of chunk that are not already in the prediction cache."""
+        keys = [self._cache_key(row) for row in chunk.itertuples(index=False, name=None)]
+        rows = [self.prediction_cache.get(key) for key in keys]
+        missing = [i for i, row in enumerate(rows) if row is None]
+        if missing:
+            X_processed = self.preprocess_data(chunk.iloc[missing], is_training=False)
+            fresh = self._predict_proba(X_processed)
+            for j, i in enumerate(missing):
+                rows[i] = {name: probs[j].copy() for name, probs in fresh.items()}
+                self.prediction_cache.put(keys[i], rows[i])
+        return {name: np.vstack([row[name] for row in rows]) for name in self.estimators()}
+
+    def _predict_proba(self, X_processed):
+        """Score preprocessed rows with every model, timing each one."""
+        if self.cascade_band is not None:
+            return self._predict_cascade(X_processed)
+        predictions = {}
+        for name, model in self.scorers(len(X_processed)).items():
+            with span(f"predict_proba.{name}"):
+                predictions[name] = model.predict_proba(X_processed)
+        increment('rows_scored', len(X_processed))
+        return predictions
+
+    def _predict_cascade(self, X_processed):
+        """Score every row with the first model and escalate the uncertain ones to the others."""
+        start = time.perf_counter()
+        with span(f"predict_proba.{CASCADE_FIRST_MODEL}"):
+            first = self.scorers(len(X_processed))[CASCADE_FIRST_MODEL].predict_proba(X_processed)
+        first_seconds = time.perf_counter() - start
+        
+        low, high = self.cascade_band
+        escalate = (first[:, 1] >= low) & (first[:, 1] <= high)
+        n_escalated = int(escalate.sum())
+        predictions = {CASCADE_FIRST_MODEL: first}
+        start = time.perf_counter()
+        X_escalated = X_processed[escalate] if n_escalated else None
+        for name, model in self.scorers(n_escalated).items():
+            if name == CASCADE_FIRST_MODEL:
+                continue
+            probs = np.full((len(X_processed), 2), np.nan)
+            if n_escalated:
+                with span(f"predict_proba.{name}"):
+                    probs[escalate] = model.predict_proba(X_escalated)
+            predictions[name] = probs
+        self.cascade_stats.record(len(X_processed), n_escalated, first_seconds, time.perf_counter() - start)
+        increment('rows_scored', len(X_processed))
+        increment('rows_escalated', n_escalated)
+        return predictions
+
+    def predict_batch(self, data, chunksize=BATCH_CHUNK_SIZE, errors=None, validate=True):
+        """Return an (n, 2) probability array per model for every input row.
+        
+        Rows that fail validation, and in cascade mode rows a model did not run
+        on, are NaN. See iter_predict_batch for errors and validate.
+        """
+        results = {name: [] for name in self.estimators()}
+        for chunk_predictions in self.iter_predict_batch(data, chunksize, errors, validate):
+            for name, probs in chunk_predictions.items():
+                results[name].append(probs)
+        return {
+            name: np.concatenate(probs) if probs else np.empty((0, 2))
+            for name, probs in results.items()
+        }
+
+    def explain(self, data, chunksize=BATCH_CHUNK_SIZE, errors=None):
+        """Return per-feature contributions to every record's dementia score, per model.
+        
+        data is anything predict_batch accepts. Each selected model maps to:
+        - 'contributions': (n, 22) array with columns in FEATURE_COLUMNS order
+        - 'base': (n,) score before any feature is taken into account
+        - 'units': what base and contributions are measured in, see EXPLANATION_UNITS
+        - 'seconds_per_record': explanation time per valid record
+        Logistic Regression contributions are coefficient times scaled value,
+        XGBoost's are its native per-prediction contributions and the Random
+        Forest's follow each record's decision paths. base plus the row sum of
+        contributions reproduces the model's score exactly. Preprocessing keeps
+        one column per input feature, so the contributions already belong to the
+        22 original columns. Rows that fail validation are NaN and, when errors
+        is a list, reported in it as in iter_predict_batch.
+        """
+        results = {name: {'base': [], 'contributions': []} for name in self.estimators()}
+        seconds = {name: 0.0 for name in self.estimators()}
+        explained_rows = 0
+        offset = 0
+        for chunk in _iter_feature_chunks(data, chunksize):
+            valid, chunk_errors = validate_records(chunk, self.extra_categories)
+            if errors is not None:
+                errors.extend((offset + row, messages) for row, messages in chunk_errors.items())
+            offset += len(chunk)
+            explained = {}
+            if valid.any():
+                X_processed = self.preprocess_data(chunk[valid], is_training=False)
+                explained = self._explain_processed(X_processed, seconds)
+                explained_rows += len(X_processed)
+            for name, result in results.items():
+                base = np.full(len(chunk), np.nan)
+                contributions = np.full((len(chunk), len(FEATURE_COLUMNS)), np.nan)
+                if name in explained:
+                    base[valid], contributions[valid] = explained[name]
+                result['base'].append(base)
+                result['contributions'].append(contributions)
+        return {
+            name: {
+                'contributions': np.concatenate(result['contributions']) if result['contributions'] else np.empty((0, len(FEATURE_COLUMNS))),
+                'base': np.concatenate(result['base']) if result['base'] else np.empty(0),
+                'units': EXPLANATION_UNITS[name],
+                'seconds_per_record': seconds[name] / explained_rows if explained_rows else 0.0
+            }
+            for name, result in results.items()
+        }
+
+    def explain_record(self, input_data_str):
+        """Explain one comma-separated record; returns None if it cannot be scored, like predict.
+        
+        Each model maps to {'base', 'contributions' (feature -> value), 'units', 'seconds'}.
+        """
+        try:
+            values = input_data_str.split(',')
+            errors = record_errors(values, self.extra_categories)
+            if errors:
+                raise ValueError('; '.join(errors))
+            if self.compiled_preprocessor is not None:
+                X_processed = self.compiled_preprocessor.transform_row(values)
+            else:
+                X_processed = self.preprocess_data(pd.DataFrame([values], columns=FEATURE_COLUMNS), is_training=False)
+            seconds = {name: 0.0 for name in self.estimators()}
+            return {
+                name: {
+                    'base': float(base[0]),
+                    'contributions': dict(zip(FEATURE_COLUMNS, contributions[0].tolist())),
+                    'units': EXPLANATION_UNITS[name],
+                    'seconds': seconds[name]
+                }
+                for name, (base, contributions) in self._explain_processed(X_processed, seconds).items()
+            }
+        except Exception as e:
+            print(f"Error during explanation: {str(e)}")
+            return None
+
+    def _explain_processed(self, X_processed, seconds):
+        """Return {name: (base, contributions)} for preprocessed rows, adding each model's time to seconds."""
+        explained = {}
+        for name, model in self.estimators().items():
+            start = time.perf_counter()
+            with span(f"explain.{name}"):
+                if name == 'XGBoost':
+                    import xgboost
+                    
+                    raw = model.get_booster().predict(
+                        xgboost.DMatrix(X_processed), pred_contribs=True, iteration_range=(0, best_rounds(model))
+                    )
+                    # The last column is the bias every record starts from
+                    explained[name] = (raw[:, -1].astype(float), raw[:, :-1].astype(float))
+                elif name == 'Random Forest':
+                    # The path attribution needs the compiled node arrays; compile them if the check dropped them
+                    forest = self.compiled_trees.get(name) or CompiledForest.from_sklearn(model)
+                    explained[name] = forest.contributions(X_processed)
+                else:
+                    explained[name] = (
+                        np.full(len(X_processed), float(model.intercept_[0])),
+                        np.asarray(X_processed) * model.coef_[0]
+                    )
+            seconds[name] += time.perf_counter() - start
+        return explained
+
+def _streaming_data_iter(model, data_path, chunksize, cache_prefix):
+    """Build an xgboost.DataIter over the training chunks; defined here so xgboost is imported lazily."""
+    import xgboost
+    
+    class _StreamingDataIter(xgboost.DataIter):
+        """Feeds preprocessed training chunks to XGBoost's external-memory DMatrix."""
+        def __init__(self):
+            self.chunks = None
+            super().__init__(cache_prefix=cache_prefix)
+
+        def next(self, input_data):
+            if self.chunks is None:
+                self.chunks = model._iter_stream_chunks(data_path, chunksize, holdout=False)
+            try:
+                X, y = next(self.chunks)
+            except StopIteration:
+                return False
+            input_data(data=X, label=y)
+            return True
+
+        def reset(self):
+            self.chunks = None
+    
+    return _StreamingDataIter()
+
+def _combine_keys(keys):
+    """Single hash over per-estimator keys."""
+    return hashlib.sha256(json.dumps(keys, sort_keys=True).encode('utf-8')).hexdigest()
+
+def _scaler_from_moments(mean, var, n_samples):
+    """Build a fitted StandardScaler from per-column means and variances."""
+    from sklearn.preprocessing import StandardScaler
+    
+    scaler = StandardScaler()
+    scaler.mean_ = mean
+    scaler.var_ = var
+    scale = np.sqrt(var)
+    # Same guard as StandardScaler for constant columns
+    scale[scale < 10 * np.finfo(scale.dtype).eps] = 1.0
+    scaler.scale_ = scale
+    scaler.n_samples_seen_ = n_samples
+    scaler.n_features_in_ = len(mean)
+    return scaler
+
+# (path, size, mtime) -> digest, so one training run hashes each file once
+_file_hash_cache = {}
+
+def file_sha256(path):
+    """Return the SHA-256 hex digest of a file's contents."""
+    stat = os.stat(path)
+    cache_key = (os.path.abspath(path), stat.st_size, stat.st_mtime_ns)
+    if cache_key in _file_hash_cache:
+        return _file_hash_cache[cache_key]
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    _file_hash_cache[cache_key] = digest.hexdigest()
+    return _file_hash_cache[cache_key]
+
+def _parquet_available():
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+def dataset_dtypes(chunked=False):
+    """Column dtypes load_dataset parses a CSV with.
+    
+    Chunked reads keep the categories as strings, since each chunk would get
+    its own set of categoricals, and read the remaining numerical columns as
+    float32 because the integer type is only chosen once the whole file is seen.
+    """
+    dtypes = {col: str if chunked else 'category' for col in CATEGORICAL_COLUMNS}
+    if chunked:
+        dtypes.update({col: np.float32 for col in FEATURE_COLUMNS + [TARGET_COLUMN] if col not in CATEGORICAL_COLUMNS})
+    dtypes.update({col: np.float32 for col in FLOAT32_COLUMNS})
+    return dtypes
+
+def load_dataset(data_path, cache_dir=DATASET_CACHE_DIR, use_cache=True, chunksize=None):
+    """Load a dataset CSV with compact dtypes, reusing a columnar cache of earlier parses.
+    
+    Categorical columns become pandas categoricals, continuous measurements
+    float32 and the remaining numerical columns the smallest integer type that
+    fits. The parsed frame is cached as Parquet (or a pickle when pyarrow is not
+    installed) under cache_dir, keyed by the CSV's content hash. With chunksize,
+    an iterator over frames of at most that many rows is returned instead; the
+    chunks share one set of dtypes, see dataset_dtypes, and are not cached.
+    """
+    if chunksize is not None:
+        return pd.read_csv(data_path, encoding='utf-8', dtype=dataset_dtypes(chunked=True), chunksize=chunksize)
+    extension = '.parquet' if _parquet_available() else '.pkl'
+    stem = os.path.splitext(os.path.basename(data_path))[0]
+    cache_path = os.path.join(cache_dir, f"{stem}-{file_sha256(data_path)[:16]}{extension}")
+    if use_cache and os.path.exists(cache_path):
+        with span('load.dataset_cache'):
+            if extension == '.parquet':
+                return pd.read_parquet(cache_path)
+            return pd.read_pickle(cache_path)
+    
+    dtypes = dataset_dtypes()
+    with span('load.csv'):
+        data = pd.read_csv(data_path, encoding='utf-8', dtype=dtypes)
+    for col in data.columns:
+        if col in dtypes or not pd.api.types.is_numeric_dtype(data[col]):
+            continue
+        if data[col].isna().any():
+            data[col] = data[col].astype(np.float32)
+        else:
+            data[col] = pd.to_numeric(data[col], downcast='integer')
+    
+    if use_cache:
+        os.makedirs(cache_dir, exist_ok=True)
+        tmp_path = f"{cache_path}.tmp"
+        if extension == '.parquet':
+            data.to_parquet(tmp_path)
+        else:
+            data.to_pickle(tmp_path)
+        os.replace(tmp_path, cache_path)
+    return data
+
+def _core_budget(n_jobs):
+    """Resolve an n_jobs value (None or negative for all cores) to a core count."""
+    cpu_count = os.cpu_count() or 1
+    if n_jobs is None or n_jobs < 0:
+        return cpu_count
+    return max(int(n_jobs), 1)
+
+def _iter_feature_chunks(data, chunksize):
+    """Yield DataFrames holding the 22 feature columns, chunksize rows at a time."""
+    if isinstance(data, (str, os.PathLike)):
+        reader = pd.read_csv(data, encoding='utf-8', chunksize=chunksize)
+        while True:
+            with span('load.csv_chunk'):
+                chunk = next(reader, None)
+            if chunk is None:
+                return
+            yield chunk[FEATURE_COLUMNS]
+    if isinstance(data, np.ndarray):
+        data = pd.DataFrame(data, columns=FEATURE_COLUMNS)
+    data = data[FEATURE_COLUMNS]
+    for start in range(0, len(data), chunksize):
+        yield data.iloc[start:start + chunksize]
+
 # Usage example
 def main():
+    parser = argparse.ArgumentParser(description="Train (if needed) and score an example record")
+    parser.add_argument('--data', default='data.csv')
+    parser.add_argument('--models', help="Comma-separated subset of lr,rf,xgb")
+    parser.add_argument('--bundle', default=BUNDLE_PATH)
+    parser.add_argument('--update', metavar='CSV', help="Extend the bundled models with these newly labelled records and save the new version")
+    parser.add_argument('--stream', action='store_true', help="Train out of core, for CSVs too large to load at once")
+    instrumentation.add_arguments(parser)
+    args = parser.parse_args()
+    
     try:
-        # Initialize and train the model
-        model = DementiaPredictionModel()
-        model.train('data.csv')
-        
-        # Example input data
-        input_data = "0,0.000955737,84,99.84323059,36.03250039,84.81595461,38.72863817,,,49,Right,Female,No,Never Smoked,Negative,Mild Activity,No,10,No,Low-Carb Diet,Good,None"
-        
-        # Get predictions
-        predictions = model.predict(input_data)
+        with instrumentation.session(args):
+            # Load the persisted model, training only if the bundle is missing or stale
+            model = DementiaPredictionModel.load_or_train(args.data, args.bundle, models=args.models, streaming=args.stream)
+            if args.update:
+                entry = model.update(args.update)
+                model.save(args.bundle)
+                print(f"\nSaved version {entry['version'][:12]} ({len(model.update_history)} update(s) since the last full training)")
+            
+            # Example input data
+            input_data = "0,0.000955737,84,99.84323059,36.03250039,84.81595461,38.72863817,,,49,Right,Female,No,Never Smoked,Negative,Mild Activity,No,10,No,Low-Carb Diet,Good,None"
+            
+            # Get predictions and what drove them
+            predictions = model.predict(input_data)
+            explanations = model.explain_record(input_data) if predictions else None
         
         if predictions:
             # Print predictions with probability scores
@@ -168,6 +1771,11 @@ def main():
                 print(f"\n{model_name}:")
                 print(f"Probability of No Dementia: {probs[0]:.4f}")
                 print(f"Probability of Dementia: {probs[1]:.4f}")
+                if explanations:
+                    explanation = explanations[model_name]
+                    top = sorted(explanation['contributions'].items(), key=lambda item: -abs(item[1]))[:3]
+                    print(f"Largest contributions ({explanation['units']}): " +
+                          ', '.join(f"{field} {value:+.3f}" for field, value in top))
         else:
             print("Prediction failed. Please check the input data format and try again.")
             
@@ -0,0 +1,206 @@
+import argparse
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+import instrumentation
+from instrumentation import span, increment
+from model import DementiaPredictionModel, BUNDLE_PATH, TUNED_PARAMS_PATH
+
+# Seconds between checks of the training CSV
+WATCH_INTERVAL = 5.0
+# Every model of a retrained candidate must reach this held-out accuracy to go live
+MIN_ACCURACY = 0.8
+
+def _file_signature(path):
+    # Cheap change check; a changed signature is confirmed on the next poll
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_size, stat.st_mtime_ns
+
+def _train_candidate(data_path, bundle_path, models, n_jobs, params_path, streaming):
+    # Runs in the worker process: train from scratch and leave the result on disk
+    if os.path.exists(bundle_path):
+        os.remove(bundle_path)
+    model = DementiaPredictionModel.load_or_train(data_path, bundle_path, n_jobs, params_path, models, streaming)
+    return model.get_accuracies()
+
+def _carry_settings(old, new):
+    # Serving options are set on the model object, so the candidate inherits them
+    if old is None:
+        return
+    if old.prediction_cache is not None:
+        new.enable_prediction_cache(old.prediction_cache.maxsize)
+    if old.cascade_band is not None:
+        new.enable_cascade(*old.cascade_band)
+
+class ModelManager:
+    """Keeps a live DementiaPredictionModel current with its training CSV.
+
+    Retraining runs in a separate process and its bundle is loaded on the
+    manager's thread, so serving threads never wait on it. A candidate whose
+    models all reach min_accuracy replaces the live model by a single
+    reference assignment: callers read manager.model once per request and
+    finish that request on the version they read, while later requests see the
+    new encoders, scaler and estimators together. A live model is never
+    modified in place.
+    """
+    def __init__(self, data_path='data.csv', bundle_path=BUNDLE_PATH, models=None,
+                 min_accuracy=MIN_ACCURACY, watch=True, interval=WATCH_INTERVAL,
+                 n_jobs=None, params_path=TUNED_PARAMS_PATH, streaming=False):
+        self.data_path = data_path
+        self.bundle_path = bundle_path
+        self.candidate_path = f"{bundle_path}.candidate"
+        self.models = models
+        self.min_accuracy = min_accuracy
+        self.watch = watch
+        self.interval = interval
+        self.n_jobs = n_jobs
+        self.params_path = params_path
+        self.streaming = streaming  # Retrain with train_streaming instead of train
+        self.model = None
+        self.listeners = []  # Called with the new model after each swap
+        self.lock = threading.Lock()
+        self.retraining = False
+        self.retrains = 0
+        self.swaps = 0
+        self.rejected = 0
+        self.last_accuracies = None
+        self.last_error = None
+        self._trigger = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        """Load or train the initial model, start the retrain thread and return the model."""
+        self.model = DementiaPredictionModel.load_or_train(
+            self.data_path, self.bundle_path, self.n_jobs, self.params_path, self.models, self.streaming
+        )
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        return self.model
+
+    def stop(self):
+        """Stop watching; a retrain in progress is left to finish in the background."""
+        self._stop.set()
+        self._trigger.set()
+
+    def trigger(self):
+        """Request a retrain, e.g. after data was appended outside the watched file.
+
+        Requests made while a retrain is running are folded into one more run.
+        """
+        self._trigger.set()
+
+    def add_listener(self, callback):
+        """Call callback(model) from the manager thread after every swap."""
+        self.listeners.append(callback)
+
+    def _run(self):
+        signature = _file_signature(self.data_path)
+        pending = None
+        while not self._stop.is_set():
+            triggered = self._trigger.wait(self.interval)
+            if self._stop.is_set():
+                break
+            self._trigger.clear()
+            current = _file_signature(self.data_path)
+            if not triggered:
+                if not self.watch or current == signature:
+                    pending = None
+                    continue
+                if current != pending:
+                    # Still being written, or just changed: wait until it settles
+                    pending = current
+                    continue
+            signature, pending = current, None
+            self._retrain()
+
+    def _retrain(self):
+        self.retraining = True
+        self.retrains += 1
+        increment('manager.retrains')
+        try:
+            with span('manager.retrain'):
+                # spawn: forking a process that runs server or UI threads is unsafe
+                context = multiprocessing.get_context('spawn')
+                with ProcessPoolExecutor(max_workers=1, mp_context=context) as executor:
+                    accuracies = executor.submit(
+                        _train_candidate, self.data_path, self.candidate_path,
+                        self.models, self.n_jobs, self.params_path, self.streaming
+                    ).result()
+            self.last_accuracies = accuracies
+            failing = {name: acc for name, acc in accuracies.items() if acc < self.min_accuracy}
+            if failing:
+                self.rejected += 1
+                increment('manager.rejected')
+                print("Retrained model rejected, below the accuracy threshold: " +
+                      ", ".join(f"{name} {acc:.2%}" for name, acc in failing.items()))
+                os.remove(self.candidate_path)
+                return
+            with span('manager.load_candidate'):
+                candidate = DementiaPredictionModel.load(self.candidate_path, self.models)
+            # The accepted bundle becomes the one a restart loads
+            os.replace(self.candidate_path, self.bundle_path)
+            if candidate.version == self.model.version:
+                # Same data and hyperparameters: keep the live model and its warm cache
+                print("Retrained model is unchanged")
+                return
+            self._swap(candidate)
+        except Exception as e:
+            self.last_error = str(e)
+            print(f"Retraining failed, keeping the current model: {str(e)}")
+        finally:
+            self.retraining = False
+
+    def _swap(self, candidate):
+        _carry_settings(self.model, candidate)
+        with self.lock:
+            previous = self.model
+            self.model = candidate
+            self.swaps += 1
+        increment('manager.swaps')
+        print(f"Swapped in retrained model {candidate.version[:12]} (was {previous.version[:12]})")
+        for callback in self.listeners:
+            callback(candidate)
+
+    def status(self):
+        """Return the live version and retrain counters."""
+        with self.lock:
+            return {
+                'version': self.model.version if self.model is not None else None,
+                'retraining': self.retraining,
+                'retrains': self.retrains,
+                'swaps': self.swaps,
+                'rejected': self.rejected,
+                'last_accuracies': self.last_accuracies,
+                'last_error': self.last_error
+            }
+
+def main():
+    parser = argparse.ArgumentParser(description="Retrain the model bundle whenever the training CSV changes")
+    parser.add_argument('--data', default='data.csv')
+    parser.add_argument('--bundle', default=BUNDLE_PATH)
+    parser.add_argument('--models', help="Comma-separated subset of lr,rf,xgb to keep current")
+    parser.add_argument('--min-accuracy', type=float, default=MIN_ACCURACY)
+    parser.add_argument('--interval', type=float, default=WATCH_INTERVAL, help="Seconds between checks of --data")
+    parser.add_argument('--stream', action='store_true', help="Train out of core, for CSVs too large to load at once")
+    instrumentation.add_arguments(parser)
+    args = parser.parse_args()
+
+    with instrumentation.session(args):
+        manager = ModelManager(args.data, args.bundle, args.models, args.min_accuracy, interval=args.interval,
+                               streaming=args.stream)
+        manager.start()
+        print(f"Watching {args.data}; press Ctrl+C to stop")
+        try:
+            while True:
+                time.sleep(1)
+        except KeyboardInterrupt:
+            manager.stop()
+
+if __name__ == "__main__":
+    main()
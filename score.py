@@ -0,0 +1,183 @@
+import argparse
+import csv
+import gc
+import io
+import math
+import multiprocessing
+import os
+import shutil
+import tempfile
+import time
+import pandas as pd
+from model import DementiaPredictionModel, BUNDLE_PATH, BATCH_CHUNK_SIZE, parse_band
+
+# Shards per worker, so a slow shard does not leave the other workers idle at the end
+SHARDS_PER_WORKER = 4
+# Upper bound on the bytes of CSV a worker holds at once
+MAX_SHARD_BYTES = 64 * 1024 * 1024
+FLOAT_FORMAT = '%.6f'
+
+# Set in the parent before the pool forks, or per worker by _init_worker under spawn
+_MODEL = None
+
+def plan_shards(path, n_shards):
+    """Split a CSV into byte ranges that start and end on line boundaries.
+
+    Returns the header line and a list of (start, end) offsets covering every
+    data row exactly once. Assumes no quoted field spans several lines.
+    """
+    size = os.path.getsize(path)
+    with open(path, 'rb') as f:
+        header = f.readline()
+        data_start = f.tell()
+        boundaries = [data_start]
+        step = max((size - data_start) // max(n_shards, 1), 1)
+        for target in range(data_start + step, size, step):
+            if target <= boundaries[-1]:
+                continue
+            # Move to the start of the line after the target offset
+            f.seek(target - 1)
+            f.readline()
+            offset = f.tell()
+            if boundaries[-1] < offset < size:
+                boundaries.append(offset)
+        boundaries.append(size)
+    return header, [(start, end) for start, end in zip(boundaries, boundaries[1:]) if end > start]
+
+def _init_worker(bundle_path, models, cascade_band):
+    # Only used when fork is unavailable: load the bundle once per worker, not per shard
+    global _MODEL
+    _MODEL = DementiaPredictionModel.load(bundle_path, models)
+    if cascade_band is not None:
+        _MODEL.enable_cascade(*cascade_band)
+    _limit_threads(_MODEL)
+
+def _limit_threads(model):
+    # One core per worker process; the processes provide the parallelism
+    for ensemble in (model.rf_model, model.xgb_model):
+        if ensemble is not None:
+            ensemble.set_params(n_jobs=1)
+
+def _score_shard(task):
+    """Score one byte range of the input and write its rows to a part file.
+
+    Rows that fail validation are written with empty cells and returned as
+    (row within the shard, messages) pairs.
+    """
+    index, input_path, header, start, end, part_dir = task
+    with open(input_path, 'rb') as f:
+        f.seek(start)
+        raw = f.read(end - start)
+    part_path = os.path.join(part_dir, f"part-{index:06d}.csv")
+    rows = 0
+    escalated = 0  # Rows every model ran on
+    errors = []
+    with open(part_path, 'w', encoding='utf-8', newline='') as out:
+        for chunk in pd.read_csv(io.BytesIO(header + raw), encoding='utf-8', chunksize=BATCH_CHUNK_SIZE):
+            chunk_errors = []
+            predictions = _MODEL.predict_batch(chunk, errors=chunk_errors)
+            errors.extend((rows + row, messages) for row, messages in chunk_errors)
+            frame = pd.DataFrame({f"{name}_dementia": probs[:, 1] for name, probs in predictions.items()})
+            frame.to_csv(out, header=False, index=False, float_format=FLOAT_FORMAT)
+            rows += len(frame)
+            escalated += int(frame.notna().all(axis=1).sum())
+    return index, rows, escalated, errors, part_path
+
+def score_file(model, input_path, output_path, workers=None, bundle_path=BUNDLE_PATH, errors_path=None):
+    """Score every row of input_path across worker processes and write the results in input order.
+
+    Workers are forked after the model is loaded, so they share its arrays
+    copy-on-write instead of receiving a pickled copy. Each shard is written
+    to its own part file, and the parts are concatenated in shard order.
+    Rows that fail validation are left empty and, with errors_path, listed
+    there by their 0-based data row. Returns (rows, rows scored by every
+    model, rejected rows, seconds); the second count is below rows only in
+    cascade mode or when rows are rejected.
+    """
+    global _MODEL
+    workers = workers or os.cpu_count() or 1
+    start_time = time.perf_counter()
+    size = os.path.getsize(input_path)
+    n_shards = max(workers * SHARDS_PER_WORKER, math.ceil(size / MAX_SHARD_BYTES))
+    header, shards = plan_shards(input_path, n_shards)
+
+    _MODEL = model
+    _limit_threads(model)
+    if 'fork' in multiprocessing.get_all_start_methods():
+        context = multiprocessing.get_context('fork')
+        initializer, initargs = None, ()
+        # Keep the collector from writing to the model's objects, which would copy their pages
+        gc.freeze()
+    else:
+        context = multiprocessing.get_context('spawn')
+        initializer, initargs = _init_worker, (bundle_path, model.model_names, model.cascade_band)
+
+    part_dir = tempfile.mkdtemp(prefix='score_parts_', dir=os.path.dirname(os.path.abspath(output_path)))
+    try:
+        tasks = [(i, input_path, header, start, end, part_dir) for i, (start, end) in enumerate(shards)]
+        parts = [None] * len(tasks)
+        shard_rows = [0] * len(tasks)
+        shard_errors = [None] * len(tasks)
+        total_escalated = 0
+        with context.Pool(workers, initializer=initializer, initargs=initargs) as pool:
+            for index, rows, escalated, errors, part_path in pool.imap_unordered(_score_shard, tasks):
+                parts[index] = part_path
+                shard_rows[index] = rows
+                shard_errors[index] = errors
+                total_escalated += escalated
+        total_rows = sum(shard_rows)
+        total_rejected = sum(len(errors) for errors in shard_errors)
+        if errors_path is not None:
+            _write_errors(errors_path, shard_rows, shard_errors)
+
+        columns = [f"{name}_dementia" for name in model.estimators()]
+        tmp_path = f"{output_path}.tmp"
+        with open(tmp_path, 'wb') as out:
+            out.write((','.join(columns) + '\n').encode('utf-8'))
+            for part_path in parts:
+                with open(part_path, 'rb') as part:
+                    shutil.copyfileobj(part, out)
+        os.replace(tmp_path, output_path)
+    finally:
+        shutil.rmtree(part_dir, ignore_errors=True)
+        if context.get_start_method() == 'fork':
+            gc.unfreeze()
+    return total_rows, total_escalated, total_rejected, time.perf_counter() - start_time
+
+def _write_errors(path, shard_rows, shard_errors):
+    # Shard-relative rows become file rows by adding the rows of the shards before
+    with open(path, 'w', encoding='utf-8', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(['row', 'errors'])
+        offset = 0
+        for rows, errors in zip(shard_rows, shard_errors):
+            for row, messages in errors:
+                writer.writerow([offset + row, '; '.join(messages)])
+            offset += rows
+
+def main():
+    parser = argparse.ArgumentParser(description="Score a large CSV across worker processes")
+    parser.add_argument('input', help="CSV with the 22 feature columns")
+    parser.add_argument('output', help="CSV of per-model dementia probabilities, one row per input row")
+    parser.add_argument('--workers', type=int, default=os.cpu_count())
+    parser.add_argument('--data', default='data.csv', help="Training CSV used if the bundle is stale")
+    parser.add_argument('--bundle', default=BUNDLE_PATH)
+    parser.add_argument('--models', help="Comma-separated subset of lr,rf,xgb to score with")
+    parser.add_argument('--stream', action='store_true', help="Use (or train) an out-of-core model, see model.py --stream")
+    parser.add_argument('--errors', metavar='CSV', help="Write the validation errors of rejected rows here")
+    parser.add_argument('--cascade', metavar='LOW,HIGH', type=parse_band, help="Score with the ensembles only when the Logistic Regression probability is in this band; skipped cells are left empty")
+    args = parser.parse_args()
+
+    model = DementiaPredictionModel.load_or_train(args.data, args.bundle, models=args.models, streaming=args.stream)
+    if args.cascade:
+        model.enable_cascade(*args.cascade)
+    rows, escalated, rejected, seconds = score_file(model, args.input, args.output, args.workers, args.bundle, args.errors)
+    print(f"Scored {rows} rows with {args.workers} worker(s) in {seconds:.2f}s "
+          f"({rows / seconds:,.0f} rows/s)")
+    if rejected:
+        print(f"Rejected {rejected} invalid rows" + (f", see {args.errors}" if args.errors else "; pass --errors to list them"))
+    if args.cascade:
+        print(f"Escalated {escalated} rows ({escalated / rows if rows else 0:.1%}) to every model")
+
+if __name__ == "__main__":
+    main()
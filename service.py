@@ -0,0 +1,276 @@
+import argparse
+import json
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import numpy as np
+import pandas as pd
+import instrumentation
+from instrumentation import span, increment
+from model import DementiaPredictionModel, FEATURE_COLUMNS, BUNDLE_PATH, parse_band
+from model_manager import ModelManager, MIN_ACCURACY
+
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 8000
+# Micro-batch bounds: score as soon as either limit is reached
+MAX_BATCH_SIZE = 64
+MAX_WAIT_MS = 5
+# How long a request waits for its batch before giving up (seconds)
+REQUEST_TIMEOUT = 30
+
+class MicroBatcher:
+    """Collects concurrent requests into small batches scored with one predict_batch call."""
+    def __init__(self, model, max_batch_size=MAX_BATCH_SIZE, max_wait_ms=MAX_WAIT_MS):
+        self.model = model
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+        self.queue = queue.Queue()
+        self.lock = threading.Lock()
+        self.batch_count = 0
+        self.row_count = 0
+        self.request_count = 0
+        self.max_batch_rows = 0
+        self.batch_size_counts = {}  # Batch size in rows -> number of batches
+        self.worker = threading.Thread(target=self._run, daemon=True)
+        self.worker.start()
+
+    def submit(self, records):
+        """Queue a list of 22-value records.
+        
+        The future resolves to (per-model probability arrays, {record index: validation errors});
+        records that failed validation are NaN.
+        """
+        future = Future()
+        self.queue.put((records, future))
+        return future
+
+    def _run(self):
+        while True:
+            batch = [self.queue.get()]
+            rows = len(batch[0][0])
+            deadline = time.monotonic() + self.max_wait
+            while rows < self.max_batch_size:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    item = self.queue.get(timeout=timeout)
+                except queue.Empty:
+                    break
+                batch.append(item)
+                rows += len(item[0])
+            self._score(batch, rows)
+
+    def _score(self, batch, rows):
+        with self.lock:
+            self.batch_count += 1
+            self.row_count += rows
+            self.request_count += len(batch)
+            self.max_batch_rows = max(self.max_batch_rows, rows)
+            self.batch_size_counts[rows] = self.batch_size_counts.get(rows, 0) + 1
+        increment('service.requests', len(batch))
+
+        try:
+            with span('service.batch'):
+                frame = pd.DataFrame(
+                    [record for records, _ in batch for record in records],
+                    columns=FEATURE_COLUMNS
+                )
+                # The whole micro-batch is validated at once; invalid records are never scored.
+                # The model is read once, so a hot swap takes effect between batches
+                model = self.model
+                errors = []
+                predictions = model.predict_batch(frame, errors=errors)
+        except Exception as e:
+            for _, future in batch:
+                future.set_exception(e)
+            return
+
+        # Hand each request back its own slice of the batch and its records' errors
+        errors = dict(errors)
+        offset = 0
+        for records, future in batch:
+            end = offset + len(records)
+            request_errors = {row - offset: errors[row] for row in range(offset, end) if row in errors}
+            future.set_result(({name: probs[offset:end] for name, probs in predictions.items()}, request_errors))
+            offset = end
+
+    def stats(self):
+        """Return queue depth, batch-size and prediction cache statistics."""
+        with self.lock:
+            return {
+                'prediction_cache': self.model.get_cache_stats(),
+                'cascade': self.model.get_cascade_stats(),
+                'queue_depth': self.queue.qsize(),
+                'requests': self.request_count,
+                'rows': self.row_count,
+                'batches': self.batch_count,
+                'mean_batch_size': self.row_count / self.batch_count if self.batch_count else 0.0,
+                'max_batch_size': self.max_batch_rows,
+                'batch_size_counts': {str(k): v for k, v in sorted(self.batch_size_counts.items())}
+            }
+
+def parse_record(record):
+    """Normalize a comma-joined string, list of values or column dict to 22 values."""
+    if isinstance(record, str):
+        values = record.split(',')
+    elif isinstance(record, dict):
+        values = [record.get(col) for col in FEATURE_COLUMNS]
+    elif isinstance(record, list):
+        values = record
+    else:
+        raise ValueError(f"Unsupported record type: {type(record).__name__}")
+    if len(values) != len(FEATURE_COLUMNS):
+        raise ValueError(f"Expected {len(FEATURE_COLUMNS)} values, got {len(values)}")
+    return values
+
+class ScoringRequestHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path == '/health':
+            self._send_json(200, {'status': 'ok', 'version': self.server.model.version})
+        elif self.path == '/stats':
+            stats = self.server.batcher.stats()
+            if self.server.manager is not None:
+                stats['model_manager'] = self.server.manager.status()
+            self._send_json(200, stats)
+        elif self.path == '/metrics':
+            self._send_text(200, instrumentation.REGISTRY.to_prometheus())
+        else:
+            self._send_json(404, {'error': 'Not found'})
+
+    def do_POST(self):
+        if self.path == '/retrain':
+            if self.server.manager is None:
+                self._send_json(409, {'error': 'Start the service with --watch to retrain in place'})
+            else:
+                self.server.manager.trigger()
+                self._send_json(202, {'status': 'retraining'})
+            return
+        if self.path != '/predict':
+            self._send_json(404, {'error': 'Not found'})
+            return
+        try:
+            length = int(self.headers.get('Content-Length', 0))
+            payload = json.loads(self.rfile.read(length))
+            # Accept {"record": ...}, {"records": [...]} or a bare list of records
+            single = isinstance(payload, dict) and 'record' in payload
+            if single:
+                raw_records = [payload['record']]
+            elif isinstance(payload, dict):
+                raw_records = payload.get('records', [])
+            else:
+                raw_records = payload
+            records = [parse_record(record) for record in raw_records]
+        except (ValueError, TypeError, AttributeError) as e:
+            self._send_json(400, {'error': str(e)})
+            return
+
+        if not records:
+            self._send_json(200, {'predictions': []})
+            return
+        try:
+            predictions, errors = self.server.batcher.submit(records).result(timeout=REQUEST_TIMEOUT)
+        except Exception as e:
+            self._send_json(500, {'error': str(e)})
+            return
+
+        # Invalid records get their validation errors; models the cascade
+        # skipped for a record are left out of its result
+        results = [
+            {'errors': errors[i]} if i in errors else
+            {name: probs[i].tolist() for name, probs in predictions.items() if not np.isnan(probs[i, 0])}
+            for i in range(len(records))
+        ]
+        if single and errors:
+            self._send_json(422, {'errors': errors[0]})
+        elif single:
+            self._send_json(200, {'prediction': results[0]})
+        else:
+            self._send_json(200, {'predictions': results})
+
+    def _send_json(self, status, body):
+        data = json.dumps(body).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _send_text(self, status, text):
+        data = text.encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'text/plain; version=0.0.4')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        # Per-request access logs would dominate the output under load
+        pass
+
+def create_server(model, host=DEFAULT_HOST, port=DEFAULT_PORT,
+                  max_batch_size=MAX_BATCH_SIZE, max_wait_ms=MAX_WAIT_MS, manager=None):
+    """Build a threaded HTTP server that scores through a shared MicroBatcher.
+    
+    With a ModelManager, every model it swaps in is served from the next batch on.
+    """
+    server = ThreadingHTTPServer((host, port), ScoringRequestHandler)
+    server.daemon_threads = True
+    server.model = model
+    server.batcher = MicroBatcher(model, max_batch_size, max_wait_ms)
+    server.manager = manager
+    if manager is not None:
+        manager.add_listener(lambda new_model: _install_model(server, new_model))
+    return server
+
+def _install_model(server, model):
+    server.batcher.model = model
+    server.model = model
+
+def main():
+    parser = argparse.ArgumentParser(description="Local HTTP scoring service for the dementia models")
+    parser.add_argument('--host', default=DEFAULT_HOST)
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT)
+    parser.add_argument('--data', default='data.csv', help="Training CSV used if the bundle is stale")
+    parser.add_argument('--bundle', default=BUNDLE_PATH)
+    parser.add_argument('--max-batch-size', type=int, default=MAX_BATCH_SIZE)
+    parser.add_argument('--max-wait-ms', type=float, default=MAX_WAIT_MS)
+    parser.add_argument('--models', help="Comma-separated subset of lr,rf,xgb to serve")
+    parser.add_argument('--stream', action='store_true', help="Use (or train) an out-of-core model, see model.py --stream")
+    parser.add_argument('--cache-size', type=int, default=0, help="Records kept in the prediction cache (0 disables it)")
+    parser.add_argument('--cascade', metavar='LOW,HIGH', type=parse_band, help="Run the ensembles only when the Logistic Regression probability is in this band, e.g. 0.1,0.9")
+    parser.add_argument('--watch', action='store_true', help="Retrain in a worker process when --data changes or on POST /retrain, and swap the model in without downtime")
+    parser.add_argument('--min-accuracy', type=float, default=MIN_ACCURACY, help="Accuracy every retrained model must reach before it is swapped in")
+    parser.add_argument('--metrics', action='store_true', help="Record timing spans and serve them on GET /metrics")
+    instrumentation.add_arguments(parser)
+    args = parser.parse_args()
+
+    if args.metrics:
+        instrumentation.enable()
+    with instrumentation.session(args):
+        manager = None
+        if args.watch:
+            manager = ModelManager(args.data, args.bundle, args.models, args.min_accuracy, streaming=args.stream)
+            model = manager.start()
+        else:
+            model = DementiaPredictionModel.load_or_train(args.data, args.bundle, models=args.models, streaming=args.stream)
+        # Retrained models inherit these settings from the model they replace
+        if args.cache_size > 0:
+            model.enable_prediction_cache(args.cache_size)
+        if args.cascade:
+            model.enable_cascade(*args.cascade)
+        server = create_server(model, args.host, args.port, args.max_batch_size, args.max_wait_ms, manager)
+        print(f"Serving predictions on http://{args.host}:{server.server_address[1]}")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            if manager is not None:
+                manager.stop()
+            server.server_close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+import csv
+import os
+import shutil
+import sys
+import pytest
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DATA_PATH = os.path.join(REPO_ROOT, 'data.csv')
+sys.path.insert(0, REPO_ROOT)
+
+from model import DementiaPredictionModel, FEATURE_COLUMNS  # noqa: E402
+
+def replace_fields(row, values):
+    """Copy of a raw row with the fields in values, keyed by column, replaced."""
+    row = list(row)
+    for col, value in values.items():
+        row[FEATURE_COLUMNS.index(col)] = value
+    return row
+
+@pytest.fixture(scope='session')
+def bundle_path(tmp_path_factory):
+    """Train once on a copy of data.csv, keeping the dataset cache in a scratch directory."""
+    workdir = tmp_path_factory.mktemp('model')
+    data_path = str(workdir / 'data.csv')
+    shutil.copy(DATA_PATH, data_path)
+    cwd = os.getcwd()
+    os.chdir(workdir)
+    try:
+        model = DementiaPredictionModel()
+        model.train(data_path, feature_cache_dir=None)
+        path = str(workdir / 'model_bundle.joblib')
+        model.save(path)
+    finally:
+        os.chdir(cwd)
+    return path
+
+@pytest.fixture
+def model(bundle_path):
+    """A fresh copy of the trained model that a test may update or reconfigure."""
+    return DementiaPredictionModel.load(bundle_path)
+
+@pytest.fixture(scope='session')
+def raw_rows():
+    """Data rows as the lists of strings predict() splits its input into."""
+    with open(DATA_PATH, encoding='utf-8', newline='') as f:
+        return [[row[col] for col in FEATURE_COLUMNS] for row in csv.DictReader(f)]
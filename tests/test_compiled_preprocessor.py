@@ -0,0 +1,59 @@
+import numpy as np
+import pandas as pd
+from conftest import DATA_PATH, replace_fields
+from model import FEATURE_COLUMNS, FEATURE_SCHEMA, load_dataset
+
+def _edge_rows(base):
+    rows = [
+        replace_fields(base, {'Gender': 'Martian'}),  # Unseen category
+        replace_fields(base, {'Gender': ' Male'}),  # Not stripped, so also unseen
+        replace_fields(base, {'Prescription': '', 'Dosage in mg': ''}),  # Blank optional fields
+        replace_fields(base, {'Prescription': 'None', 'Chronic_Health_Conditions': 'None'}),
+        replace_fields(base, {'Chronic_Health_Conditions': 'none'}),
+        replace_fields(base, {'Age': '', 'HeartRate': 'abc'}),  # Missing and unparseable numbers
+        replace_fields(base, {'Age': '6e1', 'Weight': '57.0'}),
+        [''] * len(FEATURE_COLUMNS)
+    ]
+    for col, spec in FEATURE_SCHEMA.items():
+        if spec['type'] == 'number':
+            rows.append(replace_fields(base, {col: str(spec['min'])}))
+            rows.append(replace_fields(base, {col: str(spec['max'])}))
+    return rows
+
+def _pandas_path(model, rows):
+    return model.preprocess_data(pd.DataFrame(rows, columns=FEATURE_COLUMNS), is_training=False)
+
+def _assert_same(actual, expected):
+    np.testing.assert_allclose(actual, expected, rtol=0, atol=1e-12)
+
+def test_transform_row_matches_preprocess_data(model, raw_rows):
+    rows = raw_rows[:20] + _edge_rows(raw_rows[0])
+    expected = _pandas_path(model, rows)
+    actual = np.vstack([model.compiled_preprocessor.transform_row(row) for row in rows])
+    _assert_same(actual, expected)
+
+def test_transform_matches_preprocess_data(model, raw_rows):
+    rows = raw_rows[:20] + _edge_rows(raw_rows[0])
+    frame = pd.DataFrame(rows, columns=FEATURE_COLUMNS)
+    # None and NaN are what blank cells become in frames built elsewhere
+    frame.loc[len(frame)] = replace_fields(raw_rows[1], {'Prescription': None, 'Smoking_Status': np.nan, 'Age': None})
+    _assert_same(model.compiled_preprocessor.transform(frame), model.preprocess_data(frame, is_training=False))
+
+def test_transform_matches_preprocess_data_on_typed_frames(model, tmp_path):
+    for frame in (pd.read_csv(DATA_PATH)[FEATURE_COLUMNS],
+                  load_dataset(DATA_PATH, cache_dir=str(tmp_path))[FEATURE_COLUMNS]):
+        _assert_same(model.compiled_preprocessor.transform(frame), model.preprocess_data(frame, is_training=False))
+
+def test_compiled_paths_match_after_update_adds_categories(model, raw_rows):
+    records = pd.read_csv(DATA_PATH).head(200)
+    records.loc[records.index % 2 == 0, 'Nutrition_Diet'] = 'Keto Diet'
+    entry = model.update(records)
+    assert entry['new_categories'] == {'Nutrition_Diet': ['Keto Diet']}
+
+    rows = [replace_fields(row, {'Nutrition_Diet': 'Keto Diet'}) for row in raw_rows[:5]] + _edge_rows(raw_rows[0])
+    expected = _pandas_path(model, rows)
+    unknown = _pandas_path(model, [replace_fields(raw_rows[0], {'Nutrition_Diet': 'Martian'})])
+    column = FEATURE_COLUMNS.index('Nutrition_Diet')
+    assert expected[0, column] != unknown[0, column]
+    _assert_same(np.vstack([model.compiled_preprocessor.transform_row(row) for row in rows]), expected)
+    _assert_same(model.compiled_preprocessor.transform(pd.DataFrame(rows, columns=FEATURE_COLUMNS)), expected)
@@ -0,0 +1,23 @@
+import numpy as np
+import tree_compiler
+from model import DementiaPredictionModel, TREE_CHECK_ROWS
+
+def test_loaded_model_checks_compiled_forests(model, bundle_path):
+    # The held-out split, which is smaller than TREE_CHECK_ROWS on data.csv
+    assert 0 < len(model.tree_check_rows) <= TREE_CHECK_ROWS
+    assert set(model.compiled_trees) == {'Random Forest', 'XGBoost'}
+    X = model.tree_check_rows[:50]
+    for name, compiled in model.compiled_trees.items():
+        np.testing.assert_allclose(compiled.predict_proba(X), model.estimators()[name].predict_proba(X), atol=1e-5)
+
+def test_load_drops_compiled_forest_that_disagrees(bundle_path, monkeypatch):
+    from_xgboost = tree_compiler.CompiledForest.from_xgboost.__func__
+
+    def drifted(cls, xgb_model):
+        # Stands in for a library version that reads the saved trees differently
+        compiled = from_xgboost(cls, xgb_model)
+        compiled.base_margin += 0.5
+        return compiled
+    monkeypatch.setattr(tree_compiler.CompiledForest, 'from_xgboost', classmethod(drifted))
+    loaded = DementiaPredictionModel.load(bundle_path)
+    assert set(loaded.compiled_trees) == {'Random Forest'}
@@ -0,0 +1,21 @@
+import pandas as pd
+import pytest
+from conftest import DATA_PATH
+from eda import compute_aggregates
+
+def test_chunk_size_does_not_change_the_aggregates(tmp_path):
+    data = pd.read_csv(DATA_PATH).head(40)
+    # A first chunk whose optional fields are all blank would otherwise be read as all-NaN floats
+    data = data.sort_values('Prescription', na_position='first').reset_index(drop=True)
+    assert data.loc[:4, 'Prescription'].isna().all()
+    path = str(tmp_path / 'data.csv')
+    data.to_csv(path, index=False)
+
+    chunked = compute_aggregates(path, chunksize=5)
+    whole = compute_aggregates(path, chunksize=len(data))
+    assert chunked['dtypes'] == whole['dtypes']
+    assert 'float' not in chunked['dtypes']['Prescription']
+    assert chunked['value_counts'] == whole['value_counts']
+    assert chunked['crosstabs'] == whole['crosstabs']
+    for col, stats in whole['numeric'].items():
+        assert chunked['numeric'][col] == pytest.approx(stats)
@@ -0,0 +1,35 @@
+import numpy as np
+import pandas as pd
+from conftest import DATA_PATH
+from model import FEATURE_COLUMNS
+
+def _scores(model, X):
+    """Each model's score in the units its explanation adds up to."""
+    return {
+        'Logistic Regression': model.lr_model.decision_function(X),
+        'Random Forest': model.rf_model.predict_proba(X)[:, 1],
+        'XGBoost': model.xgb_model.predict(X, output_margin=True)
+    }
+
+def test_base_plus_contributions_reproduces_each_score(model):
+    frame = pd.read_csv(DATA_PATH).head(25)[FEATURE_COLUMNS]
+    X = model.preprocess_data(frame, is_training=False)
+    explanations = model.explain(frame)
+    # XGBoost sums float32 contributions, in a different order from its margin
+    tolerances = {'Logistic Regression': 1e-9, 'Random Forest': 1e-9, 'XGBoost': 1e-4}
+    for name, score in _scores(model, X).items():
+        explanation = explanations[name]
+        assert explanation['contributions'].shape == (len(frame), len(FEATURE_COLUMNS))
+        total = explanation['base'] + explanation['contributions'].sum(axis=1)
+        np.testing.assert_allclose(total, score, rtol=0, atol=tolerances[name])
+
+def test_explain_record_matches_explain(model):
+    frame = pd.read_csv(DATA_PATH).head(1)[FEATURE_COLUMNS]
+    record = ','.join('' if pd.isna(value) else str(value) for value in frame.iloc[0])
+    single = model.explain_record(record)
+    batch = model.explain(frame)
+    for name, explanation in single.items():
+        assert explanation['units'] == batch[name]['units']
+        np.testing.assert_allclose(explanation['base'], batch[name]['base'][0])
+        np.testing.assert_allclose([explanation['contributions'][col] for col in FEATURE_COLUMNS],
+                                   batch[name]['contributions'][0], atol=1e-6)
@@ -0,0 +1,64 @@
+import numpy as np
+import pandas as pd
+import xgboost
+from conftest import DATA_PATH
+from inference import InferenceEngine
+from model import FEATURE_COLUMNS, COMPILED_TREES_MAX_ROWS
+
+def _assert_close(actual, expected):
+    np.testing.assert_allclose(actual, expected, rtol=0, atol=1e-6)
+
+def test_engine_matches_the_model_on_small_and_large_batches(model):
+    frame = pd.read_csv(DATA_PATH)[FEATURE_COLUMNS]
+    engine = InferenceEngine(model, workers=2)
+    try:
+        for rows in (64, len(frame)):
+            batch = frame.head(rows)
+            expected = model.predict_batch(batch)
+            actual = engine.predict_batch(batch)
+            for name in expected:
+                _assert_close(actual[name], expected[name])
+    finally:
+        engine.close()
+
+def test_engine_and_explain_use_xgboost_best_iteration(model):
+    data = pd.read_csv(DATA_PATH)
+    frame = data[FEATURE_COLUMNS]
+    X = model.preprocess_data(frame, is_training=False)
+    # Mark an early round as the best, as early stopping would, leaving later rounds in the booster
+    booster = model.xgb_model.get_booster()
+    booster.best_iteration = 4
+    assert booster.num_boosted_rounds() > 5
+    model.compile_trees(X[:200])
+    truncated = booster.predict(xgboost.DMatrix(X), iteration_range=(0, 5))
+    assert np.abs(truncated - booster.predict(xgboost.DMatrix(X))).max() > 1e-3
+
+    engine = InferenceEngine(model, workers=0)
+    try:
+        assert len(frame) > COMPILED_TREES_MAX_ROWS
+        large = engine.predict_batch(frame)['XGBoost']
+        small = engine.predict_batch(frame.head(100))['XGBoost']
+    finally:
+        engine.close()
+    _assert_close(large[:, 1], truncated)
+    _assert_close(small[:, 1], truncated[:100])
+
+    explanation = model.explain(frame.head(100))['XGBoost']
+    margin = booster.predict(xgboost.DMatrix(X[:100]), iteration_range=(0, 5), output_margin=True)
+    np.testing.assert_allclose(explanation['base'] + explanation['contributions'].sum(axis=1), margin, atol=1e-4)
+
+def test_engine_is_unaffected_by_retraining_the_model(model, tmp_path, monkeypatch):
+    frame = pd.read_csv(DATA_PATH)[FEATURE_COLUMNS]
+    model.compiled_preprocessor = None  # Use the pandas fallback
+    engine = InferenceEngine(model, workers=0)
+    try:
+        before = engine.predict_batch(frame)
+        # Retraining on other rows refits the scaler and the Random Forest in place
+        monkeypatch.chdir(tmp_path)
+        pd.read_csv(DATA_PATH).sample(300, random_state=1).to_csv('subset.csv', index=False)
+        model.train('subset.csv', feature_cache_dir=None, dataset_cache_dir=None)
+        after = engine.predict_batch(frame)
+    finally:
+        engine.close()
+    for name, probs in before.items():
+        _assert_close(after[name], probs)
@@ -0,0 +1,60 @@
+import argparse
+import numpy as np
+import pandas as pd
+import pytest
+from conftest import DATA_PATH, replace_fields
+from model import FEATURE_COLUMNS, parse_band
+
+def test_predict_and_predict_batch_share_entries_for_blank_categories(model, raw_rows):
+    model.enable_prediction_cache()
+    # The first data row leaves Prescription blank: '' in a string, NaN in a frame
+    assert raw_rows[0][FEATURE_COLUMNS.index('Prescription')] == ''
+    model.predict(','.join(raw_rows[0]))
+    model.predict_batch(pd.read_csv(DATA_PATH).head(1))
+    assert model.get_cache_stats()['hits'] == 1
+
+def test_unseen_categories_share_the_unknown_key(model, raw_rows):
+    blank = model._cache_key(replace_fields(raw_rows[0], {'Prescription': ''}))
+    assert model._cache_key(replace_fields(raw_rows[0], {'Prescription': 'Martian'})) == blank
+    assert model._cache_key(replace_fields(raw_rows[0], {'Prescription': 'Venusian'})) == blank
+    assert model._cache_key(replace_fields(raw_rows[0], {'Prescription': 'Memantine'})) != blank
+
+def test_cached_entries_do_not_bypass_validation(model, raw_rows):
+    model.enable_prediction_cache()
+    assert model.predict(','.join(replace_fields(raw_rows[0], {'Prescription': ''}))) is not None
+    assert model.predict(','.join(replace_fields(raw_rows[0], {'Prescription': 'Martian'}))) is None
+
+def _cascade_record(model, raw_rows):
+    """A record the cascade does not escalate, so the ensembles are skipped for it."""
+    for row in raw_rows:
+        record = ','.join(row)
+        if len(model.predict(record)) == 1:
+            return record
+    raise AssertionError("Every record was escalated")
+
+def test_cascade_predict_then_predict_batch(model, raw_rows):
+    model.enable_cascade()
+    record = _cascade_record(model, raw_rows)
+    model.enable_prediction_cache()
+    first = model.predict(record)
+    batch = model.predict_batch(pd.DataFrame([record.split(',')], columns=FEATURE_COLUMNS))
+    assert model.get_cache_stats()['hits'] == 1
+    assert list(batch) == list(model.estimators())
+    assert np.array_equal(batch['Logistic Regression'][0], first['Logistic Regression'])
+    assert np.isnan(batch['Random Forest'][0]).all() and np.isnan(batch['XGBoost'][0]).all()
+
+def test_cascade_predict_batch_then_predict(model, raw_rows):
+    model.enable_cascade()
+    record = _cascade_record(model, raw_rows)
+    model.enable_prediction_cache()
+    model.predict_batch(pd.DataFrame([record.split(',')], columns=FEATURE_COLUMNS))
+    cached = model.predict(record)
+    assert model.get_cache_stats()['hits'] == 1
+    # Skipped models are left out, as on a cache miss
+    assert list(cached) == ['Logistic Regression']
+
+def test_parse_band_rejects_bad_values_as_argument_errors():
+    assert parse_band('0.2,0.8') == (0.2, 0.8)
+    for text in ('0.1', 'a,b', '0.9,0.1', '0,2', '0.1,0.5,0.9'):
+        with pytest.raises(argparse.ArgumentTypeError):
+            parse_band(text)
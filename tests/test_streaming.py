@@ -0,0 +1,19 @@
+import shutil
+from conftest import DATA_PATH
+from model import DementiaPredictionModel
+
+def test_streamed_bundle_is_reused_only_when_streaming(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    shutil.copy(DATA_PATH, 'data.csv')
+    streamed = DementiaPredictionModel.load_or_train('data.csv', 'bundle.joblib', streaming=True)
+    assert type(streamed.lr_model).__name__ == 'SGDClassifier'
+
+    trained = []
+    monkeypatch.setattr(DementiaPredictionModel, 'train', lambda self, *args, **kwargs: trained.append('train'))
+    monkeypatch.setattr(DementiaPredictionModel, 'train_streaming', lambda self, *args, **kwargs: trained.append('stream'))
+    loaded = DementiaPredictionModel.load_or_train('data.csv', 'bundle.joblib', streaming=True)
+    assert trained == []
+    assert loaded.version == streamed.version
+
+    # An in-memory caller does not serve the streamed models
+    assert DementiaPredictionModel().estimator_keys('data.csv') != streamed.estimator_versions
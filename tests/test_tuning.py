@@ -0,0 +1,24 @@
+import json
+import shutil
+from conftest import DATA_PATH
+from model import DementiaPredictionModel
+
+def test_tune_merges_into_saved_parameters(tmp_path, monkeypatch):
+    # tune() caches features relative to the working directory
+    monkeypatch.chdir(tmp_path)
+    shutil.copy(DATA_PATH, 'data.csv')
+    saved_rf = {'n_estimators': 50, 'max_depth': 8, 'min_samples_leaf': 2, 'max_features': 'sqrt'}
+    with open('tuned.json', 'w', encoding='utf-8') as f:
+        json.dump({'Random Forest': saved_rf}, f)
+
+    model = DementiaPredictionModel('lr')
+    winners = model.tune('data.csv', n_candidates=2, params_path='tuned.json')
+    with open('tuned.json', encoding='utf-8') as f:
+        saved = json.load(f)
+
+    assert saved['Random Forest'] == saved_rf
+    # Written whether the search won or the current configuration was kept
+    expected_lr = winners.get('Logistic Regression') or {
+        key: model.lr_model.get_params()[key] for key in ('C', 'class_weight')
+    }
+    assert saved['Logistic Regression'] == expected_lr
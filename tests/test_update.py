@@ -0,0 +1,49 @@
+import numpy as np
+import pandas as pd
+from conftest import DATA_PATH
+from model import DementiaPredictionModel, CATEGORICAL_COLUMNS, TARGET_COLUMN
+
+def _new_records(start, rows=200):
+    return pd.read_csv(DATA_PATH).iloc[start:start + rows].reset_index(drop=True)
+
+def test_new_categories_keep_the_existing_codes(model):
+    before = {col: model.label_encoders[col].classes_.copy() for col in CATEGORICAL_COLUMNS}
+    records = _new_records(0)
+    records.loc[records.index % 2 == 0, 'Nutrition_Diet'] = 'Keto Diet'
+    model.update(records)
+
+    for col, classes in before.items():
+        encoder = model.label_encoders[col]
+        np.testing.assert_array_equal(encoder.transform(classes), np.arange(len(classes)))
+    assert model.label_encoders['Nutrition_Diet'].transform(['Keto Diet'])[0] == len(before['Nutrition_Diet'])
+
+def test_updates_chain_versions_and_survive_a_save(model, tmp_path):
+    base_version = model.version
+    base_versions = dict(model.base_versions)
+    first = model.update(_new_records(0))
+    second = model.update(_new_records(200))
+
+    assert first['parent'] == base_version
+    assert second['parent'] == first['version'] == model.update_history[0]['version']
+    assert model.version == second['version'] not in (base_version, first['version'])
+    assert model.update_history == [first, second]
+    assert model.base_versions == base_versions
+
+    path = str(tmp_path / 'updated.joblib')
+    model.save(path)
+    loaded = DementiaPredictionModel.load(path)
+    assert loaded.version == model.version
+    assert [entry['version'] for entry in loaded.update_history] == [first['version'], second['version']]
+
+def test_invalid_and_unlabelled_records_are_skipped(model):
+    records = _new_records(0)
+    records[TARGET_COLUMN] = records[TARGET_COLUMN].astype(object)
+    records.loc[1, 'Age'] = 500
+    records.loc[2, TARGET_COLUMN] = np.nan
+    records.loc[3, TARGET_COLUMN] = ''
+    records.loc[4, TARGET_COLUMN] = 'maybe'
+    entry = model.update(records)
+
+    assert entry['rejected_records'] == 4
+    assert entry['records'] == len(records) - 4
+    assert set(model.rf_model.classes_) == {0, 1}
@@ -0,0 +1,72 @@
+import numpy as np
+import pandas as pd
+from conftest import DATA_PATH, replace_fields
+from model import FEATURE_COLUMNS, record_errors, validate_records
+
+INVALID_FIELDS = [
+    ({'Age': '150'}, "Age: 150 is outside 18–120"),
+    ({'BodyTemperature': '34.9'}, "BodyTemperature: 34.9 is outside 35–40"),
+    ({'Diabetic': '0.5'}, "Diabetic: 0.5 is not a whole number"),
+    ({'Cognitive_Test_Scores': '7.5'}, "Cognitive_Test_Scores: 7.5 is not a whole number"),
+    ({'HeartRate': 'fast'}, "HeartRate: 'fast' is not a number"),
+    ({'Gender': 'Martian'}, "Gender: 'Martian' is not one of Male, Female"),
+    ({'Smoking_Status': ''}, "Smoking_Status is required"),
+    ({'Weight': ''}, "Weight is required")
+]
+
+def test_invalid_fields_are_reported_per_record(raw_rows):
+    rows = [raw_rows[0]] + [replace_fields(raw_rows[0], fields) for fields, _ in INVALID_FIELDS]
+    valid, errors = validate_records(pd.DataFrame(rows, columns=FEATURE_COLUMNS))
+    assert valid.tolist() == [True] + [False] * len(INVALID_FIELDS)
+    assert errors == {row + 1: [message] for row, (_, message) in enumerate(INVALID_FIELDS)}
+    # The single-record check agrees with the column-wise one
+    assert record_errors(rows[0]) == []
+    for row, (_, message) in enumerate(INVALID_FIELDS, start=1):
+        assert record_errors(rows[row]) == [message]
+
+def test_blank_optional_fields_and_schema_bounds_are_valid(raw_rows):
+    rows = [
+        replace_fields(raw_rows[0], {'Prescription': '', 'Dosage in mg': '', 'Chronic_Health_Conditions': ''}),
+        replace_fields(raw_rows[0], {'Age': '18', 'Weight': '200', 'AlcoholLevel': '0.5'})
+    ]
+    valid, errors = validate_records(pd.DataFrame(rows, columns=FEATURE_COLUMNS))
+    assert valid.all() and errors == {}
+    assert all(record_errors(row) == [] for row in rows)
+
+def test_extra_categories_are_accepted(raw_rows):
+    row = replace_fields(raw_rows[0], {'Nutrition_Diet': 'Keto Diet'})
+    frame = pd.DataFrame([row], columns=FEATURE_COLUMNS)
+    assert not validate_records(frame)[0][0]
+    extra = {'Nutrition_Diet': {'Keto Diet'}}
+    assert validate_records(frame, extra)[0][0]
+    assert record_errors(row, extra) == []
+
+def test_model_accepts_categories_learned_by_update(model, raw_rows):
+    record = ','.join(replace_fields(raw_rows[0], {'Nutrition_Diet': 'Keto Diet'}))
+    assert model.predict(record) is None
+    records = pd.read_csv(DATA_PATH).head(200)
+    records.loc[records.index % 2 == 0, 'Nutrition_Diet'] = 'Keto Diet'
+    model.update(records)
+    assert set(model.predict(record)) == set(model.estimators())
+
+def test_predict_returns_none_for_invalid_records(model, raw_rows):
+    assert model.predict(','.join(raw_rows[0])) is not None
+    for fields, _ in INVALID_FIELDS:
+        assert model.predict(','.join(replace_fields(raw_rows[0], fields))) is None
+    assert model.predict(','.join(raw_rows[0][:-1])) is None  # One value short
+
+def test_predict_batch_leaves_rejected_rows_nan(model):
+    frame = pd.read_csv(DATA_PATH).head(10)[FEATURE_COLUMNS]
+    frame = frame.astype({'Age': float, 'Diabetic': float, 'Gender': object})
+    frame.loc[2, 'Age'] = 150
+    frame.loc[5, 'Diabetic'] = 0.5
+    frame.loc[7, 'Gender'] = None
+    errors = []
+    results = model.predict_batch(frame, errors=errors)
+    assert [row for row, _ in errors] == [2, 5, 7]
+
+    expected = model.predict_batch(frame.drop(index=[2, 5, 7]))
+    rejected = np.isin(np.arange(len(frame)), [2, 5, 7])
+    for name, probs in results.items():
+        assert np.isnan(probs[rejected]).all()
+        np.testing.assert_allclose(probs[~rejected], expected[name])
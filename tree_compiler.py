@@ -0,0 +1,215 @@
+import json
+import numpy as np
+
+# Rows evaluated at once, bounding the (n_trees, rows) working arrays
+EVAL_CHUNK_SIZE = 4096
+
+class CompiledForest:
+    """A tree ensemble flattened into contiguous node arrays and evaluated level by level.
+
+    All trees share one set of node arrays (feature index, threshold, left and
+    right child, default direction for missing values, leaf value); each tree
+    starts at its root offset. Leaves point back at themselves, so walking every
+    tree for max_depth levels leaves each row on its leaf in every tree.
+    """
+    def __init__(self, roots, feature, threshold, left, right, default_left, value,
+                 max_depth, strict_less, aggregate, base_margin=0.0):
+        self.roots = roots
+        self.feature = feature
+        self.threshold = threshold
+        self.left = left
+        self.right = right
+        # Interleaved (left, right) pairs so one gather picks the next node
+        self.children = np.column_stack([left, right]).ravel()
+        self.default_left = default_left
+        self.value = value
+        self.max_depth = max_depth
+        # XGBoost goes left on x < threshold, scikit-learn on x <= threshold
+        self.strict_less = strict_less
+        # 'mean_proba' averages per-tree class probabilities (Random Forest);
+        # 'sigmoid_margin' sums leaf margins and applies the logistic link (XGBoost)
+        self.aggregate = aggregate
+        self.base_margin = base_margin
+
+    @classmethod
+    def from_sklearn(cls, forest):
+        """Compile a fitted RandomForestClassifier."""
+        roots, features, thresholds, lefts, rights, values = [], [], [], [], [], []
+        offset = 0
+        for estimator in forest.estimators_:
+            tree = estimator.tree_
+            n_nodes = tree.node_count
+            node_ids = np.arange(n_nodes)
+            is_leaf = tree.children_left == -1
+            roots.append(offset)
+            features.append(np.where(is_leaf, 0, tree.feature))
+            thresholds.append(np.where(is_leaf, np.inf, tree.threshold))
+            lefts.append(np.where(is_leaf, node_ids, tree.children_left) + offset)
+            rights.append(np.where(is_leaf, node_ids, tree.children_right) + offset)
+            # Normalise class counts (or weighted fractions) to probabilities
+            node_values = tree.value[:, 0, :]
+            values.append(node_values / node_values.sum(axis=1, keepdims=True))
+            offset += n_nodes
+        feature = np.concatenate(features).astype(np.int32)
+        return cls(
+            roots=np.array(roots, dtype=np.int64),
+            feature=feature,
+            threshold=np.concatenate(thresholds),
+            left=np.concatenate(lefts).astype(np.int64),
+            right=np.concatenate(rights).astype(np.int64),
+            default_left=np.ones(len(feature), dtype=bool),
+            value=np.concatenate(values),
+            max_depth=max(estimator.tree_.max_depth for estimator in forest.estimators_),
+            strict_less=False,
+            aggregate='mean_proba'
+        )
+
+    @classmethod
+    def from_xgboost(cls, xgb_model):
+        """Compile a fitted binary XGBClassifier (gbtree booster)."""
+        booster = xgb_model.get_booster()
+        model = json.loads(booster.save_raw('json'))
+        trees = model['learner']['gradient_booster']['model']['trees']
+        n_trees = best_rounds(xgb_model) or booster.num_boosted_rounds()
+
+        roots, features, thresholds, lefts, rights, defaults, values = [], [], [], [], [], [], []
+        max_depth = 0
+        offset = 0
+        for tree in trees[:n_trees]:
+            left = np.array(tree['left_children'], dtype=np.int64)
+            right = np.array(tree['right_children'], dtype=np.int64)
+            # Leaves store their value in split_conditions
+            conditions = np.array(tree['split_conditions'], dtype=np.float32)
+            node_ids = np.arange(len(left))
+            is_leaf = left == -1
+            roots.append(offset)
+            features.append(np.where(is_leaf, 0, tree['split_indices']))
+            thresholds.append(np.where(is_leaf, np.inf, conditions).astype(np.float32))
+            lefts.append(np.where(is_leaf, node_ids, left) + offset)
+            rights.append(np.where(is_leaf, node_ids, right) + offset)
+            defaults.append(np.array(tree['default_left'], dtype=bool))
+            values.append(np.where(is_leaf, conditions, 0.0))
+            max_depth = max(max_depth, _tree_depth(left, right))
+            offset += len(left)
+
+        config = json.loads(booster.save_config())
+        base_score = _parse_base_score(config['learner']['learner_model_param']['base_score'])
+        return cls(
+            roots=np.array(roots, dtype=np.int64),
+            feature=np.concatenate(features).astype(np.int32),
+            threshold=np.concatenate(thresholds),
+            left=np.concatenate(lefts),
+            right=np.concatenate(rights),
+            default_left=np.concatenate(defaults),
+            value=np.concatenate(values).astype(np.float64),
+            max_depth=max_depth,
+            strict_less=True,
+            aggregate='sigmoid_margin',
+            base_margin=float(np.log(base_score / (1 - base_score)))
+        )
+
+    def _leaf_nodes(self, X):
+        """Return the (n_trees, n_rows) leaf index each row reaches in each tree."""
+        n_rows, n_features = X.shape
+        flat_X = X.ravel()
+        row_offsets = (np.arange(n_rows, dtype=np.int64) * n_features)[None, :]
+        nodes = np.repeat(self.roots[:, None], n_rows, axis=1)
+        for _ in range(self.max_depth):
+            nodes = self._next_nodes(flat_X, row_offsets, nodes, self.feature.take(nodes))
+        return nodes
+
+    def _next_nodes(self, flat_X, row_offsets, nodes, features):
+        """Move every (tree, row) pair one level down from nodes, which split on features."""
+        x = flat_X.take(row_offsets + features)
+        threshold = self.threshold.take(nodes)
+        go_right = x >= threshold if self.strict_less else x > threshold
+        missing = np.isnan(x)
+        if missing.any():
+            go_right = np.where(missing, ~self.default_left.take(nodes), go_right)
+        return self.children.take(2 * nodes + go_right)
+
+    def contributions(self, X):
+        """Attribute each row's class-1 probability to the features along its decision paths.
+
+        Every split a row passes credits its feature with the change in the
+        node's class-1 probability (Saabas attribution), averaged over the
+        trees. Only 'mean_proba' forests keep the per-node probabilities this
+        needs. Returns (bias, contributions) with shapes (n,) and (n, n_features);
+        bias plus a row's contributions equals its predict_proba class-1 value.
+        """
+        if self.aggregate != 'mean_proba':
+            raise ValueError("Path contributions need per-node probabilities, which only Random Forests keep")
+        X = np.ascontiguousarray(X, dtype=np.float32)
+        n_rows, n_features = X.shape
+        n_trees = len(self.roots)
+        positive = self.value[:, 1]
+        contributions = np.zeros((n_rows, n_features))
+        for start in range(0, n_rows, EVAL_CHUNK_SIZE):
+            chunk = X[start:start + EVAL_CHUNK_SIZE]
+            rows = chunk.shape[0]
+            flat_X = chunk.ravel()
+            row_offsets = (np.arange(rows, dtype=np.int64) * n_features)[None, :]
+            nodes = np.repeat(self.roots[:, None], rows, axis=1)
+            totals = np.zeros(rows * n_features)
+            for _ in range(self.max_depth):
+                features = self.feature.take(nodes)
+                children = self._next_nodes(flat_X, row_offsets, nodes, features)
+                # Leaves step onto themselves, so finished paths add zero
+                totals += np.bincount((row_offsets + features).ravel(),
+                                      weights=(positive.take(children) - positive.take(nodes)).ravel(),
+                                      minlength=rows * n_features)
+                nodes = children
+            contributions[start:start + rows] = totals.reshape(rows, n_features) / n_trees
+        return np.full(n_rows, positive[self.roots].mean()), contributions
+
+    def predict_proba(self, X):
+        """Return an (n, 2) class probability array, matching the library's predict_proba."""
+        # Both libraries compare float32 feature values
+        X = np.ascontiguousarray(X, dtype=np.float32)
+        results = []
+        for start in range(0, X.shape[0], EVAL_CHUNK_SIZE):
+            leaves = self._leaf_nodes(X[start:start + EVAL_CHUNK_SIZE])
+            if self.aggregate == 'mean_proba':
+                results.append(self.value[leaves].mean(axis=0))
+            else:
+                margin = self.base_margin + self.value[leaves].sum(axis=0)
+                positive = 1.0 / (1.0 + np.exp(-margin))
+                results.append(np.column_stack([1.0 - positive, positive]))
+        if not results:
+            return np.empty((0, 2))
+        return np.concatenate(results)
+
+    @property
+    def nbytes(self):
+        """Bytes held by the node arrays."""
+        arrays = (self.roots, self.feature, self.threshold, self.left, self.right, self.children,
+                  self.default_left, self.value)
+        return sum(array.nbytes for array in arrays)
+
+def best_rounds(xgb_model):
+    """Rounds a fitted XGBClassifier predicts with, as the end of an iteration_range.
+
+    Models trained with early stopping predict with the rounds up to their
+    best iteration only; for the others this is 0, which means all rounds.
+    """
+    try:
+        return xgb_model.best_iteration + 1
+    except AttributeError:
+        return 0
+
+def _tree_depth(left, right):
+    """Depth of the deepest leaf, counting the root as depth 0."""
+    depth = 0
+    frontier = [0]
+    while True:
+        children = [child for node in frontier for child in (left[node], right[node]) if child != -1]
+        if not children:
+            return depth
+        frontier = children
+        depth += 1
+
+def _parse_base_score(value):
+    # Recent XGBoost versions store base_score as a vector string such as "[5E-1]"
+    if isinstance(value, str):
+        value = value.strip('[]').split(',')[0]
+    return float(value)